@@ -0,0 +1,293 @@
+"""Admiterea analizelor: estimarea costului, limite pe document și bugetul worker-ului.
+
+Înainte de orice extracție, costul unui PDF e estimat din numărul de pagini și din
+stratul de text: paginile sunt clasificate ca la extracție (`clasifica_pagina`),
+toate sau, peste `ADMITERE_ESANTION_PAGINI`, un eșantion uniform extrapolat. Din
+pagini rezultă tokenii estimați: OCR-ul paginilor scanate (imaginea și textul
+recunoscut), apoi analiza textului, chunk cu chunk, cu promptul fiecărui apel și
+sinteza. Paginile scanate sunt numărate la costul GPT-4o și cu Tesseract: motorul
+local poate escalada, iar randarea lor costă oricum CPU și memorie.
+
+- Peste limitele pe document (pagini, pagini OCR, tokeni) cererea primește 413;
+  limita de pagini OCR e verificată exact și la extracție (vezi `pipeline`). Limita
+  de tokeni (`MAX_TOKENI`) e implicit derivată din cea de pagini: costul estimat al
+  unui document cu numărul maxim de pagini, toate foarte dense, deci un document
+  admis de limita de pagini nu e respins pentru tokeni decât la o densitate anormală.
+- Bugetul (`BugetConcurenta`) e suma tokenilor estimați ai analizelor în lucru pe
+  worker. Ce nu încape așteaptă la coadă cel mult `ADMITERE_ASTEPTARE_SECUNDE`,
+  apoi primește 429 cu `Retry-After`. Documentele mari au coada lor și folosesc
+  cel mult `ADMITERE_PROPORTIE_MARI` din buget, deci un document obișnuit nu
+  așteaptă niciodată după unul mare.
+
+Joburile din coadă și documentele unui lot așteaptă bugetul fără termen (cererea
+lor nu e una interactivă). Documentele deja în cache nu costă nimic și trec direct.
+Bugetul e al procesului:
+cu mai mulți workeri gunicorn, capacitatea totală e bugetul înmulțit cu workerii.
+"""
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+import fitz
+from fastapi import HTTPException
+
+from cache import CacheRezultate, get_cache
+from config import (
+    ADMITERE_ACTIVATA, ADMITERE_ASTEPTARE_SECUNDE, ADMITERE_BUGET_TOKENI, ADMITERE_ESANTION_PAGINI,
+    ADMITERE_MAX_ASTEPTARE, ADMITERE_MAX_PAGINI, ADMITERE_MAX_PAGINI_OCR, ADMITERE_MAX_TOKENI,
+    ADMITERE_PRAG_MARE_TOKENI, ADMITERE_PROPORTIE_MARI, CHUNK_TOKEN_BUDGET,
+)
+from executie import ruleaza_blocant
+from http_client import TOKENI_IMAGINE, estimeaza_tokeni
+from metrici import ADMITERE, masoara
+from openai_client import PROMPT_VERSION_DOCUMENT, payload_analiza, payload_sinteza
+from pdf_processor import clasifica_pagina
+from utils import CARACTERE_PE_TOKEN
+
+# Textul recunoscut pe o pagină scanată (ieșirea OCR-ului, apoi intrare pentru analiză)
+CARACTERE_PAGINA_SCANATA = 3000
+# O pagină digitală foarte densă (A4, font mic, fără spații albe); contractele obișnuite au 1500-3000
+CARACTERE_PAGINA_DENSA = 5000
+# Tokenii unui apel în afara textului: promptul de sistem și răspunsul rezervat
+TOKENI_APEL_ANALIZA = estimeaza_tokeni(payload_analiza(""))
+TOKENI_SINTEZA = estimeaza_tokeni(payload_sinteza([]))
+
+
+@dataclass
+class EstimareCost:
+    pagini: int
+    pagini_ocr: int
+    tokeni: int
+    # Câte pagini au fost clasificate efectiv (restul sunt extrapolate)
+    esantion: int
+
+
+def _indici_esantion(pagini: int, marime: int) -> List[int]:
+    if pagini <= marime:
+        return list(range(pagini))
+    return sorted({round(i * (pagini - 1) / (marime - 1)) for i in range(marime)})
+
+
+def estimeaza_cost(path: str) -> EstimareCost:
+    """Paginile, paginile OCR și tokenii estimați ai unui PDF, fără randare la rezoluție mare.
+
+    Își deschide singură documentul, separat de extracție: handle-ul nu e ținut deschis
+    cât cererea așteaptă bugetul (până la `ADMITERE_ASTEPTARE_SECUNDE`) sau e respinsă,
+    iar deschiderea (xref-ul și cele câteva pagini din eșantion) costă puțin față de analiză.
+    """
+    with fitz.open(path) as doc:
+        pagini = len(doc)
+        indici = _indici_esantion(pagini, max(ADMITERE_ESANTION_PAGINI, 2))
+        caractere, scanate = 0, 0
+        for i in indici:
+            page = doc[i]
+            text = page.get_text()
+            sursa, _ = clasifica_pagina(page, text)
+            if sursa == "ocr":
+                scanate += 1
+            elif sursa == "digital":
+                caractere += len(text.strip())
+    factor = pagini / len(indici) if indici else 0.0
+    pagini_ocr = min(pagini, round(scanate * factor))
+    return EstimareCost(pagini, pagini_ocr, tokeni_estimati(caractere * factor, pagini_ocr), len(indici))
+
+
+def tokeni_estimati(caractere_digitale: float, pagini_ocr: int) -> int:
+    """Tokenii OCR-ului paginilor scanate, ai analizei întregului text (cu promptul
+    fiecărui apel) și ai sintezei."""
+    caractere_totale = caractere_digitale + pagini_ocr * CARACTERE_PAGINA_SCANATA
+    tokeni_text = int(caractere_totale) // CARACTERE_PE_TOKEN
+    apeluri = math.ceil(tokeni_text / CHUNK_TOKEN_BUDGET)
+    tokeni_ocr = pagini_ocr * (TOKENI_IMAGINE + CARACTERE_PAGINA_SCANATA // CARACTERE_PE_TOKEN)
+    return tokeni_ocr + tokeni_text + apeluri * TOKENI_APEL_ANALIZA + TOKENI_SINTEZA
+
+
+def _tokeni_document_maxim() -> int:
+    """Costul celui mai mare document admis de limitele de pagini, cu pagini dense: costul
+    crește aproape liniar cu paginile scanate, deci maximul e la unul dintre capete."""
+    pagini_ocr = min(ADMITERE_MAX_PAGINI_OCR, ADMITERE_MAX_PAGINI)
+    return max(
+        tokeni_estimati(ADMITERE_MAX_PAGINI * CARACTERE_PAGINA_DENSA, 0),
+        tokeni_estimati((ADMITERE_MAX_PAGINI - pagini_ocr) * CARACTERE_PAGINA_DENSA, pagini_ocr),
+    )
+
+
+# Limita de tokeni pe document: explicită sau derivată din limitele de pagini
+MAX_TOKENI = ADMITERE_MAX_TOKENI or _tokeni_document_maxim()
+
+
+def verifica_limite(estimare: EstimareCost) -> None:
+    """413 pentru documentele peste limitele unei singure cereri."""
+    motiv = None
+    if estimare.pagini > ADMITERE_MAX_PAGINI:
+        motiv = f"Documentul are {estimare.pagini} pagini; se pot analiza cel mult {ADMITERE_MAX_PAGINI}."
+    elif estimare.pagini_ocr > ADMITERE_MAX_PAGINI_OCR:
+        motiv = (f"Documentul are aproximativ {estimare.pagini_ocr} pagini scanate; se pot analiza cel mult "
+                 f"{ADMITERE_MAX_PAGINI_OCR} pagini scanate pe document.")
+    elif estimare.tokeni > MAX_TOKENI:
+        motiv = "Documentul conține prea mult text pentru o singură analiză. Împărțiți-l în mai multe părți."
+    if motiv:
+        ADMITERE.inc(rezultat="respins_limita")
+        print(f"--- [AVERTISMENT] Admitere: document refuzat ({estimare}). ---")
+        raise HTTPException(status_code=413, detail=motiv)
+
+
+class BugetOcupat(Exception):
+    """Bugetul nu s-a eliberat în timpul de așteptare sau coada de așteptare e plină."""
+
+
+class Rezervare:
+    """Partea din buget ocupată de o analiză; `elibereaza` poate fi apelată de mai multe ori."""
+
+    def __init__(self, buget: Optional["BugetConcurenta"] = None, cost: int = 0, mare: bool = False,
+                 estimare: Optional[EstimareCost] = None):
+        self.buget = buget
+        self.cost = cost
+        self.mare = mare
+        self.estimare = estimare
+
+    def elibereaza(self) -> None:
+        if self.buget is not None:
+            buget, self.buget = self.buget, None
+            buget.elibereaza(self.cost, self.mare)
+
+    def __enter__(self) -> "Rezervare":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elibereaza()
+
+
+class BugetConcurenta:
+    """Tokeni estimați în lucru simultan, cu câte o coadă FIFO pentru documentele mici
+    și pentru cele mari (peste `prag_mare`).
+
+    Fiecare clasă e servită în ordinea sosirii, independent de cealaltă: un document
+    mare care nu încape nu blochează documentele mici din spatele lui. Cele mari
+    ocupă împreună cel mult `proportie_mari` din capacitate. Costul unui document e
+    plafonat la limita clasei lui, ca un document admis de limite să poată rula singur.
+    Rulează pe event loop-ul aplicației, fără lock-uri.
+    """
+
+    def __init__(self, capacitate: int, prag_mare: int, proportie_mari: float, max_asteptare: int):
+        self.capacitate = capacitate
+        self.prag_mare = prag_mare
+        self.capacitate_mari = int(capacitate * proportie_mari)
+        self.max_asteptare = max_asteptare
+        self.folosit = 0
+        self.folosit_mari = 0
+        self._asteptare: Deque[Tuple[int, bool, asyncio.Future]] = deque()
+
+    def _incape(self, cost: int, mare: bool) -> bool:
+        return self.folosit + cost <= self.capacitate and (not mare or self.folosit_mari + cost <= self.capacitate_mari)
+
+    def _ocupa(self, cost: int, mare: bool) -> None:
+        self.folosit += cost
+        if mare:
+            self.folosit_mari += cost
+
+    def elibereaza(self, cost: int, mare: bool) -> None:
+        self.folosit -= cost
+        if mare:
+            self.folosit_mari -= cost
+        self._trezeste()
+
+    def _trezeste(self) -> None:
+        """Admite, în ordine, primii din fiecare clasă care încap acum."""
+        blocate = set()
+        for intrare in list(self._asteptare):
+            cost, mare, future = intrare
+            if future.done():
+                self._asteptare.remove(intrare)
+            elif mare not in blocate and self._incape(cost, mare):
+                self._asteptare.remove(intrare)
+                self._ocupa(cost, mare)
+                future.set_result(None)
+            else:
+                blocate.add(mare)
+
+    async def rezerva(self, cost: int, timeout: Optional[float]) -> Rezervare:
+        """Ocupă `cost` din buget, așteptând cel mult `timeout` secunde (None = oricât).
+
+        Cererile care așteaptă oricât (joburile, deja limitate de `JOB_WORKERS`) nu
+        sunt numărate în `max_asteptare`.
+        """
+        mare = cost > self.prag_mare
+        cost = min(cost, self.capacitate_mari if mare else self.capacitate)
+        if not any(m == mare for _, m, _ in self._asteptare) and self._incape(cost, mare):
+            self._ocupa(cost, mare)
+            return Rezervare(self, cost, mare)
+        if timeout is not None and sum(1 for _, _, f in self._asteptare if not f.done()) >= self.max_asteptare:
+            raise BugetOcupat()
+
+        future = asyncio.get_running_loop().create_future()
+        intrare = (cost, mare, future)
+        self._asteptare.append(intrare)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Admis chiar înainte de anulare: capacitatea primită se dă mai departe
+                self.elibereaza(cost, mare)
+            else:
+                future.cancel()
+                if intrare in self._asteptare:
+                    self._asteptare.remove(intrare)
+                # Primul din clasă a renunțat: cei din spatele lui pot încăpea
+                self._trezeste()
+            if isinstance(e, asyncio.TimeoutError):
+                raise BugetOcupat() from None
+            raise
+        return Rezervare(self, cost, mare)
+
+
+buget = BugetConcurenta(ADMITERE_BUGET_TOKENI, ADMITERE_PRAG_MARE_TOKENI, ADMITERE_PROPORTIE_MARI,
+                        ADMITERE_MAX_ASTEPTARE)
+
+
+async def evalueaza(temp_path: str, hash_pdf: Optional[str] = None) -> Optional[EstimareCost]:
+    """Estimarea costului, verificată față de limitele pe document (413).
+
+    None dacă admiterea e dezactivată, dacă rezultatul documentului e deja în cache
+    sau dacă PDF-ul nu poate fi deschis (extracția va răspunde cu eroarea potrivită).
+    """
+    if not ADMITERE_ACTIVATA:
+        return None
+    cache = get_cache()
+    if hash_pdf and cache and await ruleaza_blocant(
+            cache.contine, CacheRezultate.cheie_document(hash_pdf, PROMPT_VERSION_DOCUMENT)):
+        ADMITERE.inc(rezultat="cache")
+        return None
+    try:
+        with masoara("estimare"):
+            estimare = await ruleaza_blocant(estimeaza_cost, temp_path)
+    except Exception as e:
+        print(f"--- [AVERTISMENT] Admitere: costul nu a putut fi estimat: {e} ---")
+        return None
+    verifica_limite(estimare)
+    return estimare
+
+
+async def rezerva(estimare: Optional[EstimareCost], asteptare: Optional[float] = ADMITERE_ASTEPTARE_SECUNDE) -> Rezervare:
+    """Ocupă bugetul pentru o analiză estimată; 429 dacă nu se eliberează la timp."""
+    if estimare is None:
+        return Rezervare()
+    try:
+        with masoara("admitere"):
+            rezervare = await buget.rezerva(estimare.tokeni, asteptare)
+    except BugetOcupat:
+        ADMITERE.inc(rezultat="respins_ocupat")
+        raise HTTPException(status_code=429, detail="Serverul analizează acum prea multe documente. Reîncearcă în curând.",
+                            headers={"Retry-After": str(math.ceil(ADMITERE_ASTEPTARE_SECUNDE))})
+    ADMITERE.inc(rezultat="admis")
+    rezervare.estimare = estimare
+    return rezervare
+
+
+async def admite(temp_path: str, hash_pdf: Optional[str] = None) -> Rezervare:
+    """Estimare, limite și buget pentru un PDF salvat pe disc; rezervarea se eliberează
+    la sfârșitul analizei (`with await admite(...)`)."""
+    return await rezerva(await evalueaza(temp_path, hash_pdf))
@@ -0,0 +1,227 @@
+"""Alinierea citatelor `clauza_originala` cu textul extras al documentului.
+
+Modelul citează clauzele aproximativ: sare pasaje cu `[...]`, unește rândurile altfel
+decât extracția din PDF, pierde diacritice sau primește litere greșite de la OCR.
+`IndexCitate` se construiește o singură dată pe document: cuvintele textului,
+normalizate (litere mici, fără diacritice), cu pozițiile lor și un index al
+secvențelor de câte `K` cuvinte consecutive (shingle-uri). Fiecare segment al unui
+citat își caută locul prin shingle-urile comune cu textul: fiecare shingle regăsit
+votează o diagonală (poziția în text minus poziția în citat), iar diagonala cu cele
+mai multe voturi, cu o toleranță pentru cuvintele lipsă sau în plus, dă intervalul
+de caractere. Construcția e liniară în lungimea textului, căutarea aproape liniară
+în lungimea citatului.
+
+Rezultatul spune și cât de sigur e locul găsit: `exacta` (aceleași cuvinte, în
+aceeași ordine), `aproximativa` (destule shingle-uri comune) sau `negasita`.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from metrici import CITATE
+
+# Cuvinte pe shingle: destul de lung cât să fie rar într-un contract, destul de
+# scurt cât o greșeală de OCR să nu strice prea multe shingle-uri
+K = 3
+# Shingle-urile mai frecvente (formule-tip: „în termen de”) nu votează decât dacă
+# un segment nu are altele, și atunci doar cu primele lor apariții
+FRECVENTA_MAXIMA = 32
+# Diagonalele la cel mult atâtea cuvinte distanță sunt aceeași aliniere (cuvinte
+# omise sau inserate de model sau de OCR)
+TOLERANTA_DIAGONALA = 3
+# Proporția minimă de shingle-uri ale citatului regăsite în text
+PRAG_APROXIMATIV = 0.35
+# Caractere maxime între două segmente consecutive ale unui citat cu `[...]`
+DISTANTA_MAXIMA_SEGMENTE = 5000
+
+POTRIVIRI = ("exacta", "aproximativa", "negasita")
+
+_CUVANT = re.compile(r"\w+")
+_ELIZIUNE = re.compile(r"[\[(]\s*(?:\.\s*){2,}[\])]|[\[(]\s*…\s*[\])]|\.{3,}|…")
+
+
+def normalizeaza_cuvant(cuvant: str) -> str:
+    """Litere mici, fără diacritice (ș/ş, ț/ţ și â/a devin aceeași literă)."""
+    descompus = unicodedata.normalize("NFKD", cuvant.lower())
+    return "".join(c for c in descompus if not unicodedata.combining(c))
+
+
+@dataclass
+class Aliniere:
+    """Locul unui citat în text: `text[start:end]`, de la primul la ultimul cuvânt găsit."""
+    potrivire: str
+    start: Optional[int] = None
+    end: Optional[int] = None
+    scor: float = 0.0
+    # Intervalele segmentelor separate prin `[...]`, în ordinea din citat
+    segmente: List[Tuple[int, int]] = field(default_factory=list)
+
+
+class IndexCitate:
+    """Indexul textului unui document, pentru alinierea oricâtor citate."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._vocabular: Dict[str, int] = {}
+        self._cuvinte: List[int] = []
+        self._starturi: List[int] = []
+        self._sfarsituri: List[int] = []
+        # Normalizarea e partea scumpă; aceeași formă a unui cuvânt e normalizată o dată
+        ids_forme: Dict[str, int] = {}
+        for potrivire in _CUVANT.finditer(text):
+            forma = potrivire.group()
+            id_cuvant = ids_forme.get(forma)
+            if id_cuvant is None:
+                cuvant = normalizeaza_cuvant(forma)
+                id_cuvant = ids_forme[forma] = self._vocabular.setdefault(cuvant, len(self._vocabular))
+            self._cuvinte.append(id_cuvant)
+            self._starturi.append(potrivire.start())
+            self._sfarsituri.append(potrivire.end())
+
+        self._pozitii: Dict[int, List[int]] = defaultdict(list)
+        for i, cuvant in enumerate(self._cuvinte):
+            self._pozitii[cuvant].append(i)
+        self._shingle: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(self._cuvinte) - K + 1):
+            self._shingle[self._cheie(self._cuvinte, i)].append(i)
+
+    def _cheie(self, cuvinte: List[int], i: int) -> int:
+        # Id-urile cuvintelor combinate într-un singur int: cheie exactă, fără tupluri
+        marime = len(self._vocabular) + 1
+        cheie = 0
+        for cuvant in cuvinte[i:i + K]:
+            cheie = cheie * marime + cuvant
+        return cheie
+
+    def _ids(self, segment: str) -> List[int]:
+        # Cuvintele absente din text primesc -1: nu pot vota, dar ocupă poziția în citat
+        return [self._vocabular.get(normalizeaza_cuvant(c), -1) for c in _CUVANT.findall(segment)]
+
+    def _cauta_exact(self, ids: List[int], de_la: int) -> Optional[Tuple[int, int]]:
+        """Prima apariție (de la cuvântul `de_la`) a secvenței exacte; pentru segmentele scurte."""
+        if -1 in ids:
+            return None
+        pozitii = self._pozitii.get(ids[0], [])
+        for p in pozitii[bisect_left(pozitii, de_la):]:
+            if self._cuvinte[p:p + len(ids)] == ids:
+                return p, p + len(ids) - 1
+        return None
+
+    def _voturi(self, ids: List[int], de_la: int, cu_frecvente: bool) -> List[Tuple[int, int]]:
+        """Perechile (poziție în text, poziție în citat) ale shingle-urilor comune.
+
+        Shingle-urile frecvente votează doar cu primele lor `FRECVENTA_MAXIMA` apariții
+        de la `de_la`: la voturi egale câștigă oricum prima apariție.
+        """
+        perechi = []
+        for j in range(len(ids) - K + 1):
+            if -1 in ids[j:j + K]:
+                continue
+            pozitii = self._shingle.get(self._cheie(ids, j))
+            if not pozitii or (len(pozitii) > FRECVENTA_MAXIMA and not cu_frecvente):
+                continue
+            inceput = bisect_left(pozitii, de_la)
+            perechi.extend((p, j) for p in pozitii[inceput:inceput + FRECVENTA_MAXIMA])
+        return perechi
+
+    def _cauta_segment(self, ids: List[int], de_la: int) -> Optional[Tuple[int, int, float]]:
+        """Primul și ultimul cuvânt (indici în text) ai segmentului, plus proporția regăsită."""
+        if len(ids) < K:
+            gasit = self._cauta_exact(ids, de_la)
+            return (*gasit, 1.0) if gasit else None
+
+        perechi = self._voturi(ids, de_la, cu_frecvente=False) or self._voturi(ids, de_la, cu_frecvente=True)
+        if not perechi:
+            return None
+        diagonale = Counter(p - j for p, j in perechi)
+        # Voturile unei diagonale includ vecinele ei; la egalitate câștigă prima apariție
+        scoruri = {
+            d: sum(diagonale.get(d + delta, 0) for delta in range(-TOLERANTA_DIAGONALA, TOLERANTA_DIAGONALA + 1))
+            for d in diagonale
+        }
+        diagonala = min(scoruri, key=lambda d: (-scoruri[d], d))
+        # Scorul se verifică pe text, în jurul diagonalei alese: contează și shingle-urile
+        # frecvente, care n-au votat
+        aliniate = []
+        for j in range(len(ids) - K + 1):
+            for p in range(max(de_la, diagonala + j - TOLERANTA_DIAGONALA), diagonala + j + TOLERANTA_DIAGONALA + 1):
+                if self._cuvinte[p:p + K] == ids[j:j + K]:
+                    aliniate.append((p, j))
+                    break
+        scor = len(aliniate) / (len(ids) - K + 1)
+
+        p_prim, j_prim = aliniate[0]
+        p_ultim, j_ultim = aliniate[-1]
+        # Cuvintele de la capete care n-au intrat în niciun shingle comun (zgomot) sunt
+        # presupuse la locul lor, pe aceeași diagonală
+        prim = max(0, p_prim - j_prim)
+        ultim = min(len(self._cuvinte) - 1, p_ultim + K - 1 + (len(ids) - K - j_ultim))
+        return prim, ultim, scor
+
+    def aliniaza(self, citat: str, de_la: int = 0) -> Aliniere:
+        """Caută citatul în text; segmentele separate prin `[...]` sunt căutate în ordine.
+
+        `de_la` e poziția (în caractere) de la care e căutat întâi, de obicei începutul
+        chunk-ului din care vine citatul: o formulă repetată în document e găsită acolo
+        unde a citit-o modelul, nu la prima ei apariție. Dacă nu e găsit după `de_la`,
+        e căutat în tot textul.
+        """
+        if de_la:
+            aliniere = self._aliniaza(citat, bisect_left(self._starturi, de_la))
+            if aliniere.potrivire != "negasita":
+                return aliniere
+        return self._aliniaza(citat, 0)
+
+    def _aliniaza(self, citat: str, de_la: int) -> Aliniere:
+        segmente = [self._ids(segment) for segment in _ELIZIUNE.split(citat or "")]
+        segmente = [ids for ids in segmente if ids]
+        if not segmente:
+            return Aliniere("negasita")
+
+        # (primul cuvânt, ultimul cuvânt, scor, segment) pentru fiecare segment găsit
+        gasite: List[Tuple[int, int, float, List[int]]] = []
+        for ids in segmente:
+            rezultat = self._cauta_segment(ids, de_la)
+            if rezultat is None:
+                continue
+            prim, ultim, scor = rezultat
+            if gasite and self._starturi[prim] - self._sfarsituri[gasite[-1][1]] > DISTANTA_MAXIMA_SEGMENTE:
+                # Segmentul anterior poate fi o formulă repetată în document: îl căutăm din nou
+                # în fața acestuia, nu doar la prima lui apariție
+                anterior = gasite[-1][3]
+                de_la_aproape = bisect_left(self._starturi, self._starturi[prim] - DISTANTA_MAXIMA_SEGMENTE)
+                de_la_aproape = max(de_la_aproape, gasite[-2][1] + 1 if len(gasite) > 1 else 0)
+                reancorat = self._cauta_segment(anterior, de_la_aproape)
+                if reancorat is None or reancorat[1] >= prim or reancorat[2] < PRAG_APROXIMATIV:
+                    continue
+                gasite[-1] = (*reancorat, anterior)
+            gasite.append((prim, ultim, scor, ids))
+            de_la = ultim + 1
+
+        scor = sum(scor * len(ids) for _, _, scor, ids in gasite) / sum(len(ids) for ids in segmente)
+        if not gasite or scor < PRAG_APROXIMATIV:
+            return Aliniere("negasita", scor=round(scor, 3))
+        exacta = len(gasite) == len(segmente) and all(
+            self._cuvinte[prim:ultim + 1] == ids for prim, ultim, _, ids in gasite)
+        intervale = [(self._starturi[prim], self._sfarsituri[ultim]) for prim, ultim, _, _ in gasite]
+        return Aliniere("exacta" if exacta else "aproximativa", intervale[0][0], intervale[-1][1],
+                        round(scor, 3), intervale)
+
+
+def aliniaza_probleme(index: IndexCitate, probleme: List[dict], de_la: int = 0) -> List[dict]:
+    """Copii ale problemelor cu `start`, `end` și `potrivire_citat` față de textul indexat.
+
+    Întoarce copii: aceleași liste de probleme pot fi partajate între documente
+    (chunk-uri identice într-un lot) sau păstrate în cache.
+    """
+    aliniate = []
+    for problema in probleme:
+        aliniere = index.aliniaza(problema.get("clauza_originala", ""), de_la)
+        CITATE.inc(potrivire=aliniere.potrivire)
+        aliniate.append({**problema, "start": aliniere.start, "end": aliniere.end,
+                         "potrivire_citat": aliniere.potrivire})
+    return aliniate
@@ -1,15 +1,46 @@
+import asyncio
+import hashlib
+import json
 import os
 import tempfile
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple, Union
+from fastapi import FastAPI, File, Form, Path, Query, Request, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from schemas import AnalysisResponse
-from config import origins
-from utils import chunking_inteligent_regex
-from openai_client import analizeaza_chunk, genereaza_sinteza
-from pdf_processor import extract_text_from_pdf
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from schemas import AnalysisResponse, BatchResponse, CompactAnalysisResponse, JobStatus, RevisionResponse
+from config import (
+    LOT_MAX_DOCUMENTE, LOT_MAX_MB, METRICI_ACTIVATE, METRICI_SERVER_TIMING, RASPUNS_GZIP_MIN_OCTETI, RASPUNS_GZIP_NIVEL,
+    SSE_PING_SECUNDE, UPLOAD_BLOCK_KB, UPLOAD_MAX_MB, origins,
+)
+import admitere
+import ciclu_viata
+from executie import ruleaza_blocant
+from jobs import CoadaInchisa, CoadaPlina, coada_joburi
+import metrici
+from loturi import DocumentLot, analizeaza_lot
+from openai_client import genereaza_sinteza_async
+from raspuns_compact import FORMATE_RASPUNS, raspuns_compact, text_dupa_id
+from revizii import PATTERN_DOCUMENT_ID, analizeaza_revizie
+from pipeline import (
+    analizeaza_chunkuri_cu_cache_pe_masura, analizeaza_document, extrage_document, pregateste_chunkuri,
+    rezultat_din_cache, salveaza_rezultat, verifica_chunkuri_esuate,
+)
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Încălzirea pornește în fundal; oprirea așteaptă joburile în curs (vezi `ciclu_viata`)
+    await ciclu_viata.la_pornire()
+    yield
+    await ciclu_viata.la_oprire()
 
-app = FastAPI(title="Desluseste.ro API", version="1.0")
+
+app = FastAPI(title="Desluseste.ro API", version="1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +49,9 @@ app.add_middleware(
     allow_methods=["GET", "POST"],
     allow_headers=["*"]
 )
+# Răspunsurile mari (textul documentului) pleacă comprimate dacă clientul acceptă gzip;
+# evenimentele SSE sunt excluse implicit
+app.add_middleware(GZipMiddleware, minimum_size=RASPUNS_GZIP_MIN_OCTETI, compresslevel=RASPUNS_GZIP_NIVEL)
 
 
 @app.get("/")
@@ -26,38 +60,417 @@ def read_root():
     return {"status": "API-ul Desluseste.ro este funcțional!"}
 
 
-@app.post("/analizeaza-pdf/", response_model=AnalysisResponse)
-def analizeaza_pdf_endpoint(file: UploadFile = File(...)):
+@app.get("/ready")
+def ready_endpoint():
+    """Readiness: 200 după încălzirea worker-ului, 503 cât se încălzește sau după
+    semnalul de oprire. Spre deosebire de `/`, spune dacă worker-ul trebuie să primească trafic."""
+    stare = ciclu_viata.stare
+    continut = {"status": stare.status, "incalzire": {nume: round(durata, 3) for nume, durata in stare.durate.items()}}
+    if stare.status != "gata":
+        return JSONResponse(status_code=503, content=continut, headers={"Retry-After": "5"})
+    return continut
+
+
+UPLOAD_MAX_BYTES = UPLOAD_MAX_MB * 1024 * 1024
+MESAJ_UPLOAD_PREA_MARE = f"Fișierul depășește limita de {UPLOAD_MAX_MB} MB."
+LOT_MAX_BYTES = LOT_MAX_MB * 1024 * 1024
+MESAJ_LOT_PREA_MARE = f"Lotul depășește limita de {LOT_MAX_MB} MB."
+
+
+@app.middleware("http")
+async def limiteaza_dimensiunea_upload(request: Request, call_next):
+    """Respinge din header cererile evident prea mari, înainte de parsarea multipart."""
+    lungime = request.headers.get("content-length", "")
+    lot = request.url.path == "/analizeaza-lot/"
+    limita = LOT_MAX_BYTES if lot else UPLOAD_MAX_BYTES
+    # Marjă pentru delimitatorii și header-ele multipart
+    if request.method == "POST" and lungime.isdigit() and int(lungime) > limita + 64 * 1024:
+        mesaj = MESAJ_LOT_PREA_MARE if lot else MESAJ_UPLOAD_PREA_MARE
+        return JSONResponse(status_code=413, content={"detail": mesaj})
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def masoara_cererea(request: Request, call_next):
+    """Contorizează cererea și, dacă e activat, adaugă antetul `Server-Timing`.
+
+    Pentru răspunsurile SSE antetul pleacă odată cu primul eveniment, deci conține
+    doar etapele terminate până atunci.
+    """
+    start = time.perf_counter()
+    defalcare = metrici.porneste_defalcare()
+    response = await call_next(request)
+    durata = time.perf_counter() - start
+    # Șablonul rutei, nu calea: /joburi/{job_id} e o singură serie
+    ruta = getattr(request.scope.get("route"), "path", "necunoscuta")
+    metrici.CERERI_HTTP.inc(ruta=ruta, status=response.status_code)
+    metrici.CERERE_SECUNDE.observa(durata, ruta=ruta)
+    if defalcare.get("tokeni"):
+        metrici.TOKENI_PER_CERERE.observa(defalcare["tokeni"], ruta=ruta)
+    if METRICI_SERVER_TIMING:
+        response.headers["Server-Timing"] = metrici.server_timing(defalcare, durata)
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Metricile procesului curent, în formatul text Prometheus."""
+    if not METRICI_ACTIVATE:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrici.registru.expune(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _salveaza_flux(flux: BinaryIO, max_bytes: int = UPLOAD_MAX_BYTES,
+                   mesaj: str = MESAJ_UPLOAD_PREA_MARE) -> Tuple[str, str]:
+    """Copiază un flux pe disc în blocuri de mărime fixă, calculând hash-ul din mers.
+
+    Memoria folosită nu depinde de mărimea fișierului; peste `max_bytes` (implicit
+    `UPLOAD_MAX_MB`) copierea se oprește și cererea primește 413 cu `mesaj`.
+    Întoarce calea fișierului temporar și hash-ul.
+    """
+    hash_pdf = hashlib.sha256()
+    scris = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp:
+        try:
+            while bloc := flux.read(UPLOAD_BLOCK_KB * 1024):
+                scris += len(bloc)
+                if scris > max_bytes:
+                    raise HTTPException(status_code=413, detail=mesaj)
+                hash_pdf.update(bloc)
+                temp.write(bloc)
+        except BaseException:
+            temp.close()
+            os.remove(temp.name)
+            raise
+    return temp.name, hash_pdf.hexdigest()
+
+
+def _salveaza_upload(file: UploadFile) -> Tuple[str, str]:
+    with metrici.masoara("upload"):
+        return _salveaza_flux(file.file)
+
+
+PATTERN_FORMAT = f"^({'|'.join(FORMATE_RASPUNS)})$"
+
+
+async def _formateaza(rezultat: dict, format_raspuns: str, text_separat: bool) -> dict:
+    if format_raspuns != "compact":
+        return rezultat
+    # Alinierea citatelor vechi și salvarea textului în cache blochează
+    return await ruleaza_blocant(raspuns_compact, rezultat, text_separat)
+
+
+@app.post("/analizeaza-pdf/", response_model=Union[AnalysisResponse, CompactAnalysisResponse], response_model_exclude_none=True)
+async def analizeaza_pdf_endpoint(
+    file: UploadFile = File(...),
+    format_raspuns: str = Query("complet", alias="format", pattern=PATTERN_FORMAT),
+    text_separat: bool = Query(False),
+):
     """
     Endpoint principal care primește un PDF, încearcă extragerea digitală,
     folosește OCR ca fallback, și apoi analizează textul rezultat.
+
+    Cu `?format=compact` problemele indică clauza prin poziții în text, iar textul
+    apare o singură dată; cu `&text_separat=true` nici atât (vezi `/texte/{text_id}`).
+
+    Înainte de analiză, costul e estimat din pagini și stratul de text (vezi
+    `admitere`): peste limitele pe document răspunsul e 413, iar când worker-ul e
+    ocupat și bugetul nu se eliberează la timp, 429 cu `Retry-After`.
     """
-    temp_path = None
+    temp_path, hash_pdf = await ruleaza_blocant(_salveaza_upload, file)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp:
-            temp.write(file.file.read())
-            temp_path = temp.name
+        with await admitere.admite(temp_path, hash_pdf):
+            rezultat = await analizeaza_document(temp_path, hash_pdf)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return await _formateaza(rezultat, format_raspuns, text_separat)
 
-        text_document = extract_text_from_pdf(temp_path)
 
-        if not text_document.strip():
-            raise HTTPException(status_code=400, detail="Fișierul PDF este gol sau complet ilizibil, chiar și după încercarea OCR.")
+@app.get("/texte/{text_id}", response_class=PlainTextResponse)
+async def text_endpoint(text_id: str = Path(..., pattern="^[0-9a-f]{64}$")):
+    """Textul extras al unui document, pentru răspunsurile compacte cu `text_separat`.
 
-    except HTTPException:
+    Adresat prin conținut, deci poate fi păstrat oricât de mult în cache-ul clientului.
+    """
+    text = await ruleaza_blocant(text_dupa_id, text_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Text inexistent sau expirat.")
+    return PlainTextResponse(text, headers={"Cache-Control": "private, max-age=31536000, immutable", "ETag": f'"{text_id}"'})
+
+
+@app.post("/analizeaza-pdf/revizie/", response_model=RevisionResponse)
+async def analizeaza_revizie_endpoint(file: UploadFile = File(...), document_id: Optional[str] = Form(None)):
+    """
+    Analizează o nouă revizie a unui contract deja încărcat: doar clauzele adăugate
+    sau modificate față de revizia precedentă a lui `document_id` sunt re-analizate.
+    Fără `document_id`, documentul e tratat ca prima revizie și primește un id nou;
+    un `document_id` care nu a fost emis de server (sau a expirat) dă 404, iar o
+    revizie salvată între timp de alt worker pentru același document dă 409.
+    """
+    if document_id is not None and not PATTERN_DOCUMENT_ID.fullmatch(document_id):
+        raise HTTPException(status_code=400, detail="document_id invalid (id-ul întors de prima analiză, 32 de caractere hex).")
+    temp_path, _ = await ruleaza_blocant(_salveaza_upload, file)
+    try:
+        with await admitere.admite(temp_path):
+            return await analizeaza_revizie(temp_path, document_id)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _este_zip(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".zip") or file.content_type in (
+        "application/zip", "application/x-zip-compressed")
+
+
+def _salveaza_lot(fisiere: List[UploadFile]) -> List[DocumentLot]:
+    """Salvează PDF-urile lotului pe disc; arhivele ZIP sunt despachetate (doar intrările .pdf).
+
+    Pe lângă limita pe fișier, suma a ce se scrie pe disc (după dezarhivare) e limitată
+    la `LOT_MAX_MB`: header-ul `Content-Length` vede doar arhiva comprimată.
+    """
+    documente: List[DocumentLot] = []
+    scris = 0
+
+    def _adauga(nume: str, flux: BinaryIO) -> None:
+        nonlocal scris
+        if len(documente) >= LOT_MAX_DOCUMENTE:
+            raise HTTPException(status_code=413, detail=f"Lotul depășește limita de {LOT_MAX_DOCUMENTE} documente.")
+        ramas = LOT_MAX_BYTES - scris
+        if ramas < UPLOAD_MAX_BYTES:
+            temp_path, hash_pdf = _salveaza_flux(flux, ramas, MESAJ_LOT_PREA_MARE)
+        else:
+            temp_path, hash_pdf = _salveaza_flux(flux)
+        documente.append(DocumentLot(nume, temp_path, hash_pdf))
+        scris += os.path.getsize(temp_path)
+
+    try:
+        for file in fisiere:
+            if not _este_zip(file):
+                _adauga(file.filename or f"document_{len(documente) + 1}.pdf", file.file)
+                continue
+            try:
+                arhiva = zipfile.ZipFile(file.file)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Arhiva {file.filename} nu este un ZIP valid.")
+            with arhiva:
+                for info in arhiva.infolist():
+                    nume = info.filename
+                    if info.is_dir() or not nume.lower().endswith(".pdf") or nume.startswith("__MACOSX/"):
+                        continue
+                    # Mărimea declarată în arhivă poate minți; _salveaza_flux verifică oricum ce citește
+                    if info.file_size > UPLOAD_MAX_BYTES:
+                        raise HTTPException(status_code=413, detail=f"{nume}: {MESAJ_UPLOAD_PREA_MARE}")
+                    if info.file_size > LOT_MAX_BYTES - scris:
+                        raise HTTPException(status_code=413, detail=MESAJ_LOT_PREA_MARE)
+                    with arhiva.open(info) as flux:
+                        _adauga(nume, flux)
+    except BaseException:
+        _sterge_lot(documente)
         raise
+    if not documente:
+        raise HTTPException(status_code=400, detail="Lotul nu conține niciun PDF.")
+    return documente
+
+
+def _sterge_lot(documente: List[DocumentLot]) -> None:
+    for document in documente:
+        if os.path.exists(document.temp_path):
+            os.remove(document.temp_path)
+
+
+@app.post("/analizeaza-lot/", response_model=BatchResponse)
+async def analizeaza_lot_endpoint(files: List[UploadFile] = File(...)):
+    """
+    Analizează mai multe contracte într-o singură cerere: PDF-uri multiple și/sau
+    arhive ZIP cu PDF-uri. Documentele și chunk-urile identice sunt analizate o
+    singură dată, cu un buget comun de concurență și rată; fiecare document trece
+    prin admitere (un document peste limite e raportat ca eșuat, cu 413). Răspunsul
+    conține rezultatul fiecărui document și un sumar al lotului.
+    """
+    with metrici.masoara("upload"):
+        documente = await ruleaza_blocant(_salveaza_lot, files)
+    try:
+        return await analizeaza_lot(documente)
+    finally:
+        _sterge_lot(documente)
+
+
+def _eveniment_sse(nume: str, date: dict) -> str:
+    return f"event: {nume}\ndata: {json.dumps(date, ensure_ascii=False)}\n\n"
+
+
+# Comentariu SSE: clienții îl ignoră, dar ține conexiunea activă
+PING_SSE = ": ping\n\n"
+
+
+async def _cu_ping(evenimente: AsyncIterator[str], interval: float) -> AsyncIterator[str]:
+    """Trimite mai departe `evenimente`, plus un `PING_SSE` după fiecare `interval`
+    secunde în care nu a apărut niciun eveniment (extracția, OCR-ul, primul chunk)."""
+    urmator: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if urmator is None:
+                urmator = asyncio.ensure_future(evenimente.__anext__())
+            gata, _ = await asyncio.wait({urmator}, timeout=interval)
+            if not gata:
+                yield PING_SSE
+                continue
+            terminat, urmator = urmator, None
+            try:
+                eveniment = terminat.result()
+            except StopAsyncIteration:
+                return
+            yield eveniment
+    finally:
+        # Clientul a închis conexiunea: oprim pasul în curs, ca generatorul să-și ruleze curățenia
+        if urmator is not None:
+            urmator.cancel()
+            await asyncio.wait({urmator})
+        await evenimente.aclose()
+
+
+async def _evenimente_analiza(temp_path: str, hash_pdf: str, rezervare: admitere.Rezervare) -> AsyncIterator[str]:
+    """Rulează pipeline-ul și emite evenimentele SSE pe măsură ce etapele se termină."""
+    try:
+        rezultat_cache = await ruleaza_blocant(rezultat_din_cache, hash_pdf)
+        if rezultat_cache is not None:
+            yield _eveniment_sse("text", {
+                "text_original": rezultat_cache["text_original"],
+                "inceput_pagini": rezultat_cache.get("inceput_pagini", []),
+            })
+            yield _eveniment_sse("probleme", {"index": 0, "total": 1, "probleme": rezultat_cache["probleme_identificate"]})
+            yield _eveniment_sse("rezumat", {"rezumat_executiv": rezultat_cache["rezumat_executiv"]})
+            yield _eveniment_sse("final", {
+                "numar_probleme": len(rezultat_cache["probleme_identificate"]), "chunkuri_esuate": 0,
+                "chunkuri_omise": rezultat_cache.get("chunkuri_omise", []),
+            })
+            return
+
+        document = await extrage_document(temp_path)
+        text_document = document.text
+        yield _eveniment_sse("text", {"text_original": text_document, "inceput_pagini": document.inceput_pagini})
+        # Indexul pentru pozițiile citatelor se construiește o dată, înaintea chunk-urilor
+        await ruleaza_blocant(lambda: document.index_citate)
+
+        chunkuri, de_analizat, omise = await ruleaza_blocant(pregateste_chunkuri, document)
+        probleme_pe_chunk = [[] for _ in de_analizat]
+        aliniate_pe_chunk = [[] for _ in de_analizat]
+        chunkuri_esuate = 0
+        async for j, probleme in analizeaza_chunkuri_cu_cache_pe_masura([chunkuri[i].text for i in de_analizat]):
+            if probleme is None:
+                chunkuri_esuate += 1
+                probleme = []
+            probleme_pe_chunk[j] = probleme
+            chunk = chunkuri[de_analizat[j]]
+            aliniate_pe_chunk[j] = await ruleaza_blocant(document.aliniaza_probleme, probleme_pe_chunk[j], chunk.start)
+            yield _eveniment_sse("probleme", {
+                "index": j, "total": len(de_analizat), "start": chunk.start, "end": chunk.end,
+                "pagini": document.pagini_intre(chunk.start, chunk.end),
+                "probleme": aliniate_pe_chunk[j],
+            })
+
+        verifica_chunkuri_esuate(chunkuri_esuate, len(de_analizat))
+        toate_problemele = [problem for probleme in probleme_pe_chunk for problem in probleme]
+        rezumat_final = await genereaza_sinteza_async(toate_problemele)
+        yield _eveniment_sse("rezumat", {"rezumat_executiv": rezumat_final})
+
+        await ruleaza_blocant(salveaza_rezultat, hash_pdf, {
+            "probleme_identificate": [problema for probleme in aliniate_pe_chunk for problema in probleme],
+            "rezumat_executiv": rezumat_final,
+            "text_original": text_document,
+            "inceput_pagini": document.inceput_pagini,
+            "chunkuri_esuate": chunkuri_esuate,
+            "chunkuri_omise": omise,
+        }, chunkuri_esuate)
+        yield _eveniment_sse("final", {
+            "numar_probleme": len(toate_problemele), "chunkuri_esuate": chunkuri_esuate, "chunkuri_omise": omise,
+        })
+
+    except HTTPException as e:
+        yield _eveniment_sse("eroare", {"status": e.status_code, "detail": e.detail})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"A apărut o eroare la procesarea PDF: {str(e)}")
+        yield _eveniment_sse("eroare", {"status": 500, "detail": f"A apărut o eroare la analiză: {str(e)}"})
     finally:
-        if temp_path and os.path.exists(temp_path):
+        rezervare.elibereaza()
+        if os.path.exists(temp_path):
             os.remove(temp_path)
 
-    # Analiză
-    chunkuri = chunking_inteligent_regex(text_document)
-    toate_problemele = [problem for chunk in chunkuri for problem in analizeaza_chunk(chunk)]
-    rezumat_final = genereaza_sinteza(toate_problemele)
 
-    return {
-        "probleme_identificate": toate_problemele,
-        "rezumat_executiv": rezumat_final,
-        "text_original": text_document
-    }
+@app.post("/analizeaza-pdf/stream/")
+async def analizeaza_pdf_stream_endpoint(file: UploadFile = File(...)):
+    """
+    Varianta cu streaming a `/analizeaza-pdf/`: trimite Server-Sent Events pe măsură
+    ce lucrul se termină - `text` (cu `inceput_pagini`), câte un `probleme` pentru
+    fiecare chunk (în ordinea terminării, cu `index`, pozițiile `start`/`end` ale
+    chunk-ului în text și `pagini` lui), `rezumat` și la final `final` (sau `eroare`).
+    Între evenimente mai rare de `SSE_PING_SECUNDE` (ex. OCR-ul unui PDF scanat) se
+    trimite comentariul `: ping`. Admiterea (413/429) are loc înaintea primului eveniment.
+    """
+    temp_path, hash_pdf = await ruleaza_blocant(_salveaza_upload, file)
+    try:
+        rezervare = await admitere.admite(temp_path, hash_pdf)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return StreamingResponse(
+        _cu_ping(_evenimente_analiza(temp_path, hash_pdf, rezervare), SSE_PING_SECUNDE),
+        media_type="text/event-stream",
+        # Proxy-urile (nginx) nu trebuie să bufferizeze evenimentele
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Și dacă fluxul nu apucă să pornească (clientul a închis conexiunea)
+        background=BackgroundTask(rezervare.elibereaza),
+    )
+
+
+@app.post("/joburi/", response_model=JobStatus, status_code=202)
+async def trimite_job_endpoint(file: UploadFile = File(...)):
+    """
+    Varianta asincronă a `/analizeaza-pdf/`: pune PDF-ul în coada de analiză și
+    întoarce imediat `job_id`-ul, fără să țină conexiunea deschisă pe durata analizei.
+    """
+    temp_path, hash_pdf = await ruleaza_blocant(_salveaza_upload, file)
+    try:
+        # Limitele pe document se verifică la upload; bugetul îl așteaptă jobul, la rulare
+        estimare = await admitere.evalueaza(temp_path, hash_pdf)
+        job = coada_joburi.trimite(temp_path, hash_pdf, estimare)
+    except HTTPException:
+        os.remove(temp_path)
+        raise
+    except CoadaPlina:
+        os.remove(temp_path)
+        raise HTTPException(status_code=429, detail="Prea multe analize în așteptare. Reîncearcă în câteva minute.")
+    except CoadaInchisa:
+        os.remove(temp_path)
+        raise HTTPException(status_code=503, detail="Serverul se repornește. Reîncearcă în câteva secunde.",
+                            headers={"Retry-After": "5"})
+    return job.status()
+
+
+@app.get("/joburi/{job_id}", response_model=JobStatus)
+async def status_job_endpoint(job_id: str):
+    """Starea jobului și progresul pe etape (extracție, chunking, analiză, sinteză)."""
+    job = coada_joburi.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job inexistent sau expirat.")
+    return job.status()
+
+
+@app.get("/joburi/{job_id}/rezultat", response_model=Union[AnalysisResponse, CompactAnalysisResponse],
+         response_model_exclude_none=True)
+async def rezultat_job_endpoint(
+    job_id: str,
+    format_raspuns: str = Query("complet", alias="format", pattern=PATTERN_FORMAT),
+    text_separat: bool = Query(False),
+):
+    """Rezultatul unui job terminat (complet sau compact, ca la `/analizeaza-pdf/`);
+    409 cât timp analiza încă rulează."""
+    job = coada_joburi.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job inexistent sau expirat.")
+    if job.stare == "esuat":
+        raise HTTPException(status_code=job.cod_eroare, detail=job.eroare)
+    if job.stare != "finalizat":
+        raise HTTPException(status_code=409, detail="Analiza nu s-a terminat încă.")
+    return await _formateaza(job.rezultat, format_raspuns, text_separat)
@@ -0,0 +1,294 @@
+"""Mod offline: analiza în masă prin API-ul de batch al furnizorului.
+
+Pentru revizuirile peste noapte nu avem nevoie de latență interactivă. În loc de
+câte un apel chat-completions per chunk (preț întreg, limitele interactive), toate
+cererile de analiză sunt scrise într-un fișier JSONL, trimise ca un singur batch,
+urmărite prin polling, iar răspunsurile sunt mapate înapoi în liste de `IssueItem`.
+Sintezele documentelor urmează într-un al doilea batch.
+
+Transportul e un parametru (`TransportBatch`): `TransportOpenAI` vorbește cu
+`/files` și `/batches`, iar `TransportLocal` execută cererile în proces printr-o
+funcție dată (implicit apelul interactiv), util pentru teste sau fără acces la batch.
+
+Utilizare (din `desluseste-backend/`):
+    python batch_offline.py contracte/*.pdf --iesire rezultate.jsonl [--local]
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache import CacheRezultate, get_cache, hash_continut
+from config import BATCH_DIRECTOR, BATCH_FEREASTRA, BATCH_INTERVAL_POLLING, BATCH_TIMEOUT_ORE
+from document import DocumentExtras
+from http_client import client_openai
+from openai_client import (
+    PROMPT_VERSION_ANALIZA, REZUMAT_ESUAT, call_openai_api, extrage_probleme, genereaza_sinteza, payload_analiza,
+    payload_sinteza, probleme_valide,
+)
+from pipeline import pregateste_chunkuri, salveaza_rezultat
+
+ENDPOINT_CHAT = "/v1/chat/completions"
+STARI_FINALE = {"completed", "failed", "expired", "cancelled"}
+
+
+class EroareBatch(Exception):
+    """Batch-ul nu s-a terminat (eșuat, expirat, anulat sau timeout la polling)."""
+
+
+class TransportBatch:
+    """Cum ajunge un fișier JSONL la furnizor și cum se întorc rezultatele."""
+
+    def trimite(self, path: str) -> str:
+        """Încarcă fișierul de cereri și pornește batch-ul; întoarce id-ul batch-ului."""
+        raise NotImplementedError
+
+    def stare(self, batch_id: str) -> dict:
+        """Starea batch-ului: `status`, `output_file_id`, `error_file_id`, `request_counts`."""
+        raise NotImplementedError
+
+    def descarca(self, file_id: str) -> str:
+        """Conținutul JSONL al unui fișier de rezultate sau de erori."""
+        raise NotImplementedError
+
+
+class TransportOpenAI(TransportBatch):
+    """API-ul de batch OpenAI, prin sesiunea partajată a `client_openai`."""
+
+    def __init__(self, fereastra: str = BATCH_FEREASTRA):
+        self.fereastra = fereastra
+
+    def trimite(self, path: str) -> str:
+        with open(path, "rb") as fisier:
+            incarcat = client_openai.cerere("POST", "/files", data={"purpose": "batch"},
+                                            files={"file": (os.path.basename(path), fisier, "application/jsonl")})
+        batch = client_openai.cerere("POST", "/batches", json={
+            "input_file_id": incarcat.json()["id"], "endpoint": ENDPOINT_CHAT, "completion_window": self.fereastra,
+        })
+        return batch.json()["id"]
+
+    def stare(self, batch_id: str) -> dict:
+        return client_openai.cerere("GET", f"/batches/{batch_id}").json()
+
+    def descarca(self, file_id: str) -> str:
+        return client_openai.cerere("GET", f"/files/{file_id}/content").text
+
+
+class TransportLocal(TransportBatch):
+    """Execută cererile din JSONL în proces, cu `raspunde(payload) -> răspuns chat`.
+
+    Păstrează formatul de intrare și de ieșire al API-ului de batch, inclusiv liniile
+    de eroare, așa că restul modului offline nu știe diferența. `cicluri` simulează
+    câte interogări de stare rămâne batch-ul „in_progress”.
+    """
+
+    def __init__(self, raspunde: Callable[[dict], dict] = call_openai_api, cicluri: int = 0):
+        self.raspunde = raspunde
+        self.cicluri = cicluri
+        self._batchuri: Dict[str, dict] = {}
+        self._fisiere: Dict[str, str] = {}
+
+    def trimite(self, path: str) -> str:
+        iesire, erori = [], []
+        with open(path, encoding="utf-8") as fisier:
+            for linie in fisier:
+                cerere = json.loads(linie)
+                try:
+                    corp = self.raspunde(cerere["body"])
+                    iesire.append({"custom_id": cerere["custom_id"], "error": None,
+                                   "response": {"status_code": 200, "body": corp}})
+                except Exception as e:
+                    erori.append({"custom_id": cerere["custom_id"], "response": None,
+                                  "error": {"code": type(e).__name__, "message": str(e)}})
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        self._fisiere[f"{batch_id}_out"] = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in iesire)
+        self._fisiere[f"{batch_id}_err"] = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in erori)
+        self._batchuri[batch_id] = {
+            "id": batch_id, "status": "in_progress", "cicluri": self.cicluri,
+            "output_file_id": f"{batch_id}_out" if iesire else None,
+            "error_file_id": f"{batch_id}_err" if erori else None,
+            "request_counts": {"total": len(iesire) + len(erori), "completed": len(iesire), "failed": len(erori)},
+        }
+        return batch_id
+
+    def stare(self, batch_id: str) -> dict:
+        batch = self._batchuri[batch_id]
+        if batch["cicluri"] > 0:
+            batch["cicluri"] -= 1
+        else:
+            batch["status"] = "completed"
+        return dict(batch)
+
+    def descarca(self, file_id: str) -> str:
+        return self._fisiere[file_id]
+
+
+def scrie_cereri(cereri: List[Tuple[str, dict]], path: str) -> None:
+    """Fișierul de intrare al batch-ului: o cerere chat-completions per linie."""
+    with open(path, "w", encoding="utf-8") as fisier:
+        for custom_id, payload in cereri:
+            fisier.write(json.dumps({"custom_id": custom_id, "method": "POST", "url": ENDPOINT_CHAT, "body": payload},
+                                    ensure_ascii=False) + "\n")
+
+
+def ruleaza_batch(
+    cereri: List[Tuple[str, dict]], transport: TransportBatch, eticheta: str = "batch",
+    interval_polling: float = BATCH_INTERVAL_POLLING, timeout: float = BATCH_TIMEOUT_ORE * 3600,
+) -> Dict[str, Optional[dict]]:
+    """Trimite cererile ca un batch și așteaptă rezultatul.
+
+    Întoarce corpul răspunsului chat pe `custom_id`; cererile eșuate au `None`.
+    """
+    if not cereri:
+        return {}
+    os.makedirs(BATCH_DIRECTOR, exist_ok=True)
+    path = os.path.join(BATCH_DIRECTOR, f"{eticheta}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}.jsonl")
+    scrie_cereri(cereri, path)
+    batch_id = transport.trimite(path)
+    print(f"--- [INFO] Batch {batch_id} trimis: {len(cereri)} cereri ({path}). ---")
+
+    limita = time.monotonic() + timeout
+    while True:
+        stare = transport.stare(batch_id)
+        if stare["status"] in STARI_FINALE:
+            break
+        if time.monotonic() > limita:
+            raise EroareBatch(f"Batch-ul {batch_id} nu s-a terminat în {timeout / 3600:.1f} ore.")
+        print(f"--- [INFO] Batch {batch_id}: {stare['status']} {stare.get('request_counts') or ''} ---")
+        time.sleep(interval_polling)
+    if stare["status"] != "completed" and not stare.get("output_file_id"):
+        raise EroareBatch(f"Batch-ul {batch_id} s-a încheiat cu starea {stare['status']}.")
+
+    rezultate: Dict[str, Optional[dict]] = {custom_id: None for custom_id, _ in cereri}
+    for cheie_fisier in ("output_file_id", "error_file_id"):
+        if not stare.get(cheie_fisier):
+            continue
+        for linie in transport.descarca(stare[cheie_fisier]).splitlines():
+            if not linie.strip():
+                continue
+            rand = json.loads(linie)
+            raspuns = rand.get("response") or {}
+            if raspuns.get("status_code") == 200:
+                rezultate[rand["custom_id"]] = raspuns["body"]
+            else:
+                print(f"--- [EROARE] Cererea {rand['custom_id']} a eșuat în batch: {rand.get('error') or raspuns} ---")
+    return rezultate
+
+
+def _probleme_valide(corp: dict) -> Optional[List[dict]]:
+    """Problemele dintr-un răspuns de analiză, validate ca `IssueItem`; None dacă răspunsul e inutilizabil."""
+    try:
+        probleme = extrage_probleme(corp)
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+        print(f"--- [EROARE] Răspuns de analiză invalid în batch: {e} ---")
+        return None
+    return probleme_valide(probleme)
+
+
+def analizeaza_documente_offline(
+    documente: Dict[str, DocumentExtras], transport: TransportBatch, hash_pdf: Optional[Dict[str, str]] = None,
+    **optiuni,
+) -> Dict[str, dict]:
+    """Analizează documentele (id -> document extras) prin două batch-uri: chunk-uri, apoi sinteze.
+
+    Chunk-urile identice (în lot sau deja în cache) sunt trimise o singură dată.
+    Întoarce un `AnalysisResponse` pe document; cu `hash_pdf`, rezultatele complete
+    intră și în cache-ul de documente, ca upload-urile interactive ulterioare să le găsească.
+    """
+    pregatite = {}
+    for document_id, document in documente.items():
+        chunkuri, de_analizat, omise = pregateste_chunkuri(document)
+        de_trimis = [chunkuri[i] for i in de_analizat]
+        pregatite[document_id] = ([chunk.text for chunk in de_trimis], [chunk.start for chunk in de_trimis], omise)
+
+    # Batch 1: chunk-urile unice care nu sunt deja în cache
+    unice = list(dict.fromkeys(chunk for chunkuri, _, _ in pregatite.values() for chunk in chunkuri))
+    chei = {chunk: CacheRezultate.cheie_chunk(chunk, PROMPT_VERSION_ANALIZA) for chunk in unice}
+    probleme_pe_chunk: Dict[str, Optional[List[dict]]] = {}
+    cache = get_cache()
+    if cache:
+        gasite = cache.get_many(list(chei.values()))
+        probleme_pe_chunk = {chunk: gasite[cheie] for chunk, cheie in chei.items() if cheie in gasite}
+    lipsa = [chunk for chunk in unice if chunk not in probleme_pe_chunk]
+    id_chunk = {f"chunk-{hash_continut(chunk)[:24]}": chunk for chunk in lipsa}
+    print(f"--- [INFO] Offline: {len(documente)} documente, {len(unice)} chunk-uri unice, {len(lipsa)} de analizat. ---")
+    for custom_id, corp in ruleaza_batch([(cid, payload_analiza(chunk)) for cid, chunk in id_chunk.items()],
+                                         transport, "analiza", **optiuni).items():
+        chunk = id_chunk[custom_id]
+        probleme_pe_chunk[chunk] = _probleme_valide(corp) if corp is not None else None
+        if probleme_pe_chunk[chunk] is not None and cache:
+            cache.set(chei[chunk], probleme_pe_chunk[chunk])
+
+    rezultate: Dict[str, dict] = {}
+    for document_id, (chunkuri, _, omise) in pregatite.items():
+        probleme = [probleme_pe_chunk.get(chunk) for chunk in chunkuri]
+        rezultate[document_id] = {
+            "probleme_identificate": [problema for lista in probleme for problema in lista or []],
+            "rezumat_executiv": REZUMAT_ESUAT,
+            "text_original": documente[document_id].text,
+            "inceput_pagini": documente[document_id].inceput_pagini,
+            "chunkuri_esuate": sum(1 for lista in probleme if lista is None),
+            "chunkuri_omise": omise,
+        }
+
+    # Batch 2: sintezele, câte una per listă distinctă de probleme (documentele
+    # identice o împart); documentele fără probleme au rezumatul fix, fără apel
+    id_sinteza: Dict[str, List[str]] = {}
+    for document_id, rezultat in rezultate.items():
+        if rezultat["probleme_identificate"]:
+            continut = json.dumps(rezultat["probleme_identificate"], ensure_ascii=False, sort_keys=True)
+            id_sinteza.setdefault(f"sinteza-{hash_continut(continut)[:24]}", []).append(document_id)
+        else:
+            rezultat["rezumat_executiv"] = genereaza_sinteza([])
+    for custom_id, corp in ruleaza_batch(
+        [(cid, payload_sinteza(rezultate[documente[0]]["probleme_identificate"])) for cid, documente in id_sinteza.items()],
+        transport, "sinteza", **optiuni,
+    ).items():
+        if corp is None:
+            continue
+        try:
+            rezumat = corp["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            print(f"--- [EROARE] Răspuns de sinteză invalid în batch ({custom_id}). ---")
+            continue
+        for document_id in id_sinteza[custom_id]:
+            rezultate[document_id]["rezumat_executiv"] = rezumat
+
+    for document_id, rezultat in rezultate.items():
+        chunkuri, starturi, _ = pregatite[document_id]
+        rezultat["probleme_identificate"] = [
+            problema for chunk, start in zip(chunkuri, starturi)
+            for problema in documente[document_id].aliniaza_probleme(probleme_pe_chunk.get(chunk) or [], start)
+        ]
+        if hash_pdf and document_id in hash_pdf:
+            salveaza_rezultat(hash_pdf[document_id], rezultat, rezultat["chunkuri_esuate"])
+    return rezultate
+
+
+def main() -> None:
+    from pdf_processor import extrage_pagini
+
+    parser = argparse.ArgumentParser(description="Analiză offline prin API-ul de batch.")
+    parser.add_argument("pdf", nargs="+")
+    parser.add_argument("--iesire", default="rezultate_offline.jsonl", help="un AnalysisResponse JSON per linie")
+    parser.add_argument("--local", action="store_true", help="execută cererile în proces (fără API-ul de batch)")
+    args = parser.parse_args()
+
+    documente, hashuri = {}, {}
+    for path in args.pdf:
+        with open(path, "rb") as fisier:
+            hashuri[path] = hash_continut(fisier.read())
+        documente[path] = DocumentExtras(extrage_pagini(path))
+
+    rezultate = analizeaza_documente_offline(documente, TransportLocal() if args.local else TransportOpenAI(), hashuri)
+    with open(args.iesire, "w", encoding="utf-8") as fisier:
+        for path, rezultat in rezultate.items():
+            fisier.write(json.dumps({"fisier": path, **rezultat}, ensure_ascii=False) + "\n")
+    print(f"--- [INFO] {len(rezultate)} rezultate scrise în {args.iesire}. ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Admiterea sub încărcare mixtă: latența documentelor obișnuite lângă documente mari.
+
+Pornește `benchmarks/mock_openai.py` și, pentru fiecare variantă, aplicația într-un
+proces uvicorn nou, îndreptat spre mock, cu cache-ul dezactivat:
+- `mici_singure`: doar `--clienti-mici` clienți care trimit, unul după altul,
+  contracte digitale obișnuite (`--articole`);
+- `mixt_fara_admitere`: aceiași clienți plus `--clienti-mari` clienți cu contracte
+  scanate mari (`--pagini-mari`) și un document peste limita de pagini OCR,
+  cu `ADMITERE_ACTIVATA=0`;
+- `mixt_cu_admitere`: aceeași încărcare, cu `ADMITERE_ACTIVATA=1`.
+Fiecare variantă durează `--durata` secunde. Raportează p50/p95 pentru documentele
+mici și, pe clase, statusurile răspunsurilor (200, 413, 429).
+
+Limitele sunt coborâte pentru un singur worker de test (bugetul, pragul „mare”,
+limita de pagini OCR) și pot fi suprascrise din mediu; limitele de rată ale
+clientului OpenAI sunt ridicate, ca să nu domine ele. Fără admitere, documentul
+peste limită e analizat integral (și limita exactă din extracție e dezactivată).
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_admitere.py [--durata 30] [--clienti-mici 3] [--clienti-mari 2]
+        [--articole 24] [--pagini-mari 40] [--latenta 0.3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+import aiohttp
+
+DIRECTOR_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_BACKEND)
+
+from benchmarks.bench_e2e import _port_liber, percentila, porneste_server  # noqa: E402
+from benchmarks.corpus import genereaza_contract, pdf_contract  # noqa: E402
+from benchmarks.mock_openai import SetariMock, porneste_in_fundal  # noqa: E402
+
+# ≈ 6 articole pe pagină în contractele generate
+ARTICOLE_PE_PAGINA = 6
+
+VARIANTE = {
+    "mici_singure": ("0", False),
+    "mixt_fara_admitere": ("0", True),
+    "mixt_cu_admitere": ("1", True),
+}
+
+
+def mediu_test(pagini_mari: int) -> Dict[str, str]:
+    return {
+        "ADMITERE_BUGET_TOKENI": os.getenv("ADMITERE_BUGET_TOKENI", "400000"),
+        "ADMITERE_PRAG_MARE_TOKENI": os.getenv("ADMITERE_PRAG_MARE_TOKENI", "100000"),
+        # Documentele mari trec, cel peste limită nu
+        "ADMITERE_MAX_PAGINI_OCR": os.getenv("ADMITERE_MAX_PAGINI_OCR", str(pagini_mari + 10)),
+        "ADMITERE_ASTEPTARE_SECUNDE": os.getenv("ADMITERE_ASTEPTARE_SECUNDE", "5"),
+        "OPENAI_RPM": os.getenv("OPENAI_RPM", "1000000"),
+        "OPENAI_TPM": os.getenv("OPENAI_TPM", "100000000"),
+    }
+
+
+async def client(sesiune: aiohttp.ClientSession, url: str, nume: str, pdf: bytes, termen: float,
+                 latente: List[float], statusuri: Dict[int, int], o_data: bool = False) -> None:
+    while time.monotonic() < termen:
+        form = aiohttp.FormData()
+        form.add_field("file", pdf, filename=nume, content_type="application/pdf")
+        start = time.perf_counter()
+        try:
+            async with sesiune.post(url, data=form) as raspuns:
+                await raspuns.read()
+                status = raspuns.status
+                asteptare = float(raspuns.headers.get("Retry-After", "1"))
+        except aiohttp.ClientError:
+            status, asteptare = 0, 1.0
+        if status == 200:
+            latente.append(time.perf_counter() - start)
+        statusuri[status] = statusuri.get(status, 0) + 1
+        if o_data:
+            return
+        if status == 429:
+            # Clientul respectă Retry-After, ca frontend-ul
+            await asyncio.sleep(min(asteptare, max(0.0, termen - time.monotonic())))
+
+
+async def o_varianta(args, base_url: str, admitere: str, mixt: bool, pdf_mic: bytes, pdf_mare: bytes,
+                     pdf_urias: bytes) -> dict:
+    port = _port_liber()
+    env = mediu_test(args.pagini_mari)
+    env["ADMITERE_ACTIVATA"] = admitere
+    proces = porneste_server(port, base_url, env_extra=env)
+    url = f"http://127.0.0.1:{port}/analizeaza-pdf/"
+    clase = {c: {"latente": [], "statusuri": {}} for c in ("mic", "mare", "urias")}
+    try:
+        termen = time.monotonic() + args.durata
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=900)) as sesiune:
+            sarcini = [client(sesiune, url, "mic.pdf", pdf_mic, termen, clase["mic"]["latente"],
+                              clase["mic"]["statusuri"]) for _ in range(args.clienti_mici)]
+            if mixt:
+                sarcini += [client(sesiune, url, "mare.pdf", pdf_mare, termen, clase["mare"]["latente"],
+                                   clase["mare"]["statusuri"]) for _ in range(args.clienti_mari)]
+                sarcini.append(client(sesiune, url, "urias.pdf", pdf_urias, termen, clase["urias"]["latente"],
+                                      clase["urias"]["statusuri"], o_data=True))
+            await asyncio.gather(*sarcini)
+    finally:
+        proces.terminate()
+        proces.wait(timeout=60)
+    return clase
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durata", type=float, default=30, help="secunde de încărcare pe variantă")
+    parser.add_argument("--clienti-mici", type=int, default=3)
+    parser.add_argument("--clienti-mari", type=int, default=2)
+    parser.add_argument("--articole", type=int, default=24, help="articole în contractul obișnuit")
+    parser.add_argument("--pagini-mari", type=int, default=40, help="pagini scanate în contractul mare")
+    parser.add_argument("--latenta", type=float, default=0.3, help="latența mock-ului, în secunde")
+    args = parser.parse_args()
+
+    _, base_url = porneste_in_fundal(SetariMock(latenta=args.latenta, jitter=0.0))
+    pdf_mic = pdf_contract(genereaza_contract(0, args.articole), "digital")
+    pdf_mare = pdf_contract(genereaza_contract(1, args.pagini_mari * ARTICOLE_PE_PAGINA), "scanat",
+                            articole_pe_pagina=ARTICOLE_PE_PAGINA)
+    pdf_urias = pdf_contract(genereaza_contract(2, (args.pagini_mari + 20) * ARTICOLE_PE_PAGINA), "scanat",
+                             articole_pe_pagina=ARTICOLE_PE_PAGINA)
+
+    print(f"\n{args.durata:.0f}s pe variantă, {args.clienti_mici} clienți mici ({args.articole} articole), "
+          f"{args.clienti_mari} mari ({args.pagini_mari} pagini scanate); mock {args.latenta * 1000:.0f}ms/apel")
+    print(f"{'variantă':<20} {'mic p50':>9} {'mic p95':>9}  statusuri (mic | mare | peste limită)")
+    for varianta, (admitere, mixt) in VARIANTE.items():
+        clase = asyncio.run(o_varianta(args, base_url, admitere, mixt, pdf_mic, pdf_mare, pdf_urias))
+        latente = clase["mic"]["latente"]
+        statusuri = " | ".join(
+            ", ".join(f"{k}×{v}" for k, v in sorted(clase[c]["statusuri"].items())) or "-"
+            for c in ("mic", "mare", "urias")
+        )
+        print(f"{varianta:<20} {percentila(latente, 50) * 1000:>7.0f}ms {percentila(latente, 95) * 1000:>7.0f}ms  "
+              f"{statusuri}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Alinierea citatelor: timp și rată de regăsire, pe măsură ce documentul crește.
+
+Pentru un contract sintetic de `--articole` articole, citează fiecare clauză ca un
+LLM: un fragment de la început și unul de la sfârșit, unite prin `[...]`, cu o
+proporție `--zgomot` de cuvinte stricate ca de OCR. Compară `IndexCitate` (index
+construit o dată pe document) cu căutarea directă în text pentru fiecare citat
+(regex toleranta la spații, fără eliziuni sau zgomot), cum făcea formatul compact.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_aliniere.py [--articole 150,600,2400] [--zgomot 0.05]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aliniere import POTRIVIRI, IndexCitate  # noqa: E402
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+
+
+def citate(contract, zgomot: float, rnd: random.Random) -> list:
+    rezultat = []
+    for articol in contract.articole:
+        cuvinte = " ".join(articol.text.split("\n")[1:]).split()
+        cuvinte = [c[:-1] + "l" if len(c) > 3 and rnd.random() < zgomot else c for c in cuvinte]
+        rezultat.append(" ".join(cuvinte[:12]) + " [...] " + " ".join(cuvinte[-10:]))
+    return rezultat
+
+
+def cautare_directa(text: str, citat: str):
+    tipar = r"\s+".join(re.escape(cuvant) for cuvant in citat.split())
+    return re.search(tipar, text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articole", default="150,600,2400", help="mărimile documentelor (≈ 6 articole pe pagină)")
+    parser.add_argument("--zgomot", type=float, default=0.05, help="proporția cuvintelor stricate în citate")
+    args = parser.parse_args()
+
+    print(f"{'articole':>8} {'text KB':>8} {'citate':>7} {'index':>8} {'aliniere':>9} {'directă':>9} "
+          + " ".join(f"{p:>12}" for p in POTRIVIRI) + f" {'directă găsite':>15}")
+    for articole in (int(n) for n in args.articole.split(",")):
+        contract = genereaza_contract(7, numar_articole=articole)
+        lista = citate(contract, args.zgomot, random.Random(0))
+
+        start = time.perf_counter()
+        index = IndexCitate(contract.text)
+        durata_index = time.perf_counter() - start
+        start = time.perf_counter()
+        potriviri = Counter(index.aliniaza(citat).potrivire for citat in lista)
+        durata_aliniere = time.perf_counter() - start
+        start = time.perf_counter()
+        directe = sum(1 for citat in lista if cautare_directa(contract.text, citat))
+        durata_directa = time.perf_counter() - start
+
+        print(f"{articole:>8} {len(contract.text) / 1024:>8.0f} {len(lista):>7} {durata_index * 1000:>6.0f}ms "
+              f"{durata_aliniere * 1000:>7.0f}ms {durata_directa * 1000:>7.0f}ms "
+              + " ".join(f"{potriviri[p]:>12}" for p in POTRIVIRI) + f" {directe:>15}")
+
+
+if __name__ == "__main__":
+    main()
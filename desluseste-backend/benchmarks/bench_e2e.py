@@ -0,0 +1,258 @@
+"""Benchmark end-to-end al `/analizeaza-pdf/`, cu OpenAI înlocuit de un server local.
+
+Pornește `benchmarks/mock_openai.py` (latență, rată de erori și RPM configurabile) și
+aplicația într-un proces uvicorn separat, îndreptat spre mock, cu cache-ul dezactivat.
+Corpusul de fixture-uri are contracte românești digitale, scanate și mixte
+(`benchmarks/corpus.py`). Pentru fiecare nivel de concurență trimite `--documente`
+cereri și raportează: throughput, latența p50/p95/p99, erorile, RSS-ul maxim al
+serverului (cu procesele lui copil) și apelurile OpenAI pe document.
+
+Serverul moștenește mediul, deci limitele clientului (`OPENAI_RPM`, `OPENAI_TPM`)
+se aplică la fel ca în producție; rezervarea pe `max_tokens` face ca OCR-ul să le
+atingă repede. Pentru a măsura doar pipeline-ul, rulați cu limite mari
+(ex. `OPENAI_TPM=100000000`).
+
+Cu `--salveaza` rezultatele sunt scrise ca JSON; cu `--referinta` sunt comparate cu
+o rulare anterioară și scriptul iese cu cod 1 dacă p95 sau throughput-ul unui nivel
+s-au înrăutățit peste `--prag-regresie` (ex. în CI, înainte de deploy).
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_e2e.py [--niveluri 1,4,16] [--documente 24] [--latenta 0.4]
+        [--rata-erori 0.02] [--rpm 0] [--salveaza rezultate.json] [--referinta baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+DIRECTOR_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_BACKEND)
+
+from benchmarks.corpus import TIPURI_PDF, genereaza_contract, pdf_contract  # noqa: E402
+from benchmarks.mock_openai import SetariMock, StatisticiMock, porneste_in_fundal  # noqa: E402
+
+
+def percentila(valori: List[float], p: float) -> float:
+    """Percentila `p` (0–100), cu interpolare liniară între valorile vecine."""
+    if not valori:
+        return float("nan")
+    ordonate = sorted(valori)
+    pozitie = (len(ordonate) - 1) * p / 100
+    jos = int(pozitie)
+    sus = min(jos + 1, len(ordonate) - 1)
+    return ordonate[jos] + (ordonate[sus] - ordonate[jos]) * (pozitie - jos)
+
+
+def _port_liber() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _procese(pid: int) -> List[int]:
+    """Procesul și descendenții lui (pool-ul de extracție), citiți din /proc."""
+    rezultat = [pid]
+    try:
+        for fir in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{fir}/children") as f:
+                for copil in f.read().split():
+                    rezultat.extend(_procese(int(copil)))
+    except OSError:
+        pass
+    return rezultat
+
+
+def _vm(pid: int, camp: str) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for linie in f:
+                if linie.startswith(camp + ":"):
+                    return int(linie.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def rss_maxim_mb(pid: int) -> Optional[float]:
+    """Suma RSS-urilor maxime (VmHWM) ale serverului și proceselor copil; None în afara Linux."""
+    if not os.path.exists(f"/proc/{pid}/status"):
+        return None
+    return sum(_vm(p, "VmHWM") for p in _procese(pid)) / 1024
+
+
+def reseteaza_rss_maxim(pid: int) -> None:
+    # Scrierea lui "5" în clear_refs resetează VmHWM (Linux >= 4.0); altfel maximul e cumulativ
+    for p in _procese(pid):
+        try:
+            with open(f"/proc/{p}/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            pass
+
+
+def genereaza_corpus(numar: int, articole: int, tipuri: tuple = TIPURI_PDF) -> List[tuple]:
+    """`numar` fixture-uri (nume, tip, octeți), cu tipurile alternate."""
+    corpus = []
+    for seed in range(numar):
+        tip = tipuri[seed % len(tipuri)]
+        corpus.append((f"contract-{seed}-{tip}.pdf", tip, pdf_contract(genereaza_contract(seed, articole), tip)))
+    return corpus
+
+
+def porneste_server(port: int, base_url: str, director: str = DIRECTOR_BACKEND,
+                    env_extra: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """Aplicația din `director` într-un proces uvicorn cu un singur worker."""
+    env = dict(os.environ)
+    env.update({"OPENAI_BASE_URL": base_url, "OPENAI_API_KEY": "mock", "CACHE_PATH": ""})
+    env.setdefault("OCR_MOTOR", "gpt4o")
+    env.update(env_extra or {})
+    proces = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=director, env=env, stdout=subprocess.DEVNULL,
+    )
+    termen = time.monotonic() + 60
+    while time.monotonic() < termen:
+        if proces.poll() is not None:
+            raise SystemExit(f"Serverul s-a oprit la pornire (cod {proces.returncode}).")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proces
+        except OSError:
+            time.sleep(0.2)
+    proces.kill()
+    raise SystemExit("Serverul nu a pornit în 60s.")
+
+
+async def ruleaza_nivel(url: str, corpus: List[tuple], documente: int, concurenta: int) -> dict:
+    semafor = asyncio.Semaphore(concurenta)
+    latente: List[float] = []
+    statusuri: Dict[int, int] = {}
+
+    async def _cerere(sesiune: aiohttp.ClientSession, i: int) -> None:
+        nume, _, continut = corpus[i % len(corpus)]
+        form = aiohttp.FormData()
+        form.add_field("file", continut, filename=nume, content_type="application/pdf")
+        async with semafor:
+            start = time.perf_counter()
+            try:
+                async with sesiune.post(url, data=form) as raspuns:
+                    await raspuns.read()
+                    status = raspuns.status
+            except aiohttp.ClientError:
+                status = 0
+            if status == 200:
+                latente.append(time.perf_counter() - start)
+            statusuri[status] = statusuri.get(status, 0) + 1
+
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=900)) as sesiune:
+        await asyncio.gather(*(_cerere(sesiune, i) for i in range(documente)))
+    durata = time.perf_counter() - start
+    return {
+        "concurenta": concurenta,
+        "cereri": documente,
+        "reusite": statusuri.get(200, 0),
+        "statusuri": {str(k): v for k, v in sorted(statusuri.items())},
+        "durata_secunde": round(durata, 3),
+        "documente_pe_secunda": round(statusuri.get(200, 0) / durata, 3),
+        "p50": round(percentila(latente, 50), 3),
+        "p95": round(percentila(latente, 95), 3),
+        "p99": round(percentila(latente, 99), 3),
+        # Legea lui Little: câte documente au fost, în medie, în lucru simultan pe server
+        "documente_in_lucru": round(sum(latente) / durata, 2),
+    }
+
+
+def compara(rezultate: List[dict], referinta: List[dict], prag: float) -> List[str]:
+    """Regresiile față de o rulare anterioară, pe nivelurile de concurență comune."""
+    pe_nivel = {r["concurenta"]: r for r in referinta}
+    regresii = []
+    for r in rezultate:
+        vechi = pe_nivel.get(r["concurenta"])
+        if vechi is None:
+            continue
+        if r["p95"] > vechi["p95"] * (1 + prag):
+            regresii.append(f"concurență {r['concurenta']}: p95 {vechi['p95']:.2f}s -> {r['p95']:.2f}s")
+        if r["documente_pe_secunda"] < vechi["documente_pe_secunda"] * (1 - prag):
+            regresii.append(f"concurență {r['concurenta']}: throughput "
+                            f"{vechi['documente_pe_secunda']:.2f} -> {r['documente_pe_secunda']:.2f} doc/s")
+    return regresii
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--niveluri", default="1,4,16", help="nivelurile de concurență, separate prin virgulă")
+    parser.add_argument("--documente", type=int, default=24, help="cereri trimise pe fiecare nivel")
+    parser.add_argument("--fixtures", type=int, default=6, help="câte PDF-uri distincte are corpusul")
+    parser.add_argument("--articole", type=int, default=24, help="articole pe contract")
+    parser.add_argument("--latenta", type=float, default=0.4)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--rata-erori", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--salveaza", help="scrie rezultatele în acest fișier JSON")
+    parser.add_argument("--referinta", help="compară cu rezultatele JSON ale unei rulări anterioare")
+    parser.add_argument("--prag-regresie", type=float, default=0.25)
+    args = parser.parse_args()
+
+    setari = SetariMock(args.latenta, args.jitter, args.rata_erori, args.rpm, args.seed)
+    mock, base_url = porneste_in_fundal(setari)
+    corpus = genereaza_corpus(args.fixtures, args.articole)
+    port = _port_liber()
+    server = porneste_server(port, base_url)
+    url = f"http://127.0.0.1:{port}/analizeaza-pdf/"
+
+    rezultate = []
+    try:
+        # O cerere de încălzire: importuri leneșe, primul motor OCR, conexiunile către mock
+        asyncio.run(ruleaza_nivel(url, corpus, 1, 1))
+        for concurenta in (int(n) for n in args.niveluri.split(",")):
+            mock.stats = StatisticiMock()
+            reseteaza_rss_maxim(server.pid)
+            rezultat = asyncio.run(ruleaza_nivel(url, corpus, args.documente, concurenta))
+            rezultat["rss_maxim_mb"] = rss_maxim_mb(server.pid)
+            rezultat["apeluri_openai"] = mock.stats.apeluri
+            rezultat["apeluri_pe_document"] = round(mock.stats.apeluri / max(rezultat["reusite"], 1), 2)
+            rezultat["apeluri_pe_tip"] = dict(mock.stats.pe_tip)
+            rezultat["raspunsuri_429"] = mock.stats.limitate
+            rezultat["concurenta_maxima_openai"] = mock.stats.concurenta_maxima
+            rezultate.append(rezultat)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    tipuri = ", ".join(f"{tip}: {sum(1 for _, t, _ in corpus if t == tip)}" for tip in TIPURI_PDF)
+    print(f"\nCorpus: {len(corpus)} PDF-uri ({tipuri}), {args.articole} articole; mock: {setari}")
+    print(f"{'conc.':>5} {'ok/total':>9} {'doc/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'RSS MB':>7} {'apel/doc':>9} {'429':>5} {'max OpenAI':>10}")
+    for r in rezultate:
+        rss = f"{r['rss_maxim_mb']:.0f}" if r["rss_maxim_mb"] is not None else "n/a"
+        print(f"{r['concurenta']:>5} {r['reusite']:>4}/{r['cereri']:<4} {r['documente_pe_secunda']:>7.2f} "
+              f"{r['p50']:>6.2f}s {r['p95']:>6.2f}s {r['p99']:>6.2f}s {rss:>7} {r['apeluri_pe_document']:>9.1f} "
+              f"{r['raspunsuri_429']:>5} {r['concurenta_maxima_openai']:>10}")
+        if set(r["statusuri"]) != {"200"}:
+            print(f"      statusuri: {r['statusuri']}")
+
+    if args.salveaza:
+        with open(args.salveaza, "w", encoding="utf-8") as f:
+            json.dump({"setari": vars(args), "rezultate": rezultate}, f, indent=2, ensure_ascii=False)
+    if args.referinta:
+        with open(args.referinta, encoding="utf-8") as f:
+            regresii = compara(rezultate, json.load(f)["rezultate"], args.prag_regresie)
+        for regresie in regresii:
+            print(f"REGRESIE: {regresie}")
+        if regresii:
+            sys.exit(1)
+        print(f"Fără regresii peste {args.prag_regresie:.0%} față de {args.referinta}.")
+
+
+if __name__ == "__main__":
+    main()
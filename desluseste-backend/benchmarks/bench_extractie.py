@@ -0,0 +1,93 @@
+"""Extracția și randarea unui document mare: în procesul curent vs. pool de procese.
+
+Generează un „dosar de anexe” de `--pagini` pagini (text digital, cu o pagină
+scanată din `--scanate-la` în `--scanate-la`) și rulează `extrage_pagini` cu
+`EXTRACTIE_PROCESE=1` și apoi cu pool-ul de procese. OCR-ul propriu-zis e înlocuit
+de un motor care doar primește imaginea, ca să măsurăm clasificarea și randarea,
+nu latența rețelei. Pool-ul e încălzit înainte de măsurare (pornirea proceselor
+e un cost unic al serverului, nu al cererii).
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_extractie.py [--pagini 300] [--procese 8] [--scanate-la 10]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_processor  # noqa: E402
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+from pdf_processor import MotorOCR, RezultatOCR  # noqa: E402
+
+
+class MotorFaraOCR(MotorOCR):
+    """Primește imaginea randată și întoarce imediat un text fix."""
+    nume = "fara-ocr"
+
+    def recunoaste(self, imagine) -> RezultatOCR:
+        return RezultatOCR(f"[pagina scanată {imagine.width}x{imagine.height}]", 1.0, self.nume)
+
+
+def genereaza_dosar(path: str, pagini: int, scanate_la: int) -> None:
+    doc = fitz.open()
+    font = fitz.Font("tiro")
+    text = "\n".join(a.text for a in genereaza_contract(0, numar_articole=8).articole)
+    scan = None
+    for i in range(pagini):
+        page = doc.new_page()
+        page.insert_font(fontname="F0", fontbuffer=font.buffer)
+        if scanate_la and i % scanate_la == scanate_la - 1:
+            if scan is None:
+                sursa = fitz.open()
+                pagina_sursa = sursa.new_page()
+                pagina_sursa.insert_font(fontname="F0", fontbuffer=font.buffer)
+                pagina_sursa.insert_textbox(fitz.Rect(60, 60, 535, 780), text, fontname="F0", fontsize=10)
+                scan = pagina_sursa.get_pixmap(dpi=150)
+            page.insert_image(page.rect, pixmap=scan)
+        else:
+            page.insert_textbox(fitz.Rect(60, 60, 535, 780), f"Anexa {i + 1}\n{text}", fontname="F0", fontsize=9)
+    doc.save(path)
+
+
+def ruleaza(path: str, procese: int) -> float:
+    pdf_processor.inchide_pool_extractie()
+    pdf_processor.EXTRACTIE_PROCESE = procese
+    pool = pdf_processor.pool_extractie()
+    if pool is not None:
+        list(pool.map(abs, range(procese * 4)))  # pornește toate procesele
+    start = time.perf_counter()
+    pagini = pdf_processor.extrage_pagini(path, motor=MotorFaraOCR())
+    durata = time.perf_counter() - start
+    assert [p.numar for p in pagini] == list(range(1, len(pagini) + 1))
+    pdf_processor.inchide_pool_extractie()
+    return durata
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pagini", type=int, default=300)
+    parser.add_argument("--procese", type=int, default=min(os.cpu_count() or 1, 8))
+    parser.add_argument("--scanate-la", type=int, default=10, help="o pagină scanată la fiecare N (0 = niciuna)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as director:
+        path = os.path.join(director, "dosar.pdf")
+        genereaza_dosar(path, args.pagini, args.scanate_la)
+        secvential = ruleaza(path, 1)
+        paralel = ruleaza(path, args.procese)
+
+    print(f"\n{args.pagini} pagini, {os.cpu_count()} nuclee")
+    print(f"{'mod':<22} {'secunde':>8} {'pagini/s':>9}")
+    print(f"{'proces curent':<22} {secvential:>8.2f} {args.pagini / secvential:>9.1f}")
+    print(f"{f'pool {args.procese} procese':<22} {paralel:>8.2f} {args.pagini / paralel:>9.1f}")
+    print(f"accelerare: {secvential / paralel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
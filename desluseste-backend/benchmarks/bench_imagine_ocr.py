@@ -0,0 +1,102 @@
+"""Mărimea payload-ului de OCR vs. calitate, pe setări de pregătire a imaginii.
+
+Pornește de la aceleași scanări românești generate ca `bench_ocr.py` (200 DPI) și
+aplică fiecare setare din `imagine_ocr.SetariImagine` (plus o scară care
+emulează un DPI de randare mai mic). Pentru fiecare setare raportează octeții
+trimiși (inclusiv base64), tokenii de imagine estimați și, dacă există un motor
+de referință, acuratețea pe caractere:
+- cu `--llm`, textul vine de la GPT-4o pe payload-ul exact (apeluri reale);
+- altfel, dacă e instalat, Tesseract citește imaginile decodate din payload.
+
+Baseline-ul e comportamentul vechi: PNG RGB lossless al paginii întregi.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_imagine_ocr.py [--llm] [--pagini 3]
+"""
+
+import argparse
+import io
+import math
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_ocr import acuratete_caractere, genereaza_scanari  # noqa: E402
+from imagine_ocr import SetariImagine, pregateste_imagine, scara_vision  # noqa: E402
+from pdf_processor import MotorTesseract  # noqa: E402
+
+# (nume, setări, scară față de 200 DPI)
+SETARI = [
+    ("png-rgb (vechi)", SetariImagine(gri=False, format="PNG", taie_margini=False, max_tile=1), 1.0),
+    ("png-gri", SetariImagine(gri=True, format="PNG", taie_margini=False, max_tile=1), 1.0),
+    ("png-gri-taiat", SetariImagine(gri=True, format="PNG", taie_margini=True, max_tile=1), 1.0),
+    ("jpeg-85", SetariImagine(gri=True, format="JPEG", calitate=85, taie_margini=True, max_tile=1), 1.0),
+    ("jpeg-75", SetariImagine(gri=True, format="JPEG", calitate=75, taie_margini=True, max_tile=1), 1.0),
+    ("jpeg-50", SetariImagine(gri=True, format="JPEG", calitate=50, taie_margini=True, max_tile=1), 1.0),
+    ("webp-75", SetariImagine(gri=True, format="WEBP", calitate=75, taie_margini=True, max_tile=1), 1.0),
+    ("webp-50", SetariImagine(gri=True, format="WEBP", calitate=50, taie_margini=True, max_tile=1), 1.0),
+    ("jpeg-75 150dpi", SetariImagine(gri=True, format="JPEG", calitate=75, taie_margini=True, max_tile=1), 0.75),
+    ("jpeg-75 100dpi", SetariImagine(gri=True, format="JPEG", calitate=75, taie_margini=True, max_tile=1), 0.5),
+    ("jpeg-75 tile<=3", SetariImagine(gri=True, format="JPEG", calitate=75, taie_margini=True, max_tile=3), 1.0),
+]
+
+
+def tokeni_imagine(latime: int, inaltime: int) -> int:
+    """Costul unei imagini în modul „high detail”: 170 per tile de 512 px + 85."""
+    scara = scara_vision(latime, inaltime)
+    return math.ceil(latime * scara / 512) * math.ceil(inaltime * scara / 512) * 170 + 85
+
+
+def text_recunoscut(continut: list[bytes], mime: str, llm: bool) -> str | None:
+    if llm:
+        from openai_client import call_openai_api
+        import base64
+        imagini = [{"type": "image_url", "image_url": {"url": f"data:{mime};base64,{base64.b64encode(b).decode()}"}}
+                   for b in continut]
+        payload = {"model": "gpt-4o", "max_tokens": 4000, "messages": [{"role": "user", "content": [
+            {"type": "text", "text": "Extrage tot textul din imagini (benzi consecutive ale aceleiași pagini), "
+                                     "în limba română, fără comentarii."}, *imagini]}]}
+        return call_openai_api(payload)["choices"][0]["message"]["content"]
+    if MotorTesseract.disponibil():
+        motor = MotorTesseract()
+        return "\n".join(motor.recunoaste(Image.open(io.BytesIO(b))).text for b in continut)
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="măsoară calitatea cu GPT-4o (apeluri reale)")
+    parser.add_argument("--pagini", type=int, default=3)
+    args = parser.parse_args()
+
+    scanari = genereaza_scanari(args.pagini, zgomot=12)
+    if not args.llm and not MotorTesseract.disponibil():
+        print("Fără --llm și fără Tesseract: se raportează doar mărimea payload-ului.\n")
+
+    print(f"{'setare':<18} {'KB/pagină':>10} {'KB base64':>10} {'imagini':>8} {'tokeni img':>11} {'acuratețe':>10}")
+    for nume, setari, scara in SETARI:
+        octeti = imagini = tokeni = 0
+        acurateti = []
+        for imagine, referinta in scanari:
+            if scara != 1.0:
+                imagine = imagine.resize((round(imagine.width * scara), round(imagine.height * scara)), Image.LANCZOS)
+            pregatita = pregateste_imagine(imagine, setari)
+            octeti += pregatita.octeti
+            imagini += len(pregatita.continut)
+            for bucata in pregatita.continut:
+                tokeni += tokeni_imagine(*Image.open(io.BytesIO(bucata)).size)
+            text = text_recunoscut(pregatita.continut, pregatita.mime, args.llm)
+            if text is not None:
+                acurateti.append(acuratete_caractere(text, referinta))
+
+        n = len(scanari)
+        acuratete = f"{sum(acurateti) / len(acurateti):.1%}" if acurateti else "-"
+        print(f"{nume:<18} {octeti / n / 1024:>10.0f} {octeti * 4 / 3 / n / 1024:>10.0f} {imagini / n:>8.1f} "
+              f"{tokeni / n:>11.0f} {acuratete:>10}")
+
+
+if __name__ == "__main__":
+    main()
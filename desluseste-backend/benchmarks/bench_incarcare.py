@@ -0,0 +1,82 @@
+"""Test de încărcare: câte documente poate ține în lucru simultan un singur worker.
+
+Trimite rafale tot mai mari de cereri concurente la `/analizeaza-pdf/` al unui singur
+proces uvicorn, cu OpenAI înlocuit de mock-ul din `benchmarks/mock_openai.py` la o
+latență mare (implicit 1s), astfel încât timpul să fie dominat de așteptarea după
+rețea. Pe fiecare nivel raportează documentele în lucru simultan (legea lui Little:
+suma latențelor / durata rafalei), apelurile OpenAI simultane maxime văzute de mock,
+throughput-ul, p50/p95 și RSS-ul maxim. Un worker limitat de threadpool se oprește
+la un platou; unul asincron crește odată cu concurența oferită.
+
+Limitele clientului (`OPENAI_RPM`, `OPENAI_TPM`, `OPENAI_POOL_SIZE`) sunt ridicate
+implicit, ca să nu ascundă limita worker-ului; pot fi suprascrise din mediu.
+
+Pentru comparația „înainte/după”, rulați și pe o versiune anterioară a aplicației:
+    git worktree add /tmp/inainte <commit>
+    python benchmarks/bench_incarcare.py --director /tmp/inainte/desluseste-backend
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_incarcare.py [--niveluri 16,64,256] [--latenta 1.0] [--director DIR]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_e2e import (  # noqa: E402
+    DIRECTOR_BACKEND, _port_liber, genereaza_corpus, porneste_server, reseteaza_rss_maxim, rss_maxim_mb, ruleaza_nivel,
+)
+from benchmarks.corpus import TIPURI_PDF  # noqa: E402
+from benchmarks.mock_openai import SetariMock, StatisticiMock, porneste_in_fundal  # noqa: E402
+
+LIMITE_CLIENT = {"OPENAI_RPM": "1000000", "OPENAI_TPM": "1000000000", "OPENAI_POOL_SIZE": "1024"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--niveluri", default="16,64,256", help="cereri concurente pe fiecare nivel")
+    parser.add_argument("--latenta", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--articole", type=int, default=16, help="articole pe contract")
+    parser.add_argument("--tipuri", default=",".join(TIPURI_PDF), help="tipurile de PDF din corpus")
+    parser.add_argument("--director", default=DIRECTOR_BACKEND, help="directorul aplicației testate")
+    args = parser.parse_args()
+
+    for nume, valoare in LIMITE_CLIENT.items():
+        os.environ.setdefault(nume, valoare)
+    mock, base_url = porneste_in_fundal(SetariMock(args.latenta, args.jitter))
+    corpus = genereaza_corpus(6, args.articole, tuple(args.tipuri.split(",")))
+    port = _port_liber()
+    server = porneste_server(port, base_url, args.director)
+    url = f"http://127.0.0.1:{port}/analizeaza-pdf/"
+
+    rezultate = []
+    try:
+        asyncio.run(ruleaza_nivel(url, corpus, 1, 1))
+        for concurenta in (int(n) for n in args.niveluri.split(",")):
+            mock.stats = StatisticiMock()
+            reseteaza_rss_maxim(server.pid)
+            # Fiecare nivel e o singură rafală: toate cererile pleacă deodată
+            rezultat = asyncio.run(ruleaza_nivel(url, corpus, concurenta, concurenta))
+            rezultat["rss_maxim_mb"] = rss_maxim_mb(server.pid)
+            rezultat["concurenta_maxima_openai"] = mock.stats.concurenta_maxima
+            rezultate.append(rezultat)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"\nAplicația din {args.director}; mock: latență {args.latenta}s ±{args.jitter}s")
+    print(f"{'oferite':>7} {'ok':>5} {'în lucru':>9} {'OpenAI max':>10} {'doc/s':>7} {'p50':>7} {'p95':>7} {'RSS MB':>7}")
+    for r in rezultate:
+        rss = f"{r['rss_maxim_mb']:.0f}" if r["rss_maxim_mb"] is not None else "n/a"
+        print(f"{r['concurenta']:>7} {r['reusite']:>5} {r['documente_in_lucru']:>9.1f} {r['concurenta_maxima_openai']:>10} "
+              f"{r['documente_pe_secunda']:>7.2f} {r['p50']:>6.2f}s {r['p95']:>6.2f}s {rss:>7}")
+        if set(r["statusuri"]) != {"200"}:
+            print(f"        statusuri: {r['statusuri']}")
+
+
+if __name__ == "__main__":
+    main()
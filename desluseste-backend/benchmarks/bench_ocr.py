@@ -0,0 +1,139 @@
+"""Compară motoarele OCR din `pdf_processor` pe scanări românești generate.
+
+Fixture-urile sunt pagini din corpusul sintetic (`benchmarks/corpus.py`), randate
+cu un font cu diacritice și degradate ca o scanare (rotire ușoară, blur, zgomot,
+compresie JPEG). Textul sursă e referința pentru acuratețea pe caractere
+(1 - distanța Levenshtein / lungimea referinței, după normalizarea spațiilor).
+
+Raportează, pe motor: pagini/s, acuratețea medie și minimă, câte pagini au ajuns
+la GPT-4o și costul estimat. Tesseract e sărit dacă nu e instalat; GPT-4o (și
+motorul cu escaladare) rulează doar cu `--llm` (necesită `OPENAI_API_KEY`).
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_ocr.py [--llm] [--pagini 6] [--zgomot 12]
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import time
+
+import fitz
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+from pdf_processor import MotorCuEscaladare, MotorGPT4o, MotorOCR, MotorTesseract  # noqa: E402
+
+# Tarife GPT-4o (USD / 1M tokeni) și costul în tokeni al unei pagini A4 la 200 DPI
+# în modul „high detail” (redimensionată la 768x1086 → 6 tile-uri * 170 + 85)
+PRET_INTRARE = 2.50
+PRET_IESIRE = 10.00
+TOKENI_IMAGINE_PAGINA = 6 * 170 + 85
+TOKENI_PROMPT_OCR = 60
+
+
+def genereaza_scanari(numar: int, zgomot: int, seed: int = 0) -> list[tuple[Image.Image, str]]:
+    """Pagini A4 cu text de contract, randate la 200 DPI și degradate ca o scanare."""
+    rng = random.Random(seed)
+    font = fitz.Font("tiro")
+    scanari = []
+    for i in range(numar):
+        text = "\n".join(a.text for a in genereaza_contract(seed + i, numar_articole=6).articole)
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_font(fontname="F0", fontbuffer=font.buffer)
+        page.insert_textbox(fitz.Rect(60, 60, 535, 780), text, fontname="F0", fontsize=10)
+        referinta = page.get_text()
+        pix = page.get_pixmap(dpi=200)
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples).convert("L")
+        img = img.rotate(rng.uniform(-1.0, 1.0), fillcolor=255, resample=Image.BICUBIC)
+        img = img.filter(ImageFilter.GaussianBlur(0.6))
+        if zgomot:
+            img = img.point(lambda v: max(0, min(255, v + rng.randint(-zgomot, zgomot))))
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=60)
+        scanari.append((Image.open(io.BytesIO(buffer.getvalue())).convert("RGB"), referinta))
+    return scanari
+
+
+def _normalizeaza(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def distanta_levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        curent = [i]
+        for j, cb in enumerate(b, 1):
+            curent.append(min(anterior[j] + 1, curent[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = curent
+    return anterior[-1]
+
+
+def acuratete_caractere(recunoscut: str, referinta: str) -> float:
+    recunoscut, referinta = _normalizeaza(recunoscut), _normalizeaza(referinta)
+    if not referinta:
+        return 1.0 if not recunoscut else 0.0
+    return max(0.0, 1 - distanta_levenshtein(recunoscut, referinta) / len(referinta))
+
+
+def ruleaza_motor(motor: MotorOCR, scanari: list[tuple[Image.Image, str]]) -> dict:
+    acurateti, pagini_gpt, tokeni_iesire = [], 0, 0
+    start = time.perf_counter()
+    for imagine, referinta in scanari:
+        rezultat = motor.recunoaste(imagine)
+        acurateti.append(acuratete_caractere(rezultat.text, referinta))
+        if rezultat.motor == MotorGPT4o.nume:
+            pagini_gpt += 1
+            tokeni_iesire += len(rezultat.text) // 4
+    durata = time.perf_counter() - start
+    # Motorul cu escaladare plătește GPT-4o doar pe paginile escaladate
+    cost = (pagini_gpt * (TOKENI_IMAGINE_PAGINA + TOKENI_PROMPT_OCR) * PRET_INTRARE
+            + tokeni_iesire * PRET_IESIRE) / 1_000_000
+    return {
+        "pagini_s": len(scanari) / durata if durata else 0.0,
+        "acuratete_medie": sum(acurateti) / len(acurateti),
+        "acuratete_min": min(acurateti),
+        "pagini_gpt": pagini_gpt,
+        "cost": cost,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="include GPT-4o și motorul cu escaladare (apeluri reale)")
+    parser.add_argument("--pagini", type=int, default=6)
+    parser.add_argument("--zgomot", type=int, default=12, help="amplitudinea zgomotului adăugat (0-255)")
+    args = parser.parse_args()
+
+    scanari = genereaza_scanari(args.pagini, args.zgomot)
+    motoare: list[MotorOCR] = []
+    if MotorTesseract.disponibil():
+        motoare.append(MotorTesseract())
+    else:
+        print("Tesseract nu este instalat (pytesseract + binarul tesseract cu limba `ron`); motor sărit.")
+    if args.llm:
+        motoare.append(MotorGPT4o())
+        if MotorTesseract.disponibil():
+            motoare.append(MotorCuEscaladare(MotorTesseract(), MotorGPT4o()))
+    if not motoare:
+        print("Niciun motor de rulat; instalează Tesseract sau folosește --llm.")
+        return
+
+    print(f"{len(scanari)} pagini, zgomot ±{args.zgomot}\n")
+    print(f"{'motor':<18} {'pagini/s':>9} {'acur. medie':>12} {'acur. min':>10} {'la GPT-4o':>10} {'cost USD':>9}")
+    for motor in motoare:
+        r = ruleaza_motor(motor, scanari)
+        print(f"{motor.nume:<18} {r['pagini_s']:>9.2f} {r['acuratete_medie']:>12.1%} {r['acuratete_min']:>10.1%} "
+              f"{r['pagini_gpt']:>10} {r['cost']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
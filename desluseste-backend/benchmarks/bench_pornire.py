@@ -0,0 +1,134 @@
+"""Pornirea la rece a unui worker: timpul până la trafic și latența primei cereri.
+
+Pornește `benchmarks/mock_openai.py`, apoi, de `--repetari` ori pentru fiecare
+variantă (fără și cu încălzire, `INCALZIRE_ACTIVATA`), aplicația într-un proces nou:
+uvicorn sau, cu `--server gunicorn`, gunicorn cu `gunicorn.conf.py` (app preîncărcată),
+îndreptat spre mock, cu cache-ul dezactivat. Măsoară, de la lansarea procesului:
+- `viu`: primul 200 la `/` (importuri, pornirea serverului);
+- `gata`: primul 200 la `/ready` (plus încălzirea; fără ea, imediat după `viu`);
+apoi latența primei cereri `/analizeaza-pdf/`, mediana următoarelor `--cereri` (la
+cald) și `oprire`: de la SIGTERM până la ieșirea procesului.
+
+Mediul e moștenit: pentru ca pool-ul de extracție să conteze, documentul trebuie să
+aibă cel puțin `EXTRACTIE_MIN_PAGINI` pagini (`--articole`, ≈ 6 pe pagină) și
+`EXTRACTIE_PROCESE` > 1. Mock-ul e local, deci conexiunile spre el nu au TLS: față
+de OpenAI, câștigul încălzirii pe conexiuni e subestimat.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_pornire.py [--server uvicorn|gunicorn] [--repetari 3] [--cereri 5]
+        [--articole 180] [--latenta 0.05]
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import requests
+
+DIRECTOR_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_BACKEND)
+
+from benchmarks.bench_e2e import _port_liber  # noqa: E402
+from benchmarks.corpus import genereaza_contract, pdf_contract  # noqa: E402
+from benchmarks.mock_openai import SetariMock, porneste_in_fundal  # noqa: E402
+
+VARIANTE = {"fara_incalzire": "0", "cu_incalzire": "1"}
+
+
+def lanseaza(server: str, port: int, base_url: str, incalzire: str, workeri: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({"OPENAI_BASE_URL": base_url, "OPENAI_API_KEY": "mock", "CACHE_PATH": "",
+                "INCALZIRE_ACTIVATA": incalzire})
+    env.setdefault("OCR_MOTOR", "gpt4o")
+    # Limitele de rată ale clientului ar domina cererile la cald; aici contează doar pornirea
+    env.setdefault("OPENAI_RPM", "1000000")
+    env.setdefault("OPENAI_TPM", "100000000")
+    if server == "gunicorn":
+        comanda = [sys.executable, "-m", "gunicorn", "main:app", "--bind", f"127.0.0.1:{port}",
+                   "--workers", str(workeri), "--log-level", "warning"]
+    else:
+        comanda = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--log-level", "warning"]
+    return subprocess.Popen(comanda, cwd=DIRECTOR_BACKEND, env=env, stdout=subprocess.DEVNULL)
+
+
+def asteapta_200(url: str, proces: subprocess.Popen, termen: float = 120) -> None:
+    limita = time.monotonic() + termen
+    while time.monotonic() < limita:
+        if proces.poll() is not None:
+            raise SystemExit(f"Serverul s-a oprit la pornire (cod {proces.returncode}).")
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.01)
+    raise SystemExit(f"{url} nu a răspuns 200 în {termen:.0f}s.")
+
+
+def analizeaza(url: str, pdf: bytes) -> float:
+    start = time.perf_counter()
+    raspuns = requests.post(url, files={"file": ("contract.pdf", pdf, "application/pdf")}, timeout=600)
+    durata = time.perf_counter() - start
+    if raspuns.status_code != 200:
+        raise SystemExit(f"/analizeaza-pdf/ a răspuns {raspuns.status_code}: {raspuns.text[:200]}")
+    return durata
+
+
+def o_pornire(args, base_url: str, incalzire: str, pdf: bytes) -> Dict[str, float]:
+    port = _port_liber()
+    baza = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proces = lanseaza(args.server, port, base_url, incalzire, args.workeri)
+    try:
+        asteapta_200(baza + "/", proces)
+        viu = time.perf_counter() - start
+        asteapta_200(baza + "/ready", proces)
+        gata = time.perf_counter() - start
+        prima = analizeaza(baza + "/analizeaza-pdf/", pdf)
+        la_cald = statistics.median(analizeaza(baza + "/analizeaza-pdf/", pdf) for _ in range(args.cereri))
+        start_oprire = time.perf_counter()
+        proces.send_signal(signal.SIGTERM)
+        proces.wait(timeout=120)
+        oprire = time.perf_counter() - start_oprire
+    finally:
+        if proces.poll() is None:
+            proces.kill()
+            proces.wait()
+    return {"viu": viu, "gata": gata, "prima": prima, "la_cald": la_cald, "oprire": oprire}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=("uvicorn", "gunicorn"), default="uvicorn")
+    parser.add_argument("--workeri", type=int, default=1, help="workeri gunicorn")
+    parser.add_argument("--repetari", type=int, default=3, help="porniri pentru fiecare variantă")
+    parser.add_argument("--cereri", type=int, default=5, help="cereri la cald după prima")
+    parser.add_argument("--articole", type=int, default=180, help="articole în contractul analizat")
+    parser.add_argument("--latenta", type=float, default=0.05, help="latența mock-ului, în secunde")
+    args = parser.parse_args()
+
+    _, base_url = porneste_in_fundal(SetariMock(latenta=args.latenta, jitter=0.0))
+    pdf = pdf_contract(genereaza_contract(0, args.articole), "digital")
+
+    rezultate: Dict[str, List[Dict[str, float]]] = {}
+    for varianta, incalzire in VARIANTE.items():
+        rezultate[varianta] = [o_pornire(args, base_url, incalzire, pdf) for _ in range(args.repetari)]
+
+    print(f"\n{args.server}, {len(pdf) / 1024:.0f} KB PDF, {args.articole} articole, "
+          f"mediane din {args.repetari} porniri; mock {args.latenta * 1000:.0f}ms/apel")
+    coloane = ("viu", "gata", "prima", "la_cald", "oprire")
+    print(f"{'variantă':<16} " + " ".join(f"{c:>9}" for c in coloane) + f" {'prima-cald':>11}")
+    for varianta, porniri in rezultate.items():
+        mediane = {c: statistics.median(p[c] for p in porniri) for c in coloane}
+        print(f"{varianta:<16} " + " ".join(f"{mediane[c] * 1000:>7.0f}ms" for c in coloane)
+              + f" {(mediane['prima'] - mediane['la_cald']) * 1000:>9.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
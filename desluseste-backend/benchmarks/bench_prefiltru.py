@@ -0,0 +1,93 @@
+"""Reducerea apelurilor LLM și recall-ul pre-filtrului local (`prefiltru.py`).
+
+Referința („baseline”) este analiza LLM completă: un chunk e pozitiv dacă LLM-ul
+găsește cel puțin o problemă în el. Implicit baseline-ul vine din etichetele
+corpusului sintetic (`benchmarks/corpus.py`); cu `--llm` chunk-urile sunt chiar
+trimise la OpenAI (necesită `OPENAI_API_KEY`, costă apeluri reale).
+
+Raportează, pentru chunk-uri la nivel de articol și pentru chunk-urile pe buget și
+pentru fiecare prag din `--praguri`: câte apeluri rămân, reducerea procentuală,
+recall-ul (pozitive păstrate / pozitive) și timpul de scorare. Decizia e cea din
+`prefiltru.de_trimis`, deci include și regula de limbă; `--engleza` pune o parte din
+articole în engleză. Pragul se alege după recall (un chunk pozitiv omis e o problemă
+ratată), abia apoi după reducere.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_prefiltru.py [--llm] [--documente N] [--risc 0.25] [--engleza 0.2]
+        [--praguri 0.5,1.0,1.5,2.0]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+from prefiltru import PREFILTRU_PRAG, de_trimis  # noqa: E402
+from utils import PATTERN_ARTICOLE, Chunk, chunking_pe_buget  # noqa: E402
+
+
+def chunkuri_articole(text: str) -> list[Chunk]:
+    starturi = sorted({0, *(m.start() for m in PATTERN_ARTICOLE.finditer(text))})
+    return [Chunk(text[s:e], s, e) for s, e in zip(starturi, starturi[1:] + [len(text)]) if text[s:e].strip()]
+
+
+def etichete_corpus(contract, chunkuri: list[Chunk]) -> list[bool]:
+    """Un chunk e pozitiv dacă include (începutul) unui articol cu clauză de risc."""
+    return [any(a.risc and a.text[:80] in chunk.text for a in contract.articole) for chunk in chunkuri]
+
+
+def etichete_llm(chunkuri: list[Chunk]) -> list[bool]:
+    from openai_client import analizeaza_chunkuri
+    rezultate = asyncio.run(analizeaza_chunkuri([c.text for c in chunkuri]))
+    return [bool(probleme) for probleme in rezultate]
+
+
+def evalueaza(nume: str, perechi: list[tuple[list[Chunk], list[bool]]], prag: float) -> None:
+    total = trimise = pozitive = pozitive_pastrate = 0
+    durata = 0.0
+    for chunkuri, etichete in perechi:
+        start = time.perf_counter()
+        decizii = [de_trimis(c.text, prag)[0] for c in chunkuri]
+        durata += time.perf_counter() - start
+        for trece, pozitiv in zip(decizii, etichete):
+            total += 1
+            trimise += trece
+            pozitive += pozitiv
+            pozitive_pastrate += pozitiv and trece
+    reducere = 100 * (1 - trimise / total) if total else 0.0
+    recall = 100 * pozitive_pastrate / pozitive if pozitive else 100.0
+    print(f"{nume:<10} prag {prag:<4} chunk-uri {total:>5}  trimise {trimise:>5}  reducere {reducere:5.1f}%  "
+          f"recall {recall:5.1f}%  scorare {1000 * durata / max(total, 1):.3f} ms/chunk")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm", action="store_true", help="baseline din analiza LLM reală")
+    parser.add_argument("--documente", type=int, default=20)
+    parser.add_argument("--risc", type=float, default=0.25, help="proporția de articole cu clauze de risc")
+    parser.add_argument("--engleza", type=float, default=0.0, help="proporția de articole în engleză")
+    parser.add_argument("--praguri", default=f"0.5,{PREFILTRU_PRAG},1.5,2.0",
+                        help="pragurile evaluate, separate prin virgulă")
+    args = parser.parse_args()
+
+    praguri = sorted({float(p) for p in args.praguri.split(",")})
+    contracte = [genereaza_contract(seed, proportie_risc=args.risc, proportie_engleza=args.engleza)
+                 for seed in range(args.documente)]
+    print(f"{len(contracte)} contracte ({args.engleza:.0%} articole în engleză), prag configurat {PREFILTRU_PRAG}, "
+          f"baseline {'LLM' if args.llm else 'etichete corpus'}")
+    for nume, chunker in (("articole", chunkuri_articole), ("buget", chunking_pe_buget)):
+        perechi = []
+        for contract in contracte:
+            chunkuri = chunker(contract.text)
+            etichete = etichete_llm(chunkuri) if args.llm else etichete_corpus(contract, chunkuri)
+            perechi.append((chunkuri, etichete))
+        for prag in praguri:
+            evalueaza(nume, perechi, prag)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Tokeni de prompt per document: înainte și după restructurarea prompturilor.
+
+- înainte: `chunking_inteligent_regex` + persona și instrucțiunile repetate în
+  mesajul utilizatorului la fiecare apel;
+- după: `chunking_pe_buget` + persona/instrucțiunile ca mesaj de sistem fix.
+
+Pentru fiecare variantă raportează numărul de apeluri, tokenii de prompt și câți
+dintre aceștia formează un prefix identic între apeluri (eligibil pentru prompt
+caching la furnizor). Tokenii se numără cu `tiktoken` dacă e instalat, altfel
+se estimează la ~4 caractere/token.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_prompt_tokeni.py [fisier.txt|fisier.pdf ...]
+Fără argumente folosește corpusul sintetic din `benchmarks/corpus.py`.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import contracte_exemplu  # noqa: E402
+from openai_client import PERSONA, SISTEM_ANALIZA, SISTEM_SINTEZA  # noqa: E402
+from utils import chunking_inteligent_regex, chunking_pe_buget  # noqa: E402
+
+try:
+    import tiktoken
+    _enc = tiktoken.get_encoding("cl100k_base")
+
+    def numara_tokeni(text: str) -> int:
+        return len(_enc.encode(text))
+except ImportError:
+    def numara_tokeni(text: str) -> int:
+        return len(text) // 4
+
+# Sinteza primește lista de probleme; o aproximăm cu ~600 caractere per chunk cu probleme
+CARACTERE_PROBLEME_PE_CHUNK = 600
+
+
+def _documente(argumente: list[str]) -> list[tuple[str, str]]:
+    if not argumente:
+        return [(c.nume, c.text) for c in contracte_exemplu()]
+    documente = []
+    for cale in argumente:
+        if cale.lower().endswith(".pdf"):
+            import fitz
+            with fitz.open(cale) as doc:
+                text = "".join(page.get_text() for page in doc)
+        else:
+            with open(cale, encoding="utf-8") as f:
+                text = f.read()
+        documente.append((os.path.basename(cale), text))
+    return documente
+
+
+def inainte(text: str) -> tuple[int, int, int]:
+    chunkuri = chunking_inteligent_regex(text)
+    instructiuni = SISTEM_ANALIZA + "\n**TEXT DE ANALIZAT:**\n"
+    tokeni = sum(numara_tokeni(instructiuni + chunk) for chunk in chunkuri)
+    # Vechiul prompt de sinteză începea cu un antet propriu, deci nu împărțea prefixul
+    tokeni += numara_tokeni("DESLUSESTE.RO AI PERSONA & PRINCIPLES\n" + SISTEM_SINTEZA) + len(chunkuri) * CARACTERE_PROBLEME_PE_CHUNK // 4
+    prefix = numara_tokeni(instructiuni) * len(chunkuri)
+    return len(chunkuri) + 1, tokeni, prefix
+
+
+def dupa(text: str) -> tuple[int, int, int]:
+    chunkuri = chunking_pe_buget(text)
+    tokeni = sum(numara_tokeni(SISTEM_ANALIZA) + numara_tokeni("**TEXT DE ANALIZAT:**\n" + c.text) for c in chunkuri)
+    tokeni += numara_tokeni(SISTEM_SINTEZA) + len(chunkuri) * CARACTERE_PROBLEME_PE_CHUNK // 4
+    # Analiza și sinteza împart persona; apelurile de analiză împart tot mesajul de sistem
+    prefix = numara_tokeni(SISTEM_ANALIZA) * len(chunkuri) + numara_tokeni(PERSONA)
+    return len(chunkuri) + 1, tokeni, prefix
+
+
+def main() -> None:
+    print(f"{'document':<22} {'apeluri':>15} {'tokeni prompt':>21} {'prefix comun':>21}")
+    totaluri = [0] * 6
+    for nume, text in _documente(sys.argv[1:]):
+        valori = inainte(text) + dupa(text)
+        totaluri = [t + v for t, v in zip(totaluri, valori)]
+        a_apel, a_tok, a_pref, d_apel, d_tok, d_pref = valori
+        print(f"{nume[:22]:<22} {a_apel:>6} -> {d_apel:<6} {a_tok:>9} -> {d_tok:<9} {a_pref:>9} -> {d_pref:<9}")
+    a_apel, a_tok, a_pref, d_apel, d_tok, d_pref = totaluri
+    print(f"{'TOTAL':<22} {a_apel:>6} -> {d_apel:<6} {a_tok:>9} -> {d_tok:<9} {a_pref:>9} -> {d_pref:<9}")
+    print(f"Tokeni prompt: -{100 * (1 - d_tok / a_tok):.1f}%; prefix comun: {100 * d_pref / d_tok:.1f}% din prompt după.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Mărimea și costul de serializare ale răspunsului: format complet vs. compact.
+
+Construiește un rezultat de analiză pentru un contract sintetic de `--articole`
+articole (implicit ~100 de pagini), cu o problemă pentru fiecare clauză de risc,
+citată ca de LLM (cu rândurile rupte altfel decât în text). Măsoară, pentru formatul
+complet, compact cu textul inclus și compact cu textul separat: JSON-ul în octeți
+și comprimat gzip, timpul de conversie în formatul compact, timpul de validare și
+serializare ca în FastAPI (modelul răspunsului, apoi `json.dumps`) și timpul de parsare.
+
+Utilizare (din `desluseste-backend/`):
+    python benchmarks/bench_raspuns.py [--articole 600] [--repetari 5]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from typing import Union
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+from config import RASPUNS_GZIP_NIVEL  # noqa: E402
+from raspuns_compact import raspuns_compact  # noqa: E402
+from schemas import AnalysisResponse, CompactAnalysisResponse  # noqa: E402
+
+MODEL_RASPUNS = TypeAdapter(Union[AnalysisResponse, CompactAnalysisResponse])
+
+
+def rezultat_sintetic(articole: int) -> dict:
+    contract = genereaza_contract(7, numar_articole=articole)
+    probleme = []
+    for articol in contract.articole:
+        if not articol.risc:
+            continue
+        clauza = articol.text.split("\n")[1][4:]
+        # Modelul citează pe un singur rând ce în text poate fi rupt altfel
+        citat = " ".join(clauza.split())
+        probleme.append({
+            "titlu_problema": "Clauză dezavantajoasă", "clauza_originala": citat,
+            "categorie_problema": "Obligații", "nivel_atentie": "Ridicat",
+            "explicatie_simpla": "Clauza permite celeilalte părți să schimbe condițiile fără acordul dumneavoastră.",
+            "sugestie": "Cereți eliminarea sau limitarea clauzei înainte de semnare.",
+        })
+    return {"probleme_identificate": probleme, "rezumat_executiv": "Rezumat. " * 40,
+            "text_original": contract.text, "chunkuri_esuate": 0, "chunkuri_omise": []}
+
+
+def serializeaza(raspuns: dict) -> bytes:
+    validat = MODEL_RASPUNS.validate_python(raspuns)
+    return json.dumps(MODEL_RASPUNS.dump_python(validat, mode="json", exclude_none=True),
+                      ensure_ascii=False).encode("utf-8")
+
+
+def cronometreaza(functie, repetari: int) -> float:
+    durate = []
+    for _ in range(repetari):
+        start = time.perf_counter()
+        functie()
+        durate.append(time.perf_counter() - start)
+    return min(durate) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articole", type=int, default=600, help="≈ 6 articole pe pagină")
+    parser.add_argument("--repetari", type=int, default=5)
+    args = parser.parse_args()
+
+    rezultat = rezultat_sintetic(args.articole)
+    variante = {
+        "complet": lambda: rezultat,
+        "compact": lambda: raspuns_compact(rezultat),
+        # Fără cache, `raspuns_compact` păstrează textul; aici simulăm textul servit separat
+        "compact, text separat": lambda: {**raspuns_compact(rezultat), "text_original": None},
+    }
+
+    print(f"\n{len(rezultat['text_original']) / 1024:.0f} KB text, {len(rezultat['probleme_identificate'])} probleme")
+    print(f"{'format':<22} {'JSON KB':>8} {'gzip KB':>8} {'conversie':>10} {'serializare':>12} {'parsare':>8}")
+    for nume, construieste in variante.items():
+        raspuns = construieste()
+        corp = serializeaza(raspuns)
+        comprimat = gzip.compress(corp, compresslevel=RASPUNS_GZIP_NIVEL)
+        conversie = cronometreaza(construieste, args.repetari)
+        serializare = cronometreaza(lambda: serializeaza(raspuns), args.repetari)
+        parsare = cronometreaza(lambda: json.loads(corp), args.repetari)
+        print(f"{nume:<22} {len(corp) / 1024:>8.0f} {len(comprimat) / 1024:>8.0f} {conversie:>8.1f}ms "
+              f"{serializare:>10.1f}ms {parsare:>6.1f}ms")
+    negasite = sum(1 for p in raspuns_compact(rezultat)["probleme_identificate"] if p.get("start") is None)
+    print(f"citate negăsite în text: {negasite}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Corpus sintetic de contracte românești pentru benchmark-uri.
+
+Contractele sunt compuse determinist (după `seed`) dintr-o bancă de clauze, fiecare
+etichetată cu `risc=True` dacă e genul de clauză pe care analiza LLM o semnalează
+(penalități, modificări unilaterale, date, reînnoire, jurisdicție...). Etichetele
+servesc drept referință aproximativă acolo unde nu rulăm LLM-ul.
+
+Cu `proportie_engleza` o parte din articole sunt în engleză (contracte bilingve sau
+cu anexe în engleză), tot etichetate, pentru recall-ul pre-filtrului pe alte limbi.
+
+`pdf_contract` transformă un contract în PDF: digital (strat de text), scanat
+(pagini-imagine, fără text) sau mixt (paginile impare scanate).
+"""
+
+import random
+from dataclasses import dataclass
+
+import fitz
+
+CLAUZE_STANDARD = [
+    "Prezentul contract se încheie între {firma}, cu sediul în {oras}, înregistrată la Registrul Comerțului sub nr. J40/{nr}/2019, CUI RO{cui}, denumită în continuare Prestatorul, și Clientul, persoana fizică identificată prin datele din formularul de comandă.",
+    "În sensul prezentului contract, termenii de mai jos au următoarele înțelesuri: „Servicii” înseamnă serviciile descrise în Anexa 1; „Cont” înseamnă contul personal al Clientului; „Zi lucrătoare” înseamnă orice zi cu excepția sâmbetei, duminicii și a sărbătorilor legale.",
+    "Obiectul contractului îl constituie furnizarea de către Prestator a serviciilor de {serviciu}, în condițiile stabilite prin prezentul contract și anexele sale, care fac parte integrantă din acesta.",
+    "Orice comunicare între părți se face în scris, prin e-mail la adresele indicate în formularul de comandă sau prin scrisoare recomandată cu confirmare de primire.",
+    "Niciuna dintre părți nu răspunde de neexecutarea obligațiilor sale dacă aceasta este cauzată de un caz de forță majoră, notificat celeilalte părți în termen de 5 zile de la apariție.",
+    "Prezentul contract a fost încheiat în două exemplare originale, câte unul pentru fiecare parte, astăzi, {data}. Prestator: {firma}, prin reprezentant legal. Client: semnătura.",
+    "Titlurile articolelor sunt folosite numai pentru comoditatea lecturii și nu afectează interpretarea prezentului contract.",
+    "Clientul are obligația de a furniza date de contact corecte și de a le actualiza ori de câte ori acestea se modifică.",
+]
+
+CLAUZE_RISC = [
+    "Prestatorul își rezervă dreptul de a modifica unilateral tarifele și condițiile prezentului contract, cu notificarea Clientului cu 5 zile înainte de intrarea în vigoare a modificărilor.",
+    "În cazul întârzierii la plată, Clientul datorează penalități de întârziere de 1% pe zi din suma restantă, fără ca totalul penalităților să fie limitat la valoarea debitului principal.",
+    "Clientul acceptă ca datele sale personale să fie transmise partenerilor comerciali ai Prestatorului, inclusiv în afara Spațiului Economic European, în scopuri de marketing și profilare.",
+    "Contractul se reînnoiește automat pentru perioade succesive de 12 luni, dacă niciuna dintre părți nu notifică denunțarea cu cel puțin 90 de zile înainte de expirare.",
+    "Orice litigiu decurgând din prezentul contract va fi soluționat definitiv prin arbitraj, la Curtea de Arbitraj aleasă de Prestator, Clientul renunțând la dreptul de a se adresa instanțelor de drept comun.",
+    "Răspunderea totală a Prestatorului pentru orice prejudiciu este limitată la valoarea abonamentului lunar, indiferent de natura sau întinderea prejudiciului suferit de Client.",
+    "Pe lângă tariful lunar, Clientul datorează o taxă de administrare a contului, o taxă de procesare a plăților și orice alte costuri comunicate ulterior pe site-ul Prestatorului.",
+    "În cazul rezilierii înainte de termen, Clientul va plăti o despăgubire egală cu valoarea tuturor abonamentelor lunare rămase până la expirarea perioadei minime contractuale.",
+    "Prestatorul poate suspenda sau înceta furnizarea serviciilor oricând, fără preaviz și fără a preciza motivele, fără ca aceasta să dea naștere vreunei obligații de despăgubire.",
+]
+
+CLAUZE_STANDARD_EN = [
+    "This Agreement is entered into between {firma}, having its registered office in {oras}, and the Customer identified in the order form.",
+    "Headings are included for convenience only and shall not affect the interpretation of this Agreement.",
+    "All notices under this Agreement shall be given in writing and sent by e-mail to the addresses stated in the order form.",
+]
+
+CLAUZE_RISC_EN = [
+    "The Provider may amend the fees and these terms at any time, at its sole discretion, by posting the new version on its website.",
+    "The Customer's personal data may be shared with third-party advertising partners for marketing and profiling purposes.",
+    "The Provider's aggregate liability shall in no event exceed the fees paid by the Customer in the month preceding the claim.",
+    "This Agreement renews automatically for successive twelve-month terms unless cancelled at least ninety days before expiry.",
+]
+
+_FIRME = ["SC Telecom Plus SRL", "Banca Exemplu SA", "SC Energie Casnică SRL", "SC Fitness Total SRL"]
+_ORASE = ["București", "Cluj-Napoca", "Iași", "Timișoara"]
+_SERVICII = ["telefonie mobilă", "furnizare energie electrică", "acces la sala de fitness", "internet fix"]
+
+
+@dataclass
+class Articol:
+    text: str
+    risc: bool
+
+
+@dataclass
+class Contract:
+    nume: str
+    text: str
+    articole: list[Articol]
+
+
+def genereaza_contract(seed: int, numar_articole: int = 30, proportie_risc: float = 0.25,
+                       proportie_engleza: float = 0.0) -> Contract:
+    rnd = random.Random(seed)
+    valori = {
+        "firma": rnd.choice(_FIRME), "oras": rnd.choice(_ORASE), "serviciu": rnd.choice(_SERVICII),
+        "nr": rnd.randint(1000, 99999), "cui": rnd.randint(10**7, 10**8), "data": f"{rnd.randint(1, 28)}.0{rnd.randint(1, 9)}.2025",
+    }
+    articole = []
+    for i in range(1, numar_articole + 1):
+        risc = rnd.random() < proportie_risc
+        # Fără apel la `rnd` când nu cerem engleză: contractele existente rămân identice
+        engleza = proportie_engleza > 0 and rnd.random() < proportie_engleza
+        standard = CLAUZE_STANDARD_EN if engleza else CLAUZE_STANDARD
+        clauza = rnd.choice((CLAUZE_RISC_EN if engleza else CLAUZE_RISC) if risc else standard).format(**valori)
+        # Unele articole au mai multe alineate, ca în contractele reale
+        alineate = [clauza] + [rnd.choice(standard).format(**valori) for _ in range(rnd.randint(0, 2))]
+        titlu = f"Art. {i}" if engleza else f"Articolul {i}"
+        text = f"{titlu}\n" + "\n".join(f"({k}) {a}" for k, a in enumerate(alineate, 1))
+        articole.append(Articol(text, risc))
+    antet = f"CONTRACT DE PRESTĂRI SERVICII nr. {valori['nr']}/{valori['data']}\n"
+    return Contract(f"contract-{seed}", antet + "\n".join(a.text for a in articole) + "\n", articole)
+
+
+def contracte_exemplu(numar: int = 10, numar_articole: int = 30) -> list[Contract]:
+    return [genereaza_contract(seed, numar_articole) for seed in range(numar)]
+
+
+TIPURI_PDF = ("digital", "scanat", "mixt")
+
+
+def pdf_contract(contract: Contract, tip: str = "digital", articole_pe_pagina: int = 4, dpi_scanare: int = 150) -> bytes:
+    """PDF-ul unui contract, cu `articole_pe_pagina` articole pe pagina A4."""
+    font = fitz.Font("tiro")
+    doc = fitz.open()
+    for k in range(0, len(contract.articole), articole_pe_pagina):
+        text = "\n".join(a.text for a in contract.articole[k:k + articole_pe_pagina])
+        scanata = tip == "scanat" or (tip == "mixt" and (k // articole_pe_pagina) % 2 == 1)
+        sursa = fitz.open() if scanata else doc
+        page = sursa.new_page()
+        page.insert_font(fontname="F0", fontbuffer=font.buffer)
+        page.insert_textbox(fitz.Rect(60, 60, 535, 780), text, fontname="F0", fontsize=9)
+        if scanata:
+            doc.new_page().insert_image(fitz.Rect(page.rect), pixmap=page.get_pixmap(dpi=dpi_scanare, colorspace=fitz.csGRAY))
+    return doc.tobytes(deflate=True)
+
@@ -0,0 +1,181 @@
+"""Server local compatibil cu `/v1/chat/completions`, pentru benchmark-uri și teste de încărcare.
+
+Răspunde ca OpenAI la cele trei tipuri de apeluri ale aplicației: analiza unui chunk
+(`response_format` JSON → o problemă care citează finalul chunk-ului), OCR (mesaj cu
+imagini → textul unei pagini de contract) și sinteza (text simplu). Latența, rata de
+erori 5xx și limita de cereri pe minut (429 cu `Retry-After`) sunt configurabile;
+erorile sunt deterministe pentru același `seed`. `primele_limitate` trimite 429 primelor
+N apeluri de chat, cu `Retry-After: retry_after` (o rafală de limitare, apoi răspunsuri normale).
+
+`GET /stats` întoarce numărul de apeluri (total, reușite, erori, limitate) și
+concurența maximă observată; `POST /reset` le golește.
+
+Utilizare de sine stătătoare (din `desluseste-backend/`):
+    python benchmarks/mock_openai.py [--port 8099] [--latenta 0.4] [--rata-erori 0.02] [--rpm 0]
+apoi serverul aplicației cu `OPENAI_BASE_URL=http://127.0.0.1:8099/v1`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import genereaza_contract  # noqa: E402
+
+TEXT_PAGINA_OCR = "\n".join(a.text for a in genereaza_contract(0, numar_articole=4).articole)
+
+
+@dataclass
+class SetariMock:
+    latenta: float = 0.4
+    jitter: float = 0.2
+    rata_erori: float = 0.0
+    rpm: int = 0
+    seed: int = 0
+    primele_limitate: int = 0
+    retry_after: float = 1.0
+
+
+@dataclass
+class StatisticiMock:
+    apeluri: int = 0
+    reusite: int = 0
+    erori: int = 0
+    limitate: int = 0
+    in_curs: int = 0
+    concurenta_maxima: int = 0
+    pe_tip: dict = field(default_factory=dict)
+
+
+class MockOpenAI:
+    def __init__(self, setari: SetariMock):
+        self.setari = setari
+        self.stats = StatisticiMock()
+        self._rnd = random.Random(setari.seed)
+        self._ferestre: list = []  # momentele cererilor acceptate în ultimul minut
+
+    def _tip(self, body: dict) -> str:
+        continut = body["messages"][-1]["content"]
+        if isinstance(continut, list):
+            return "ocr"
+        return "analiza" if body.get("response_format") else "sinteza"
+
+    def _limitat(self) -> float:
+        """0 dacă cererea încape în RPM; altfel câte secunde să aștepte clientul."""
+        if self.stats.apeluri <= self.setari.primele_limitate:
+            return self.setari.retry_after
+        if not self.setari.rpm:
+            return 0.0
+        acum = time.monotonic()
+        self._ferestre = [t for t in self._ferestre if acum - t < 60]
+        if len(self._ferestre) >= self.setari.rpm:
+            return max(0.1, 60 - (acum - self._ferestre[0]))
+        self._ferestre.append(acum)
+        return 0.0
+
+    async def chat(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        tip = self._tip(body)
+        self.stats.apeluri += 1
+        self.stats.pe_tip[tip] = self.stats.pe_tip.get(tip, 0) + 1
+        asteptare = self._limitat()
+        if asteptare:
+            self.stats.limitate += 1
+            return web.json_response({"error": {"message": "Rate limit reached"}}, status=429,
+                                     headers={"Retry-After": f"{asteptare:.1f}"})
+
+        self.stats.in_curs += 1
+        self.stats.concurenta_maxima = max(self.stats.concurenta_maxima, self.stats.in_curs)
+        try:
+            await asyncio.sleep(max(0.0, self.setari.latenta + self._rnd.uniform(-1, 1) * self.setari.jitter))
+            if self._rnd.random() < self.setari.rata_erori:
+                self.stats.erori += 1
+                return web.json_response({"error": {"message": "The server had an error"}}, status=500)
+            continut = self._raspuns(tip, body)
+        finally:
+            self.stats.in_curs -= 1
+
+        self.stats.reusite += 1
+        caractere_prompt = sum(len(m["content"]) if isinstance(m["content"], str) else 1000 * 4
+                               for m in body["messages"])
+        return web.json_response({
+            "id": f"chatcmpl-mock-{self.stats.apeluri}",
+            "object": "chat.completion",
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": continut}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": caractere_prompt // 4, "completion_tokens": len(continut) // 4},
+        })
+
+    @staticmethod
+    def _raspuns(tip: str, body: dict) -> str:
+        if tip == "ocr":
+            return TEXT_PAGINA_OCR
+        if tip == "sinteza":
+            return "Contractul conține câteva clauze care merită citite cu atenție înainte de semnare."
+        chunk = body["messages"][-1]["content"]
+        return json.dumps({"probleme": [{
+            "titlu_problema": "Clauză de verificat",
+            "clauza_originala": chunk.strip()[-80:],
+            "categorie_problema": "Obligații",
+            "explicatie_simpla": "Clauza poate avea consecințe neașteptate pentru client.",
+            "nivel_atentie": "Mediu",
+            "sugestie": "Cereți clarificări înainte de semnare.",
+        }]}, ensure_ascii=False)
+
+    async def stats_endpoint(self, request: web.Request) -> web.Response:
+        return web.json_response(vars(self.stats))
+
+    async def reset_endpoint(self, request: web.Request) -> web.Response:
+        self.stats = StatisticiMock()
+        return web.json_response({"ok": True})
+
+    def aplicatie(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/chat/completions", self.chat)
+        app.router.add_get("/stats", self.stats_endpoint)
+        app.router.add_post("/reset", self.reset_endpoint)
+        return app
+
+
+def porneste_in_fundal(setari: SetariMock, port: int = 0) -> tuple:
+    """Pornește mock-ul pe un fir separat, cu propriul event loop.
+
+    Întoarce `(mock, base_url)`; `base_url` se dă aplicației ca `OPENAI_BASE_URL`.
+    """
+    mock = MockOpenAI(setari)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(mock.aplicatie(), access_log=None)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    loop.run_until_complete(site.start())
+    port_real = site._server.sockets[0].getsockname()[1]
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return mock, f"http://127.0.0.1:{port_real}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latenta", type=float, default=0.4, help="latența medie a unui apel, în secunde")
+    parser.add_argument("--jitter", type=float, default=0.2, help="variația uniformă a latenței (±), în secunde")
+    parser.add_argument("--rata-erori", type=float, default=0.0, help="proporția apelurilor care primesc 500")
+    parser.add_argument("--rpm", type=int, default=0, help="cereri pe minut peste care răspunde 429 (0 = nelimitat)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setari = SetariMock(args.latenta, args.jitter, args.rata_erori, args.rpm, args.seed)
+    print(f"Mock OpenAI pe http://127.0.0.1:{args.port}/v1 ({setari})")
+    web.run_app(MockOpenAI(setari).aplicatie(), host="127.0.0.1", port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
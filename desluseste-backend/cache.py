@@ -0,0 +1,187 @@
+"""Cache persistent, adresat prin conținut, pentru rezultatele analizei.
+
+Două niveluri în același fișier SQLite:
+- `doc:<versiune prompturi>:<sha256 PDF>` -> `AnalysisResponse` complet, pentru
+  upload-uri identice;
+- `chunk:<versiune prompt>:<sha256 chunk>` -> lista de probleme a unui chunk,
+  ca o versiune nouă a unui contract cunoscut să re-analizeze doar ce s-a schimbat;
+- `rev:<versiune prompt>:<document_id>` -> clauzele ultimei revizii a unui document
+  și problemele lor (vezi `revizii.py`);
+- `text:<sha256 text>` -> textul extras al unui document, servit separat de
+  răspunsul compact (vezi `raspuns_compact.py`).
+
+Evicția se face după vârstă (TTL) și după dimensiunea totală (LRU), cel mult o dată
+la `CACHE_EVICTIE_INTERVAL_SECUNDE` per proces: între două evicții cache-ul poate
+depăși puțin `CACHE_MAX_MB`.
+
+Toate metodele blochează (citiri, scrieri, așteptarea lock-ului de scriere al altui
+proces, până la 30s): pe calea asincronă se apelează prin `executie.ruleaza_blocant`.
+
+Importul modulului nu atinge discul: cache-ul procesului e deschis de primul
+`get_cache()`, în mod normal la pornirea fiecărui worker (`ciclu_viata.la_pornire`),
+deci după fork și nu în master-ul gunicorn.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from config import CACHE_EVICTIE_INTERVAL_SECUNDE, CACHE_MAX_MB, CACHE_PATH, CACHE_TTL_ZILE
+
+
+def hash_continut(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class CacheRezultate:
+    """Cache cheie-valoare JSON peste SQLite, sigur pentru mai multe fire și procese."""
+
+    def __init__(self, path: str, max_bytes: int, ttl_secunde: float,
+                 interval_evictie: float = CACHE_EVICTIE_INTERVAL_SECUNDE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_secunde = ttl_secunde
+        self.interval_evictie = interval_evictie
+        director = os.path.dirname(path)
+        if director:
+            os.makedirs(director, exist_ok=True)
+        self._deschide()
+        # Plasă de siguranță: dacă totuși a fost deschis înaintea unui fork, procesele
+        # copil nu pot folosi conexiunea SQLite a părintelui și își deschid una proprie
+        os.register_at_fork(after_in_child=self._deschide)
+
+    def _deschide(self) -> None:
+        self._lock = threading.Lock()
+        self._ultima_evictie = 0.0
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS intrari ("
+                " cheie TEXT PRIMARY KEY, valoare TEXT NOT NULL, dimensiune INTEGER NOT NULL,"
+                " creat REAL NOT NULL, accesat REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accesat ON intrari(accesat)")
+
+    # --- API generic ---
+
+    def get_many(self, chei: Iterable[str]) -> dict[str, object]:
+        chei = list(chei)
+        if not chei:
+            return {}
+        acum = time.time()
+        limita = acum - self.ttl_secunde
+        marcaje = ",".join("?" * len(chei))
+        with self._lock, self._conn:
+            randuri = self._conn.execute(
+                f"SELECT cheie, valoare FROM intrari WHERE creat >= ? AND cheie IN ({marcaje})",
+                [limita, *chei],
+            ).fetchall()
+            if randuri:
+                self._conn.execute(
+                    f"UPDATE intrari SET accesat = ? WHERE cheie IN ({','.join('?' * len(randuri))})",
+                    [acum, *(cheie for cheie, _ in randuri)],
+                )
+        return {cheie: json.loads(valoare) for cheie, valoare in randuri}
+
+    def contine(self, cheie: str) -> bool:
+        """Există o intrare neexpirată, fără s-o citească sau s-o marcheze ca accesată."""
+        with self._lock:
+            rand = self._conn.execute(
+                "SELECT 1 FROM intrari WHERE cheie = ? AND creat >= ?", (cheie, time.time() - self.ttl_secunde)
+            ).fetchone()
+        return rand is not None
+
+    def get(self, cheie: str) -> Optional[object]:
+        return self.get_many([cheie]).get(cheie)
+
+    def set_many(self, intrari: dict[str, object]) -> None:
+        if not intrari:
+            return
+        acum = time.time()
+        randuri = []
+        for cheie, valoare in intrari.items():
+            serializat = json.dumps(valoare, ensure_ascii=False)
+            randuri.append((cheie, serializat, len(serializat.encode("utf-8")), acum, acum))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO intrari VALUES (?, ?, ?, ?, ?)", randuri)
+            if acum - self._ultima_evictie >= self.interval_evictie:
+                self._ultima_evictie = acum
+                self._evict()
+
+    def set(self, cheie: str, valoare: object) -> None:
+        self.set_many({cheie: valoare})
+
+    def set_daca_neschimbat(self, cheie: str, valoare: object, anterior: Optional[object]) -> bool:
+        """Scrie `valoare` doar dacă intrarea e tot `anterior` (None = lipsă sau expirată).
+
+        Citirea și scrierea sunt o singură tranzacție cu lock-ul de scriere luat de la
+        început, deci și între procese; întoarce False dacă altcineva a scris între timp.
+        """
+        acum = time.time()
+        serializat = json.dumps(valoare, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rand = self._conn.execute(
+                "SELECT valoare FROM intrari WHERE cheie = ? AND creat >= ?", (cheie, acum - self.ttl_secunde)
+            ).fetchone()
+            if (json.loads(rand[0]) if rand else None) != anterior:
+                return False
+            self._conn.execute("INSERT OR REPLACE INTO intrari VALUES (?, ?, ?, ?, ?)",
+                               (cheie, serializat, len(serializat.encode("utf-8")), acum, acum))
+        return True
+
+    def _evict(self) -> None:
+        """Șterge intrările expirate, apoi pe cele mai vechi accesate până sub `max_bytes`."""
+        self._conn.execute("DELETE FROM intrari WHERE creat < ?", (time.time() - self.ttl_secunde,))
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(dimensiune), 0) FROM intrari").fetchone()
+        if total <= self.max_bytes:
+            return
+        de_sters = []
+        for cheie, dimensiune in self._conn.execute("SELECT cheie, dimensiune FROM intrari ORDER BY accesat"):
+            if total <= self.max_bytes:
+                break
+            de_sters.append((cheie,))
+            total -= dimensiune
+        self._conn.executemany("DELETE FROM intrari WHERE cheie = ?", de_sters)
+
+    # --- Chei pe niveluri ---
+
+    @staticmethod
+    def cheie_document(hash_pdf: str, versiune_prompt: str) -> str:
+        return f"doc:{versiune_prompt}:{hash_pdf}"
+
+    @staticmethod
+    def cheie_chunk(chunk: str, versiune_prompt: str) -> str:
+        return f"chunk:{versiune_prompt}:{hash_continut(chunk)}"
+
+    @staticmethod
+    def cheie_revizie(document_id: str, versiune_prompt: str) -> str:
+        return f"rev:{versiune_prompt}:{document_id}"
+
+    @staticmethod
+    def cheie_text(text_id: str) -> str:
+        return f"text:{text_id}"
+
+
+_cache: Optional[CacheRezultate] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[CacheRezultate]:
+    """Cache-ul procesului, creat la primul apel; None dacă `CACHE_PATH` e gol.
+
+    Primul apel creează și migrează fișierul (blochează); după pornire e doar o citire.
+    """
+    global _cache
+    if _cache is None and CACHE_PATH:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheRezultate(CACHE_PATH, CACHE_MAX_MB * 1024 * 1024, CACHE_TTL_ZILE * 86400)
+    return _cache
@@ -0,0 +1,166 @@
+"""Ciclul de viață al unui worker: încălzire la pornire, disponibilitate și oprire ordonată.
+
+La pornire (hook-ul `lifespan` al aplicației) worker-ul pregătește în fundal ce
+altfel ar plăti prima cerere: conexiunile spre OpenAI (TCP + TLS), procesele
+pool-ului de extracție, PyMuPDF (text și randare), chunking-ul, pre-filtrul și
+indexul citatelor pe un document mic, verificarea motorului OCR. `/` răspunde
+imediat (procesul trăiește), `/ready` abia după încălzire, ca load balancer-ul să
+nu trimită cereri unui worker rece. Un pas eșuat (ex. OpenAI inaccesibil) nu ține
+worker-ul în afara traficului: rămâne doar neîncălzit.
+
+La SIGTERM (sau SIGINT) `/ready` trece imediat pe 503 și coada nu mai primește
+joburi. Serverul nu mai acceptă conexiuni și așteaptă cererile deschise, apoi
+`la_oprire` lasă joburile începute să se termine, în limita `OPRIRE_TIMEOUT_SECUNDE`
+numărate de la semnal, și abia apoi închide clientul, procesele și executorul.
+"""
+
+import asyncio
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import fitz
+
+from aliniere import IndexCitate
+from cache import get_cache
+from config import INCALZIRE_ACTIVATA, INCALZIRE_CONEXIUNI, INCALZIRE_TIMEOUT_SECUNDE, OPRIRE_TIMEOUT_SECUNDE
+from executie import inchide_executor, ruleaza_blocant
+from http_client import client_openai
+from jobs import coada_joburi
+from metrici import PORNIRE_SECUNDE
+from pdf_processor import (
+    PAGINA_GOALA_DPI, clasifica_pagina, incalzeste_pool_extractie, inchide_pool_extractie, motor_ocr_implicit,
+)
+from prefiltru import scoreaza
+from utils import chunking_pe_buget
+
+# Documentul de încălzire: două articole scurte, cu semnale pentru pre-filtru
+_TEXT_INCALZIRE = (
+    "Art. 1. Obiectul contractului\n"
+    "Prestatorul se obligă să furnizeze serviciile descrise în anexa 1, în termen de 30 de zile.\n"
+    "Art. 2. Penalități și reziliere\n"
+    "În caz de întârziere, beneficiarul datorează penalități de 1% pe zi din valoarea facturii, "
+    "iar prestatorul poate rezilia unilateral contractul, fără notificare prealabilă.\n"
+)
+
+
+@dataclass
+class StareWorker:
+    gata: bool = False
+    # Momentul (monotonic) semnalului de oprire; None cât timp worker-ul primește trafic
+    oprire: Optional[float] = None
+    # Durata fiecărui pas de încălzire, în secunde
+    durate: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def status(self) -> str:
+        if self.oprire is not None:
+            return "in_oprire"
+        return "gata" if self.gata else "se_incalzeste"
+
+    def marcheaza_oprirea(self) -> None:
+        if self.oprire is None:
+            self.oprire = time.monotonic()
+        coada_joburi.inchide()
+
+
+stare = StareWorker()
+_incalzire: Optional[asyncio.Task] = None
+
+
+def _incalzeste_local() -> None:
+    """Trece un document mic prin pașii locali ai pipeline-ului."""
+    with fitz.open() as doc:
+        pagina = doc.new_page()
+        pagina.insert_text((72, 72), _TEXT_INCALZIRE, fontsize=9)
+        clasifica_pagina(pagina, pagina.get_text())
+        pagina.get_pixmap(dpi=PAGINA_GOALA_DPI, colorspace=fitz.csGRAY)
+    for chunk in chunking_pe_buget(_TEXT_INCALZIRE):
+        scoreaza(chunk.text)
+    IndexCitate(_TEXT_INCALZIRE).aliniaza("beneficiarul datorează penalități [...] din valoarea facturii")
+    # Verificarea Tesseract pornește un proces; mai bine acum decât la primul OCR
+    motor_ocr_implicit()
+
+
+async def _deschide_conexiuni() -> None:
+    deschise = await client_openai.incalzeste(INCALZIRE_CONEXIUNI, INCALZIRE_TIMEOUT_SECUNDE)
+    if deschise < INCALZIRE_CONEXIUNI:
+        print(f"--- [AVERTISMENT] Încălzire: {deschise} din {INCALZIRE_CONEXIUNI} conexiuni OpenAI deschise. ---")
+
+
+async def _pas(nume: str, apel) -> None:
+    start = time.perf_counter()
+    try:
+        await apel()
+    except Exception as e:
+        print(f"--- [AVERTISMENT] Încălzire: pasul „{nume}” a eșuat: {e} ---")
+    stare.durate[nume] = time.perf_counter() - start
+    PORNIRE_SECUNDE.observa(stare.durate[nume], pas=nume)
+
+
+async def incalzeste() -> None:
+    """Pașii de încălzire, în paralel: rețeaua se suprapune cu munca locală."""
+    start = time.perf_counter()
+    await asyncio.gather(
+        _pas("local", lambda: ruleaza_blocant(_incalzeste_local)),
+        _pas("pool_extractie", lambda: ruleaza_blocant(incalzeste_pool_extractie)),
+        _pas("conexiuni", _deschide_conexiuni),
+    )
+    stare.durate["total"] = time.perf_counter() - start
+    PORNIRE_SECUNDE.observa(stare.durate["total"], pas="total")
+    stare.gata = True
+    print(f"--- [INFO] Worker încălzit în {stare.durate['total']:.2f}s ("
+          + ", ".join(f"{nume} {durata:.2f}s" for nume, durata in stare.durate.items() if nume != "total") + "). ---")
+
+
+def _intercepteaza_semnalele() -> None:
+    """Înlănțuie handler-ele serverului pentru SIGTERM și SIGINT: întâi marcăm oprirea
+    (pentru `/ready` și coadă), apoi serverul își face oprirea obișnuită.
+
+    Uvicorn (și `UvicornWorker` sub gunicorn) își instalează handler-ele cu
+    `signal.signal` înaintea `lifespan`, pe firul principal, și le restaurează la ieșire.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for semnal in (signal.SIGTERM, signal.SIGINT):
+        anterior = signal.getsignal(semnal)
+        if not callable(anterior):
+            continue
+
+        def _handler(numar, cadru, anterior=anterior):
+            stare.marcheaza_oprirea()
+            anterior(numar, cadru)
+
+        signal.signal(semnal, _handler)
+
+
+async def la_pornire() -> None:
+    global _incalzire
+    _intercepteaza_semnalele()
+    # Cache-ul SQLite se deschide aici, în worker, nu la import (master-ul gunicorn)
+    await ruleaza_blocant(get_cache)
+    coada_joburi.porneste()
+    if INCALZIRE_ACTIVATA:
+        _incalzire = asyncio.create_task(incalzeste())
+    else:
+        stare.gata = True
+
+
+async def la_oprire() -> None:
+    stare.marcheaza_oprirea()
+    if _incalzire is not None and not _incalzire.done():
+        _incalzire.cancel()
+        await asyncio.gather(_incalzire, return_exceptions=True)
+    ramas = max(0.0, OPRIRE_TIMEOUT_SECUNDE - (time.monotonic() - stare.oprire))
+    start = time.perf_counter()
+    anulate = await coada_joburi.opreste(ramas)
+    if anulate:
+        print(f"--- [AVERTISMENT] Oprire: {anulate} joburi anulate după {OPRIRE_TIMEOUT_SECUNDE:.0f}s. ---")
+    else:
+        print(f"--- [INFO] Oprire: joburile în curs s-au terminat în {time.perf_counter() - start:.2f}s. ---")
+    # Închide pool-urile de conexiuni ale clientului OpenAI, procesele de extracție și executorul blocant
+    await client_openai.inchide()
+    inchide_pool_extractie()
+    inchide_executor()
@@ -5,9 +5,142 @@ load_dotenv()
 
 # Centralized config and environment variables
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
 # CORS origins
 origins = [
     "https://desluseste.ro",
     "http://localhost:3000",
 ]
+
+# Numărul maxim de apeluri simultane către OpenAI pentru un document
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# Clientul HTTP partajat: conexiuni keep-alive, reîncercări, limite de rată pe
+# partea de client (cereri și tokeni pe minut) și circuit breaker
+OPENAI_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "32"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+# Cea mai lungă pauză cerută prin `Retry-After` pe care o respectăm; peste ea apelul eșuează
+OPENAI_RETRY_AFTER_MAX_SECUNDE = float(os.getenv("OPENAI_RETRY_AFTER_MAX_SECUNDE", "60"))
+CIRCUIT_PRAG_ESECURI = int(os.getenv("CIRCUIT_PRAG_ESECURI", "5"))
+CIRCUIT_PAUZA_SECUNDE = float(os.getenv("CIRCUIT_PAUZA_SECUNDE", "30"))
+
+# Executorul pentru munca blocantă de pe calea unei cereri (extracție, randare,
+# pregătirea imaginilor, fișiere temporare); rețeaua e asincronă și nu ocupă fire
+EXECUTOR_FIRE = int(os.getenv("EXECUTOR_FIRE", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# OCR: câte pagini sunt trimise simultan la GPT-4o
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "4"))
+
+# Extracția și randarea documentelor mari pe un pool de procese (<= 1 = în procesul
+# curent); documentele sub EXTRACTIE_MIN_PAGINI pagini nu merită costul transferului
+EXTRACTIE_PROCESE = int(os.getenv("EXTRACTIE_PROCESE", str(min(os.cpu_count() or 1, 8))))
+EXTRACTIE_MIN_PAGINI = int(os.getenv("EXTRACTIE_MIN_PAGINI", "24"))
+EXTRACTIE_PAGINI_PE_INTERVAL = int(os.getenv("EXTRACTIE_PAGINI_PE_INTERVAL", "8"))
+
+# Extracție hibridă pe pagină: sub pragul de caractere (sau peste acoperirea cu
+# imagini) pagina merge la OCR; paginile goale nu sunt trimise deloc
+OCR_MIN_CARACTERE_PAGINA = int(os.getenv("OCR_MIN_CARACTERE_PAGINA", "50"))
+OCR_ACOPERIRE_IMAGINI = float(os.getenv("OCR_ACOPERIRE_IMAGINI", "0.5"))
+
+# Motorul OCR: "auto" = Tesseract local, cu escaladare la GPT-4o sub pragul de
+# încredere; "tesseract" sau "gpt4o" forțează un singur motor
+OCR_MOTOR = os.getenv("OCR_MOTOR", "auto")
+OCR_PRAG_INCREDERE = float(os.getenv("OCR_PRAG_INCREDERE", "0.80"))
+OCR_LIMBA_TESSERACT = os.getenv("OCR_LIMBA_TESSERACT", "ron")
+
+# Imaginile trimise la OCR: DPI adaptat după mărimea textului, tonuri de gri,
+# margini tăiate, codare JPEG/WebP/PNG și benzi pentru paginile dense
+OCR_DPI_MIN = int(os.getenv("OCR_DPI_MIN", "100"))
+OCR_DPI_MAX = int(os.getenv("OCR_DPI_MAX", "300"))
+OCR_IMAGINE_GRI = os.getenv("OCR_IMAGINE_GRI", "1") == "1"
+OCR_IMAGINE_FORMAT = os.getenv("OCR_IMAGINE_FORMAT", "JPEG").upper()
+OCR_IMAGINE_CALITATE = int(os.getenv("OCR_IMAGINE_CALITATE", "75"))
+OCR_TAIE_MARGINI = os.getenv("OCR_TAIE_MARGINI", "1") == "1"
+OCR_MAX_TILE = int(os.getenv("OCR_MAX_TILE", "3"))
+
+# Analiza în lot: câte documente (și MB, după dezarhivare) pot fi trimise într-o cerere și câte sunt
+# extrase simultan (fiecare extracție poate folosi și OCR_MAX_WORKERS fire)
+LOT_MAX_DOCUMENTE = int(os.getenv("LOT_MAX_DOCUMENTE", "200"))
+LOT_MAX_MB = int(os.getenv("LOT_MAX_MB", "500"))
+LOT_EXTRACTII_CONCURENTE = int(os.getenv("LOT_EXTRACTII_CONCURENTE", "4"))
+
+# Mod offline prin API-ul de batch: unde se scriu fișierele JSONL, fereastra de
+# finalizare cerută furnizorului și cât de des / cât timp urmărim batch-ul
+BATCH_DIRECTOR = os.getenv("BATCH_DIRECTOR", ".cache/batch")
+BATCH_FEREASTRA = os.getenv("BATCH_FEREASTRA", "24h")
+BATCH_INTERVAL_POLLING = float(os.getenv("BATCH_INTERVAL_POLLING", "60"))
+BATCH_TIMEOUT_ORE = float(os.getenv("BATCH_TIMEOUT_ORE", "26"))
+
+# Cache persistent (SQLite) pentru rezultate; CACHE_PATH gol dezactivează cache-ul
+CACHE_PATH = os.getenv("CACHE_PATH", ".cache/desluseste.sqlite3")
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "512"))
+CACHE_TTL_ZILE = float(os.getenv("CACHE_TTL_ZILE", "30"))
+# Evicția (TTL și dimensiune) parcurge tot tabelul: rulează cel mult o dată pe interval, nu la fiecare scriere
+CACHE_EVICTIE_INTERVAL_SECUNDE = float(os.getenv("CACHE_EVICTIE_INTERVAL_SECUNDE", "60"))
+
+# Coada de joburi: câte analize rulează simultan, câte pot aștepta și cât timp
+# păstrăm rezultatele unui job terminat
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_COADA = int(os.getenv("JOB_MAX_COADA", "100"))
+JOB_TTL_MINUTE = float(os.getenv("JOB_TTL_MINUTE", "60"))
+
+# Chunking: câți tokeni de text (fără prompt) încap într-un chunk și cât se
+# suprapun bucățile unui articol prea lung
+CHUNK_TOKEN_BUDGET = int(os.getenv("CHUNK_TOKEN_BUDGET", "1500"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "60"))
+
+# Pre-filtru local (opt-in): chunk-urile în română cu scor de risc sub prag nu mai
+# ajung la LLM. Pragul implicit lasă să treacă orice termen din lexicon; un prag nou se
+# validează după recall-ul din benchmarks/bench_prefiltru.py, nu după economie
+PREFILTRU_ACTIVAT = os.getenv("PREFILTRU_ACTIVAT", "0") == "1"
+PREFILTRU_PRAG = float(os.getenv("PREFILTRU_PRAG", "1.0"))
+
+# Streaming-ul SSE: după câte secunde fără niciun eveniment (extracție, OCR, primul
+# chunk) trimitem un comentariu `: ping`, ca proxy-urile și clientul să nu închidă fluxul
+SSE_PING_SECUNDE = float(os.getenv("SSE_PING_SECUNDE", "15"))
+
+# Compresia răspunsurilor (gzip, negociată prin Accept-Encoding): pragul de la care
+# se comprimă și nivelul de compresie
+RASPUNS_GZIP_MIN_OCTETI = int(os.getenv("RASPUNS_GZIP_MIN_OCTETI", "1024"))
+RASPUNS_GZIP_NIVEL = int(os.getenv("RASPUNS_GZIP_NIVEL", "6"))
+
+# Upload-uri: dimensiunea maximă acceptată și mărimea blocurilor în care
+# fișierul e copiat pe disc
+UPLOAD_MAX_MB = int(os.getenv("UPLOAD_MAX_MB", "50"))
+UPLOAD_BLOCK_KB = int(os.getenv("UPLOAD_BLOCK_KB", "1024"))
+
+# Metrici: endpoint-ul /metrics (format Prometheus) și antetul Server-Timing cu
+# durata etapelor fiecărei cereri
+METRICI_ACTIVATE = os.getenv("METRICI_ACTIVATE", "1") == "1"
+METRICI_SERVER_TIMING = os.getenv("METRICI_SERVER_TIMING", "1") == "1"
+
+# Ciclul de viață al unui worker: încălzirea la pornire (conexiuni spre OpenAI
+# deschise în avans, procesele de extracție, PyMuPDF) și cât așteaptă oprirea,
+# după SIGTERM, analizele în curs (cereri și joburi) înainte să le anuleze
+INCALZIRE_ACTIVATA = os.getenv("INCALZIRE_ACTIVATA", "1") == "1"
+INCALZIRE_CONEXIUNI = int(os.getenv("INCALZIRE_CONEXIUNI", "4"))
+INCALZIRE_TIMEOUT_SECUNDE = float(os.getenv("INCALZIRE_TIMEOUT_SECUNDE", "10"))
+OPRIRE_TIMEOUT_SECUNDE = float(os.getenv("OPRIRE_TIMEOUT_SECUNDE", "300"))
+
+# Admiterea analizelor: limite pe document (pagini, pagini OCR, tokeni estimați,
+# peste care cererea primește 413) și bugetul de tokeni estimați în lucru simultan
+# pe worker; ce nu încape așteaptă cel mult ADMITERE_ASTEPTARE_SECUNDE (cel mult
+# ADMITERE_MAX_ASTEPTARE cereri), apoi primește 429. Documentele mari (peste
+# ADMITERE_PRAG_MARE_TOKENI) folosesc cel mult ADMITERE_PROPORTIE_MARI din buget
+ADMITERE_ACTIVATA = os.getenv("ADMITERE_ACTIVATA", "1") == "1"
+ADMITERE_MAX_PAGINI = int(os.getenv("ADMITERE_MAX_PAGINI", "500"))
+ADMITERE_MAX_PAGINI_OCR = int(os.getenv("ADMITERE_MAX_PAGINI_OCR", "150"))
+# Limita care se aplică documentelor obișnuite e cea de pagini: ADMITERE_MAX_TOKENI=0
+# (implicit) o derivă din ea, ca costul a ADMITERE_MAX_PAGINI pagini foarte dense
+# (ADMITERE_MAX_PAGINI_OCR dintre ele scanate), deci prinde doar densități anormale
+ADMITERE_MAX_TOKENI = int(os.getenv("ADMITERE_MAX_TOKENI", "0"))
+ADMITERE_BUGET_TOKENI = int(os.getenv("ADMITERE_BUGET_TOKENI", "2000000"))
+ADMITERE_PRAG_MARE_TOKENI = int(os.getenv("ADMITERE_PRAG_MARE_TOKENI", "200000"))
+ADMITERE_PROPORTIE_MARI = float(os.getenv("ADMITERE_PROPORTIE_MARI", "0.5"))
+ADMITERE_ASTEPTARE_SECUNDE = float(os.getenv("ADMITERE_ASTEPTARE_SECUNDE", "20"))
+ADMITERE_MAX_ASTEPTARE = int(os.getenv("ADMITERE_MAX_ASTEPTARE", "32"))
+# Câte pagini sunt clasificate pentru estimare; peste atât, un eșantion uniform
+ADMITERE_ESANTION_PAGINI = int(os.getenv("ADMITERE_ESANTION_PAGINI", "32"))
@@ -0,0 +1,69 @@
+"""Modelul documentului extras: textul pe pagini, cu pozițiile fiecărei pagini în textul complet.
+
+Textul complet se construiește o singură dată, dintr-un `join` al paginilor;
+`inceput_pagini[i]` e poziția la care începe pagina `i + 1` în el. Pagina unei
+poziții (a unui chunk, a unui citat) se află prin căutare binară, fără să copieze
+text, iar textul unei pagini e o simplă felie. Indexul citatelor (vezi `aliniere`)
+se construiește la prima folosire și e refolosit pentru toate problemele documentului.
+"""
+
+from bisect import bisect_right
+from functools import cached_property
+from itertools import accumulate
+from typing import TYPE_CHECKING, List, Sequence
+
+from aliniere import IndexCitate, aliniaza_probleme
+
+if TYPE_CHECKING:
+    from pdf_processor import PaginaExtrasa
+
+
+class DocumentExtras:
+    """Paginile extrase dintr-un PDF și textul lor unit, în ordine."""
+
+    def __init__(self, pagini: Sequence["PaginaExtrasa"]):
+        self.pagini = list(pagini)
+        # Fiecare pagină nevidă se termină cu un rând nou, ca textul să nu lipească paginile
+        segmente = [p.text if p.text.endswith("\n") or not p.text else p.text + "\n" for p in self.pagini]
+        self._limite = list(accumulate((len(segment) for segment in segmente), initial=0))
+        self.text = "".join(segmente)
+
+    @property
+    def numar_pagini(self) -> int:
+        return len(self.pagini)
+
+    @property
+    def inceput_pagini(self) -> List[int]:
+        """Poziția în `text` la care începe fiecare pagină (paginile goale au lungime 0)."""
+        return self._limite[:-1]
+
+    def pagina_la(self, pozitie: int) -> int:
+        """Numărul (de la 1) paginii care conține caracterul de la `pozitie`."""
+        # Ultima pagină care începe la sau înaintea poziției; paginile goale de la
+        # aceeași poziție sunt sărite, pentru că nu conțin niciun caracter
+        return max(bisect_right(self._limite, pozitie, hi=len(self.pagini)), 1)
+
+    def pagini_intre(self, start: int, end: int) -> List[int]:
+        """Numerele paginilor pe care se întinde `text[start:end]`."""
+        if not self.pagini:
+            return []
+        prima, ultima = self.pagina_la(start), self.pagina_la(max(start, end - 1))
+        return [numar for numar in range(prima, ultima + 1) if self._limite[numar] > self._limite[numar - 1]]
+
+    def text_pagina(self, numar: int) -> str:
+        return self.text[self._limite[numar - 1]:self._limite[numar]]
+
+    @cached_property
+    def index_citate(self) -> IndexCitate:
+        return IndexCitate(self.text)
+
+    def aliniaza_probleme(self, probleme: List[dict], de_la: int = 0) -> List[dict]:
+        """Copii ale problemelor cu pozițiile citatelor (vezi `aliniere`) și `pagina` lor.
+
+        `de_la` e începutul chunk-ului din care vin problemele, când se știe.
+        """
+        aliniate = aliniaza_probleme(self.index_citate, probleme, de_la)
+        for problema in aliniate:
+            problema["pagina"] = self.pagina_la(problema["start"]) if problema["start"] is not None else None
+        return aliniate
+
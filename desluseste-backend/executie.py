@@ -0,0 +1,46 @@
+"""Executorul partajat pentru munca blocantă de pe calea asincronă a unei cereri.
+
+Rețeaua (OpenAI, OCR prin GPT-4o) e asincronă, pe event loop; pe fire rămân doar
+pașii care chiar blochează: PyMuPDF (clasificare, randare), pregătirea imaginilor,
+Tesseract și copierea fișierelor temporare. Executorul are o mărime explicită
+(`EXECUTOR_FIRE`), separată de threadpool-ul implicit al serverului, așa că o
+cerere care așteaptă după OpenAI nu mai ține ocupat niciun fir.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from config import EXECUTOR_FIRE
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def executor_blocant() -> ThreadPoolExecutor:
+    """Executorul procesului, creat la prima folosire."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXECUTOR_FIRE, thread_name_prefix="blocant")
+        return _executor
+
+
+async def ruleaza_blocant(functie: Callable[..., T], *args, **kwargs) -> T:
+    """Rulează `functie` pe executorul blocant, în contextul curent (defalcarea metricilor)."""
+    context = contextvars.copy_context()
+    apel = functools.partial(context.run, functie, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor_blocant(), apel)
+
+
+def inchide_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,36 @@
+"""Configurația gunicorn pentru producție (citită automat din directorul curent):
+
+    gunicorn main:app
+
+- `preload_app`: aplicația (FastAPI, PyMuPDF, aiohttp, pydantic, regex-urile și
+  lexiconul pre-filtrului) e importată o singură dată, în master; workerii pornesc
+  prin fork, deja cu importurile făcute, și împart paginile de memorie. Nimic din
+  ce se creează la import nu ține conexiuni sau fișiere deschise. Resursele per worker
+  (cache-ul SQLite, conexiunile OpenAI, executorul, pool-ul de extracție) sunt create
+  în `lifespan`, după fork, de `ciclu_viata`.
+- Oprirea: la SIGTERM fiecare worker așteaptă cererile deschise și joburile în
+  curs cel mult `OPRIRE_TIMEOUT_SECUNDE`; `graceful_timeout` îi lasă o marjă înainte
+  ca master-ul să-l omoare.
+"""
+
+import os
+
+from uvicorn.workers import UvicornWorker
+
+from config import OPRIRE_TIMEOUT_SECUNDE
+
+
+class WorkerDesluseste(UvicornWorker):
+    # Uvicorn așteaptă cererile deschise (analize sincrone, fluxuri SSE) cel mult atât,
+    # ca din același termen să rămână timp și pentru joburi
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "timeout_graceful_shutdown": int(OPRIRE_TIMEOUT_SECUNDE)}
+
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = WorkerDesluseste
+preload_app = True
+graceful_timeout = int(OPRIRE_TIMEOUT_SECUNDE) + 15
+# Heartbeat-ul workerului vine de pe event loop, care nu e blocat de analize
+timeout = 60
+keepalive = 5
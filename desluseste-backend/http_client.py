@@ -0,0 +1,307 @@
+"""Client HTTP partajat pentru API-ul OpenAI.
+
+Toate apelurile (chunk-uri, sinteză, OCR) trec prin aceeași instanță, care oferă:
+- pool de conexiuni keep-alive (`requests.Session` pentru codul sincron, o sesiune
+  `aiohttp` per event loop pentru cel asincron), deci fără handshake TLS la fiecare apel;
+- reîncercări cu backoff exponențial și jitter, care respectă `Retry-After` (până la
+  `OPENAI_RETRY_AFTER_MAX_SECUNDE`; o pauză mai lungă nu ține cererea blocată, apelul eșuează);
+- limitare pe partea de client a cererilor și tokenilor pe minut;
+- circuit breaker: după prea multe eșecuri la rând (erori de conexiune și 5xx), apelurile
+  eșuează imediat o perioadă, în loc să încarce și mai mult un API deja căzut. Un 429 sau
+  un răspuns cu `Retry-After` înseamnă limitare, nu cădere: îl tratează pauza cerută și
+  limitatorul, nu circuitul.
+
+URL-ul de bază vine din `OPENAI_BASE_URL`, ca să poată fi îndreptat spre un server local.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    CIRCUIT_PAUZA_SECUNDE, CIRCUIT_PRAG_ESECURI, OPENAI_API_KEY, OPENAI_BASE_URL,
+    OPENAI_MAX_RETRIES, OPENAI_POOL_SIZE, OPENAI_RETRY_AFTER_MAX_SECUNDE, OPENAI_RPM, OPENAI_TPM,
+)
+from metrici import LLM_CIRCUIT_DESCHIS, LLM_LATENTA, LLM_REINCERCARI, inregistreaza_tokeni
+
+# Coduri după care merită reîncercat (rate limit sau eroare temporară la OpenAI)
+STATUSURI_REINCERCABILE = {429, 500, 502, 503, 504}
+
+
+class EroareOpenAI(Exception):
+    """Apelul a eșuat definitiv (după reîncercări), cu statusul HTTP dacă există."""
+
+    def __init__(self, mesaj: str, status: Optional[int] = None):
+        super().__init__(mesaj)
+        self.status = status
+
+
+class CircuitDeschis(EroareOpenAI):
+    """Circuitul e deschis: apelul nu a mai fost trimis."""
+
+
+def calculeaza_asteptare(retry_after: Optional[str], incercare: int) -> float:
+    """Respectă `Retry-After` dacă există; altfel backoff exponențial cu jitter."""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(30.0, 2 ** incercare) * random.uniform(0.5, 1.5)
+
+
+# Cost aproximativ în tokeni al unei imagini trimise la vision (detail=auto, pagină A4)
+TOKENI_IMAGINE = 1000
+
+
+def estimeaza_tokeni(payload: dict) -> int:
+    """Estimare grosieră (≈4 caractere/token) a tokenilor de intrare + ieșire ai unui apel."""
+    caractere, imagini = 0, 0
+    for mesaj in payload.get("messages", []):
+        continut = mesaj.get("content", "")
+        if isinstance(continut, str):
+            caractere += len(continut)
+            continue
+        for parte in continut:
+            if parte.get("type") == "image_url":
+                imagini += 1
+            else:
+                caractere += len(parte.get("text", ""))
+    return caractere // 4 + imagini * TOKENI_IMAGINE + int(payload.get("max_tokens", 1000))
+
+
+class LimitatorRata:
+    """Token bucket dublu (cereri/minut și tokeni/minut), comun firelor și task-urilor.
+
+    Fiecare apel își rezervă capacitatea sub lock și primește cât trebuie să aștepte;
+    soldul poate deveni negativ, așa că așteptările se eșalonează corect în rafale.
+    """
+
+    def __init__(self, cereri_pe_minut: int, tokeni_pe_minut: int):
+        self._rate = (cereri_pe_minut / 60.0, tokeni_pe_minut / 60.0)
+        self._capacitate = (float(cereri_pe_minut), float(tokeni_pe_minut))
+        self._sold = list(self._capacitate)
+        self._ultima = time.monotonic()
+        self._lock = threading.Lock()
+
+    def rezerva(self, tokeni: int) -> float:
+        with self._lock:
+            acum = time.monotonic()
+            scurs, self._ultima = acum - self._ultima, acum
+            asteptare = 0.0
+            for i, cost in enumerate((1, min(tokeni, self._capacitate[1]))):
+                self._sold[i] = min(self._capacitate[i], self._sold[i] + scurs * self._rate[i]) - cost
+                if self._sold[i] < 0:
+                    asteptare = max(asteptare, -self._sold[i] / self._rate[i])
+            return asteptare
+
+    def asteapta(self, tokeni: int) -> None:
+        asteptare = self.rezerva(tokeni)
+        if asteptare > 0:
+            time.sleep(asteptare)
+
+    async def asteapta_async(self, tokeni: int) -> None:
+        asteptare = self.rezerva(tokeni)
+        if asteptare > 0:
+            await asyncio.sleep(asteptare)
+
+
+class CircuitBreaker:
+    """Se deschide după `prag` eșecuri consecutive; după `pauza` secunde lasă un apel
+    de probă (half-open), iar un succes îl închide la loc."""
+
+    def __init__(self, prag: int, pauza: float):
+        self.prag = prag
+        self.pauza = pauza
+        self._esecuri = 0
+        self._deschis_la: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def verifica(self) -> None:
+        with self._lock:
+            if self._deschis_la is None:
+                return
+            if time.monotonic() - self._deschis_la < self.pauza:
+                LLM_CIRCUIT_DESCHIS.inc()
+                raise CircuitDeschis("OpenAI indisponibil temporar (circuit deschis).")
+            # Half-open: lăsăm să treacă un apel și reînarmăm pauza pentru celelalte
+            self._deschis_la = time.monotonic()
+
+    def succes(self) -> None:
+        with self._lock:
+            self._esecuri = 0
+            self._deschis_la = None
+
+    def esec(self) -> None:
+        with self._lock:
+            self._esecuri += 1
+            if self._esecuri >= self.prag:
+                if self._deschis_la is None:
+                    print(f"--- [EROARE] {self._esecuri} eșecuri OpenAI la rând, circuit deschis {self.pauza:.0f}s. ---")
+                self._deschis_la = time.monotonic()
+
+
+class ClientOpenAI:
+    def __init__(self, base_url: str, api_key: Optional[str], max_reincercari: int, pool_size: int,
+                 limitator: LimitatorRata, circuit: CircuitBreaker):
+        self.base_url = base_url.rstrip("/")
+        self.url_chat = self.base_url + "/chat/completions"
+        self.api_key = api_key
+        self.max_reincercari = max_reincercari
+        self.pool_size = pool_size
+        self.limitator = limitator
+        self.circuit = circuit
+        self._sesiune = requests.Session()
+        self._sesiune.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._sesiune.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._sesiune_async: Optional[aiohttp.ClientSession] = None
+        self._loop_async: Optional[asyncio.AbstractEventLoop] = None
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _dupa_esec(self, status: Optional[int], incercare: int, retry_after: Optional[str], motiv: str) -> float:
+        """Înregistrează eșecul; întoarce cât să așteptăm sau aruncă dacă nu mai reîncercăm."""
+        if status is not None and status not in STATUSURI_REINCERCABILE:
+            # Eroare de request (400, 401...): nu e vina serverului, nu reîncercăm
+            raise EroareOpenAI(f"OpenAI a răspuns {status}: {motiv}", status)
+        if status != 429 and not retry_after:
+            self.circuit.esec()
+        if incercare >= self.max_reincercari:
+            raise EroareOpenAI(f"OpenAI a eșuat după {incercare + 1} încercări: {motiv}", status)
+        asteptare = calculeaza_asteptare(retry_after, incercare)
+        if asteptare > OPENAI_RETRY_AFTER_MAX_SECUNDE:
+            raise EroareOpenAI(f"OpenAI cere o pauză de {asteptare:.0f}s (Retry-After), peste limita de "
+                               f"{OPENAI_RETRY_AFTER_MAX_SECUNDE:.0f}s: {motiv}", status)
+        LLM_REINCERCARI.inc(motiv=str(status) if status is not None else "conexiune")
+        print(f"--- [INFO] Apel OpenAI eșuat ({motiv}), reîncerc în {asteptare:.1f}s ---")
+        return asteptare
+
+    @staticmethod
+    def _masoara_incercare(payload: dict, start: float, rezultat: Optional[dict]) -> None:
+        """Latența încercării și, la succes, tokenii raportați în `usage`."""
+        model = payload.get("model", "")
+        LLM_LATENTA.observa(time.perf_counter() - start, model=model, rezultat="ok" if rezultat is not None else "eroare")
+        if rezultat is not None:
+            usage = rezultat.get("usage") or {}
+            inregistreaza_tokeni(model, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+    def post(self, payload: dict, timeout: int = 90) -> dict:
+        tokeni = estimeaza_tokeni(payload)
+        for incercare in range(self.max_reincercari + 1):
+            self.circuit.verifica()
+            self.limitator.asteapta(tokeni)
+            start = time.perf_counter()
+            try:
+                response = self._sesiune.post(self.url_chat, headers=self._headers(), json=payload, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._masoara_incercare(payload, start, None)
+                time.sleep(self._dupa_esec(None, incercare, None, str(e)))
+                continue
+            if response.ok:
+                rezultat = response.json()
+                self.circuit.succes()
+                self._masoara_incercare(payload, start, rezultat)
+                return rezultat
+            self._masoara_incercare(payload, start, None)
+            time.sleep(self._dupa_esec(
+                response.status_code, incercare, response.headers.get("Retry-After"), response.text[:200]
+            ))
+
+    def cerere(self, metoda: str, cale: str, timeout: int = 120, **kwargs) -> requests.Response:
+        """Cerere către alte endpoint-uri ale API-ului (fișiere, batch-uri), pe aceeași sesiune.
+
+        Nu trece prin limitatorul de rată al chat-ului (batch-urile au cote separate);
+        erorile temporare sunt reîncercate la fel ca la `post`.
+        """
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        for incercare in range(self.max_reincercari + 1):
+            try:
+                response = self._sesiune.request(metoda, self.base_url + cale, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                time.sleep(self._dupa_esec(None, incercare, None, str(e)))
+                continue
+            if response.ok:
+                return response
+            time.sleep(self._dupa_esec(
+                response.status_code, incercare, response.headers.get("Retry-After"), response.text[:200]
+            ))
+
+    def _sesiune_pentru_loop(self) -> aiohttp.ClientSession:
+        # O sesiune aiohttp aparține loop-ului pe care a fost creată
+        loop = asyncio.get_running_loop()
+        if self._sesiune_async is None or self._sesiune_async.closed or self._loop_async is not loop:
+            self._sesiune_async = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            )
+            self._loop_async = loop
+        return self._sesiune_async
+
+    async def post_async(self, payload: dict, timeout: int = 90) -> dict:
+        tokeni = estimeaza_tokeni(payload)
+        sesiune = self._sesiune_pentru_loop()
+        for incercare in range(self.max_reincercari + 1):
+            self.circuit.verifica()
+            await self.limitator.asteapta_async(tokeni)
+            start = time.perf_counter()
+            try:
+                async with sesiune.post(
+                    self.url_chat, headers=self._headers(), json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    if response.ok:
+                        rezultat = await response.json()
+                        self.circuit.succes()
+                        self._masoara_incercare(payload, start, rezultat)
+                        return rezultat
+                    self._masoara_incercare(payload, start, None)
+                    asteptare = self._dupa_esec(
+                        response.status, incercare, response.headers.get("Retry-After"), (await response.text())[:200]
+                    )
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                # Și un corp trunchiat (ClientPayloadError) e o eroare temporară de transport
+                self._masoara_incercare(payload, start, None)
+                asteptare = self._dupa_esec(None, incercare, None, str(e) or type(e).__name__)
+            await asyncio.sleep(asteptare)
+
+    async def incalzeste(self, conexiuni: int, timeout: float = 10) -> int:
+        """Creează sesiunea loop-ului curent și deschide în avans `conexiuni` conexiuni.
+
+        Cererile `GET /models` pornesc în paralel, deci fiecare își deschide conexiunea
+        (TCP + TLS), care rămâne apoi în pool pentru primele apeluri de chat, cât timp nu
+        stă nefolosită peste `keepalive_timeout`. Nu trec prin limitator sau circuit:
+        nu sunt apeluri de chat. Întoarce câte au primit răspuns, oricare ar fi statusul.
+        """
+        sesiune = self._sesiune_pentru_loop()
+
+        async def _deschide() -> bool:
+            try:
+                async with sesiune.get(self.base_url + "/models", headers=self._headers(),
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    await response.read()
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return False
+
+        return sum(await asyncio.gather(*(_deschide() for _ in range(min(conexiuni, self.pool_size)))))
+
+    async def inchide(self) -> None:
+        if self._sesiune_async is not None and not self._sesiune_async.closed:
+            await self._sesiune_async.close()
+        self._sesiune.close()
+
+
+client_openai = ClientOpenAI(
+    OPENAI_BASE_URL, OPENAI_API_KEY, OPENAI_MAX_RETRIES, OPENAI_POOL_SIZE,
+    LimitatorRata(OPENAI_RPM, OPENAI_TPM),
+    CircuitBreaker(CIRCUIT_PRAG_ESECURI, CIRCUIT_PAUZA_SECUNDE),
+)
@@ -0,0 +1,161 @@
+"""Pregătirea imaginilor de pagină înainte de OCR-ul prin GPT-4o vision.
+
+Un PNG RGB lossless al unei pagini A4 la 200 DPI înseamnă câțiva MB de base64 per
+cerere, deși modelul redimensionează oricum imaginea (latura mică la 768 px în
+modul „high detail”). Aici reducem payload-ul fără să pierdem lizibilitate:
+- rezoluția de randare e aleasă după înălțimea rândurilor de text detectate;
+- imaginea trece în tonuri de gri și marginile albe sunt tăiate;
+- codarea e JPEG/WebP cu calitate configurabilă în loc de PNG;
+- paginile dense sunt împărțite în benzi orizontale (tile-uri), ca rândurile să
+  rămână lizibile după redimensionarea făcută de model.
+"""
+
+import io
+import math
+import statistics
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from config import (
+    OCR_DPI_MAX, OCR_DPI_MIN, OCR_IMAGINE_CALITATE, OCR_IMAGINE_FORMAT, OCR_IMAGINE_GRI, OCR_MAX_TILE,
+    OCR_TAIE_MARGINI,
+)
+
+# Înălțimea (în pixeli) a unui rând de text la care OCR-ul e fiabil, după randare
+# și, pentru GPT-4o, după redimensionarea făcută de model
+INALTIME_RAND_TINTA_PX = 28
+INALTIME_RAND_MINIMA_VISION_PX = 14
+DPI_IMPLICIT = 200
+
+# Limitele de redimensionare ale modelului în modul „high detail”
+VISION_LATURA_MAXIMA = 2048
+VISION_LATURA_MICA = 768
+
+# Un rând de pixeli e „cu cerneală” dacă are măcar atâția pixeli închiși (fracțiune din lățime)
+_NIVEL_CERNEALA = 160
+_PRAG_RAND_CERNEALA = 0.005
+_PADDING_MARGINI = 16
+_SUPRAPUNERE_TILE = 24
+
+
+@dataclass
+class SetariImagine:
+    """Cum e pregătită imaginea unei pagini; valorile implicite vin din config."""
+    gri: bool = OCR_IMAGINE_GRI
+    format: str = OCR_IMAGINE_FORMAT
+    calitate: int = OCR_IMAGINE_CALITATE
+    taie_margini: bool = OCR_TAIE_MARGINI
+    max_tile: int = OCR_MAX_TILE
+
+
+@dataclass
+class ImaginePregatita:
+    """Imaginile codate (una per tile) gata de trimis, cu tipul MIME și mărimea totală."""
+    continut: List[bytes]
+    mime: str
+    octeti: int
+    dimensiuni: Tuple[int, int]
+
+
+def estimeaza_inaltime_rand(imagine: Image.Image) -> Optional[float]:
+    """Înălțimea mediană a rândurilor de text, în pixeli, din profilul orizontal al cernelii.
+
+    Întoarce None dacă pe pagină nu se disting rânduri (pagină goală sau doar imagine).
+    """
+    gri = imagine.convert("L")
+    latime, inaltime = gri.size
+    prag = max(1, int(latime * _PRAG_RAND_CERNEALA))
+    # Pixelii închiși devin 1; suma pe fiecare rând dă profilul orizontal
+    masca = gri.point(lambda v: 1 if v < _NIVEL_CERNEALA else 0)
+    date = masca.tobytes()
+    randuri_cerneala = [sum(date[y * latime:(y + 1) * latime]) >= prag for y in range(inaltime)]
+
+    inaltimi, curent = [], 0
+    for cu_cerneala in randuri_cerneala + [False]:
+        if cu_cerneala:
+            curent += 1
+        elif curent:
+            inaltimi.append(curent)
+            curent = 0
+    # Benzile de 1-2 pixeli sunt linii de tabel sau zgomot, nu rânduri de text
+    inaltimi = [h for h in inaltimi if h > 2]
+    if len(inaltimi) < 3:
+        return None
+    return float(statistics.median(inaltimi))
+
+
+def dpi_adaptiv(inaltime_rand_pt: Optional[float]) -> int:
+    """DPI-ul la care rândurile de text au `INALTIME_RAND_TINTA_PX` pixeli.
+
+    `inaltime_rand_pt` e înălțimea rândului în puncte (1/72 inch), măsurată pe o
+    randare la 72 DPI; fără o estimare se folosește `DPI_IMPLICIT`.
+    """
+    if not inaltime_rand_pt:
+        return DPI_IMPLICIT
+    dpi = INALTIME_RAND_TINTA_PX * 72 / inaltime_rand_pt
+    return int(min(max(dpi, OCR_DPI_MIN), OCR_DPI_MAX))
+
+
+def taie_margini(imagine: Image.Image) -> Image.Image:
+    """Taie marginile albe, păstrând un mic padding în jurul conținutului."""
+    gri = imagine.convert("L")
+    # getbbox caută pixeli nenuli: inversăm și eliminăm nuanțele foarte deschise (zgomot de scanare)
+    continut = ImageOps.invert(gri).point(lambda v: 255 if v > 255 - _NIVEL_CERNEALA else 0).getbbox()
+    if not continut:
+        return imagine
+    stanga, sus, dreapta, jos = continut
+    return imagine.crop((max(0, stanga - _PADDING_MARGINI), max(0, sus - _PADDING_MARGINI),
+                         min(imagine.width, dreapta + _PADDING_MARGINI), min(imagine.height, jos + _PADDING_MARGINI)))
+
+
+def scara_vision(latime: int, inaltime: int) -> float:
+    """Factorul cu care modelul redimensionează o imagine („high detail”)."""
+    scara = min(1.0, VISION_LATURA_MAXIMA / max(latime, inaltime))
+    return scara * min(1.0, VISION_LATURA_MICA / (min(latime, inaltime) * scara))
+
+
+def numar_tile(latime: int, inaltime: int, inaltime_rand_px: Optional[float], max_tile: int) -> int:
+    """Câte benzi orizontale trebuie ca rândurile să rămână lizibile după redimensionare."""
+    if not inaltime_rand_px:
+        return 1
+    for tile in range(1, max_tile + 1):
+        inaltime_tile = math.ceil(inaltime / tile) + _SUPRAPUNERE_TILE
+        if inaltime_rand_px * scara_vision(latime, inaltime_tile) >= INALTIME_RAND_MINIMA_VISION_PX:
+            return tile
+    return max_tile
+
+
+def imparte_in_tile(imagine: Image.Image, tile: int) -> List[Image.Image]:
+    """Benzi orizontale egale, cu o mică suprapunere ca să nu tăiem rânduri în două."""
+    if tile <= 1:
+        return [imagine]
+    pas = math.ceil(imagine.height / tile)
+    return [imagine.crop((0, max(0, i * pas - _SUPRAPUNERE_TILE), imagine.width,
+                          min(imagine.height, (i + 1) * pas + _SUPRAPUNERE_TILE)))
+            for i in range(tile)]
+
+
+def codifica(imagine: Image.Image, format: str, calitate: int) -> bytes:
+    buffer = io.BytesIO()
+    if format == "PNG":
+        imagine.save(buffer, format="PNG", optimize=True)
+    else:
+        imagine.save(buffer, format=format, quality=calitate)
+    return buffer.getvalue()
+
+
+def pregateste_imagine(imagine: Image.Image, setari: Optional[SetariImagine] = None) -> ImaginePregatita:
+    """Aplică setările (gri, tăiere, tile-uri, codare) și întoarce imaginile de trimis."""
+    setari = setari or SetariImagine()
+    if setari.gri:
+        imagine = imagine.convert("L")
+    elif imagine.mode != "RGB":
+        imagine = imagine.convert("RGB")
+    if setari.taie_margini:
+        imagine = taie_margini(imagine)
+
+    tile = numar_tile(imagine.width, imagine.height, estimeaza_inaltime_rand(imagine), setari.max_tile)
+    continut = [codifica(bucata, setari.format, setari.calitate) for bucata in imparte_in_tile(imagine, tile)]
+    return ImaginePregatita(continut, f"image/{setari.format.lower()}", sum(map(len, continut)), imagine.size)
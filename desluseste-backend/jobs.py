@@ -0,0 +1,156 @@
+"""Coadă de joburi în proces pentru analiza PDF-urilor.
+
+Upload-ul primește imediat un `job_id`; un număr fix de workeri asincroni rulează
+pipeline-ul (extracție -> chunking -> analiză -> sinteză) și actualizează progresul
+pe etape, pe care clientul îl interoghează prin endpoint-urile de status și rezultat.
+Nu e nevoie de broker: totul trăiește în procesul worker-ului uvicorn/gunicorn,
+așa că la oprire coada nu mai primește joburi și le lasă pe cele începute să se
+termine (vezi `opreste` și `ciclu_viata`).
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import HTTPException
+
+import admitere
+from admitere import EstimareCost
+from config import JOB_MAX_COADA, JOB_TTL_MINUTE, JOB_WORKERS
+from pipeline import ETAPE, analizeaza_document
+
+
+class CoadaPlina(Exception):
+    """Coada a atins `JOB_MAX_COADA` joburi în așteptare."""
+
+
+class CoadaInchisa(Exception):
+    """Worker-ul se oprește și nu mai primește joburi."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    temp_path: str
+    hash_pdf: str
+    # Costul estimat la upload (vezi `admitere`); None pentru documentele din cache
+    estimare: Optional[EstimareCost] = None
+    stare: str = "in_asteptare"
+    etape: dict = field(default_factory=lambda: {
+        etapa: {"nume": etapa, "stare": "in_asteptare", "progres": 0, "total": 0} for etapa in ETAPE
+    })
+    rezultat: Optional[dict] = None
+    cod_eroare: Optional[int] = None
+    eroare: Optional[str] = None
+    terminat: Optional[float] = None
+
+    def actualizeaza_progres(self, etapa: str, facut: int, total: int) -> None:
+        self.etape[etapa].update(
+            stare="finalizat" if facut >= total else "in_lucru", progres=facut, total=total
+        )
+
+    def status(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "stare": self.stare,
+            "etape": list(self.etape.values()),
+            "eroare": self.eroare,
+        }
+
+
+class CoadaJoburi:
+    """Coadă FIFO limitată, consumată de `workeri` task-uri pe event loop-ul aplicației."""
+
+    def __init__(self, workeri: int, max_coada: int, ttl_secunde: float):
+        self.workeri = workeri
+        self.max_coada = max_coada
+        self.ttl_secunde = ttl_secunde
+        self._joburi: dict[str, Job] = {}
+        self._coada: Optional[asyncio.Queue] = None
+        self._taskuri: list[asyncio.Task] = []
+        self._inchisa = False
+
+    def porneste(self) -> None:
+        """Creează coada și workerii pe loop-ul care rulează aplicația (la pornire sau la primul job)."""
+        if self._coada is None:
+            self._coada = asyncio.Queue(maxsize=self.max_coada)
+            self._taskuri = [asyncio.create_task(self._worker()) for _ in range(self.workeri)]
+
+    def trimite(self, temp_path: str, hash_pdf: str, estimare: Optional[EstimareCost] = None) -> Job:
+        """Pune un PDF deja salvat pe disc în coadă; fișierul devine al jobului."""
+        if self._inchisa:
+            raise CoadaInchisa()
+        self._curata()
+        self.porneste()
+        job = Job(job_id=uuid.uuid4().hex, temp_path=temp_path, hash_pdf=hash_pdf, estimare=estimare)
+        try:
+            self._coada.put_nowait(job)
+        except asyncio.QueueFull:
+            raise CoadaPlina()
+        self._joburi[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._joburi.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._coada.get()
+            try:
+                await self._ruleaza(job)
+            finally:
+                self._coada.task_done()
+
+    async def _ruleaza(self, job: Job) -> None:
+        job.stare = "in_lucru"
+        try:
+            # Jobul e deja la coadă: așteaptă bugetul oricât, în loc să fie refuzat
+            with await admitere.rezerva(job.estimare, asteptare=None):
+                job.rezultat = await analizeaza_document(job.temp_path, job.hash_pdf, job.actualizeaza_progres)
+            job.stare = "finalizat"
+        except HTTPException as e:
+            job.stare, job.cod_eroare, job.eroare = "esuat", e.status_code, e.detail
+        except Exception as e:
+            job.stare, job.cod_eroare, job.eroare = "esuat", 500, f"A apărut o eroare la analiză: {str(e)}"
+        finally:
+            job.terminat = time.time()
+            if os.path.exists(job.temp_path):
+                os.remove(job.temp_path)
+
+    def inchide(self) -> None:
+        """Nu mai primește joburi noi; cele din coadă și în lucru continuă."""
+        self._inchisa = True
+
+    async def opreste(self, timeout: float) -> int:
+        """Închide coada și așteaptă cel mult `timeout` secunde să se termine joburile
+        din coadă și în lucru; pe cele rămase le anulează. Întoarce câte au fost anulate."""
+        self.inchide()
+        if self._coada is None:
+            return 0
+        try:
+            await asyncio.wait_for(self._coada.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._taskuri:
+            task.cancel()
+        await asyncio.gather(*self._taskuri, return_exceptions=True)
+        anulate = [job for job in self._joburi.values() if job.stare in ("in_asteptare", "in_lucru")]
+        for job in anulate:
+            job.stare, job.cod_eroare, job.eroare = "esuat", 503, "Serverul s-a oprit înainte de finalizarea analizei."
+            job.terminat = time.time()
+            if os.path.exists(job.temp_path):
+                os.remove(job.temp_path)
+        self._coada, self._taskuri = None, []
+        return len(anulate)
+
+    def _curata(self) -> None:
+        """Uită joburile terminate de mai mult de `ttl_secunde`."""
+        limita = time.time() - self.ttl_secunde
+        for job_id in [j.job_id for j in self._joburi.values() if j.terminat and j.terminat < limita]:
+            del self._joburi[job_id]
+
+
+coada_joburi = CoadaJoburi(JOB_WORKERS, JOB_MAX_COADA, JOB_TTL_MINUTE * 60)
@@ -0,0 +1,199 @@
+"""Analiza în lot a mai multor contracte (dosare de 50–200 de PDF-uri).
+
+Spre deosebire de N cereri `/analizeaza-pdf/` independente, lotul:
+- deduplică documentele identice (același hash) și servește din cache ce e deja analizat;
+- trece fiecare document prin admitere (vezi `admitere`): peste limitele pe document
+  e respins (413), altfel așteaptă bugetul worker-ului și îl ține cât e analizat,
+  ca un lot mare să nu ocupe worker-ul în locul celorlalte cereri;
+- extrage textul documentelor cu o concurență limitată (`LOT_EXTRACTII_CONCURENTE`);
+- deduplică chunk-urile identice din tot lotul (clauzele-tip se repetă de la un
+  contract la altul) și le analizează o singură dată; chunk-urile și sintezele
+  tuturor documentelor împart semaforul `OPENAI_MAX_CONCURRENCY` și limitatorul de rată.
+
+Fiecare document își parcurge singur etapele, de la admitere la sinteză, așa că
+rezervarea lui nu depinde de restul lotului. Eșecul unui document (PDF ilizibil,
+peste limite, toate chunk-urile eșuate) nu oprește lotul: documentul e raportat cu
+codul și mesajul erorii.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+import admitere
+from config import LOT_EXTRACTII_CONCURENTE, OPENAI_MAX_CONCURRENCY
+from document import DocumentExtras
+from executie import ruleaza_blocant
+from openai_client import genereaza_sinteza_async
+from pipeline import (
+    aliniaza_citatele, analizeaza_chunkuri_cu_cache_pe_masura, extrage_document, pregateste_chunkuri,
+    rezultat_din_cache, salveaza_rezultat, verifica_chunkuri_esuate,
+)
+
+
+@dataclass
+class DocumentLot:
+    """Un PDF din lot, salvat pe disc, și starea analizei lui."""
+    nume_fisier: str
+    temp_path: str
+    hash_pdf: str
+    duplicat_al: Optional[str] = None
+    din_cache: bool = False
+    rezultat: Optional[dict] = None
+    cod_eroare: Optional[int] = None
+    eroare: Optional[str] = None
+    # Stare intermediară: documentul extras, chunk-urile de analizat (cu pozițiile lor
+    # în text și problemele găsite) și cele omise de pre-filtru
+    extras: Optional[DocumentExtras] = None
+    chunkuri: List[str] = field(default_factory=list)
+    starturi: List[int] = field(default_factory=list)
+    probleme_pe_chunk: List[Optional[List[dict]]] = field(default_factory=list)
+    omise: List[dict] = field(default_factory=list)
+
+    def esueaza(self, e: Exception) -> None:
+        self.cod_eroare = e.status_code if isinstance(e, HTTPException) else 500
+        self.eroare = e.detail if isinstance(e, HTTPException) else f"A apărut o eroare la analiză: {str(e)}"
+
+    def raspuns(self) -> dict:
+        return {
+            "nume_fisier": self.nume_fisier,
+            "hash_pdf": self.hash_pdf,
+            "stare": "esuat" if self.eroare else "finalizat",
+            "duplicat_al": self.duplicat_al,
+            "din_cache": self.din_cache,
+            "cod_eroare": self.cod_eroare,
+            "eroare": self.eroare,
+            "rezultat": self.rezultat,
+        }
+
+
+@dataclass
+class _LotInLucru:
+    """Ce împart documentele unui lot cât sunt analizate."""
+    extractii: asyncio.Semaphore
+    # Apelurile OpenAI ale întregului lot (chunk-uri și sinteze)
+    apeluri: asyncio.Semaphore
+    # Rezultatul fiecărui chunk distinct din lot, completat de documentul care l-a trimis primul
+    chunkuri: Dict[str, "asyncio.Future[Optional[List[dict]]]"] = field(default_factory=dict)
+
+
+async def _extrage_si_imparte(document: DocumentLot) -> None:
+    document.extras = await extrage_document(document.temp_path)
+    chunkuri, de_analizat, document.omise = await ruleaza_blocant(pregateste_chunkuri, document.extras)
+    document.chunkuri = [chunkuri[i].text for i in de_analizat]
+    document.starturi = [chunkuri[i].start for i in de_analizat]
+
+
+async def _analizeaza_chunkuri(document: DocumentLot, lot: _LotInLucru) -> None:
+    """Chunk-urile documentului: cele noi în lot sunt trimise acum, cele deja trimise de
+    alt document sunt așteptate (acela își ține rezervarea cât le analizează)."""
+    proprii = [chunk for chunk in dict.fromkeys(document.chunkuri) if chunk not in lot.chunkuri]
+    bucla = asyncio.get_running_loop()
+    for chunk in proprii:
+        lot.chunkuri[chunk] = bucla.create_future()
+    try:
+        async for i, probleme in analizeaza_chunkuri_cu_cache_pe_masura(proprii, semafor=lot.apeluri):
+            lot.chunkuri[proprii[i]].set_result(probleme)
+    finally:
+        # La eroare sau anulare, documentele care așteaptă văd chunk-ul ca eșuat
+        for chunk in proprii:
+            if not lot.chunkuri[chunk].done():
+                lot.chunkuri[chunk].set_result(None)
+    document.probleme_pe_chunk = [await lot.chunkuri[chunk] for chunk in document.chunkuri]
+
+
+async def _sintetizeaza(document: DocumentLot, lot: _LotInLucru) -> None:
+    rezultate = document.probleme_pe_chunk
+    chunkuri_esuate = sum(1 for probleme in rezultate if probleme is None)
+    verifica_chunkuri_esuate(chunkuri_esuate, len(rezultate))
+    document.rezultat = {
+        "probleme_identificate": [problema for probleme in rezultate for problema in probleme or []],
+        "rezumat_executiv": "",
+        "text_original": document.extras.text,
+        "inceput_pagini": document.extras.inceput_pagini,
+        "chunkuri_esuate": chunkuri_esuate,
+        "chunkuri_omise": document.omise,
+    }
+    async with lot.apeluri:
+        document.rezultat["rezumat_executiv"] = await genereaza_sinteza_async(document.rezultat["probleme_identificate"])
+    aliniate = await aliniaza_citatele(document.extras, document.probleme_pe_chunk, document.starturi)
+    document.rezultat["probleme_identificate"] = [problema for probleme in aliniate for problema in probleme]
+    await ruleaza_blocant(salveaza_rezultat, document.hash_pdf, document.rezultat, chunkuri_esuate)
+
+
+async def _analizeaza_document(document: DocumentLot, lot: _LotInLucru) -> None:
+    """Admitere, extracție, chunk-uri și sinteză pentru un document al lotului.
+
+    Ca un job din coadă, documentul așteaptă fără termen bugetul worker-ului (vezi
+    `admitere`) și îl ține până la sfârșitul analizei lui; peste limitele pe document
+    e raportat ca eșuat (413). Eșecul unui document nu oprește lotul.
+    """
+    try:
+        async with lot.extractii:
+            # Cache-ul a fost verificat deja, pentru tot lotul
+            estimare = await admitere.evalueaza(document.temp_path)
+        with await admitere.rezerva(estimare, asteptare=None):
+            async with lot.extractii:
+                await _extrage_si_imparte(document)
+            await _analizeaza_chunkuri(document, lot)
+            await _sintetizeaza(document, lot)
+    except Exception as e:
+        document.rezultat = None
+        document.esueaza(e)
+
+
+async def analizeaza_lot(documente: List[DocumentLot]) -> dict:
+    """Analizează toate documentele lotului; întoarce un `BatchResponse`."""
+    start = time.perf_counter()
+
+    # 1. Documente identice: doar primul e analizat, celelalte primesc rezultatul lui
+    primul_cu_hash: Dict[str, DocumentLot] = {}
+    for document in documente:
+        if document.hash_pdf in primul_cu_hash:
+            document.duplicat_al = primul_cu_hash[document.hash_pdf].nume_fisier
+        else:
+            primul_cu_hash[document.hash_pdf] = document
+    unice = list(primul_cu_hash.values())
+
+    de_analizat = []
+    for document in unice:
+        document.rezultat = await ruleaza_blocant(rezultat_din_cache, document.hash_pdf)
+        document.din_cache = document.rezultat is not None
+        if not document.din_cache:
+            de_analizat.append(document)
+
+    # 2. Fiecare document, de la admitere la sinteză; extracțiile și apelurile OpenAI
+    # au limite comune, iar chunk-urile identice din tot lotul sunt analizate o singură dată
+    lot = _LotInLucru(asyncio.Semaphore(LOT_EXTRACTII_CONCURENTE), asyncio.Semaphore(OPENAI_MAX_CONCURRENCY))
+    await asyncio.gather(*(_analizeaza_document(document, lot) for document in de_analizat))
+    extrase = [document for document in de_analizat if document.extras is not None]
+
+    for document in documente:
+        if document.duplicat_al:
+            original = primul_cu_hash[document.hash_pdf]
+            document.rezultat, document.cod_eroare, document.eroare = original.rezultat, original.cod_eroare, original.eroare
+
+    finalizate = [document for document in documente if not document.eroare]
+    niveluri = Counter(problema.get("nivel_atentie", "")
+                       for document in finalizate for problema in document.rezultat["probleme_identificate"])
+    total_chunkuri = sum(len(document.chunkuri) for document in extrase)
+    sumar = {
+        "documente": len(documente),
+        "documente_unice": len(unice),
+        "documente_duplicate": len(documente) - len(unice),
+        "documente_din_cache": sum(1 for document in unice if document.din_cache),
+        "documente_esuate": len(documente) - len(finalizate),
+        "chunkuri_total": total_chunkuri,
+        "chunkuri_unice": len(lot.chunkuri),
+        "probleme_total": sum(niveluri.values()),
+        "probleme_pe_nivel": dict(niveluri),
+        "durata_secunde": round(time.perf_counter() - start, 2),
+    }
+    print(f"--- [INFO] Lot: {sumar['documente']} documente ({sumar['documente_unice']} unice, "
+          f"{sumar['documente_din_cache']} din cache), {total_chunkuri} chunk-uri ({len(lot.chunkuri)} unice), "
+          f"{sumar['documente_esuate']} eșuate, în {sumar['durata_secunde']:.1f}s. ---")
+    return {"documente": [document.raspuns() for document in documente], "sumar": sumar}
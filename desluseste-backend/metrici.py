@@ -0,0 +1,201 @@
+"""Metrici în format Prometheus și intervale de timp pe etapele pipeline-ului.
+
+Contoarele și histogramele trăiesc în procesul curent (un registru per worker
+uvicorn/gunicorn) și sunt expuse ca text pe `/metrics`. `masoara(etapa)` cronometrează
+o etapă: durata intră în histograma `desluseste_etapa_secunde` și, dacă cererea
+curentă are o defalcare activă (vezi `porneste_defalcare`), și în antetul
+`Server-Timing` al răspunsului.
+
+Defalcarea e un dicționar ținut într-un `ContextVar`: task-urile asyncio și
+`ruleaza_blocant` moștenesc contextul, deci etapele rulate acolo se adună la
+cererea care le-a pornit. Firele pornite direct dintr-un `ThreadPoolExecutor`
+(ex. OCR-ul pe pagini) nu moștenesc contextul și contribuie doar la metrici.
+Etapele care rulează concurent în aceeași cerere (extracțiile unui lot) se adună,
+deci în defalcare pot depăși durata totală.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Limitele implicite ale histogramelor de durată, în secunde
+BUCKETS_SECUNDE = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BUCKETS_TOKENI = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+def _etichete(nume_etichete: Sequence[str], valori: Tuple[str, ...]) -> str:
+    if not nume_etichete:
+        return ""
+    perechi = ",".join(f'{nume}="{_escape(valoare)}"' for nume, valoare in zip(nume_etichete, valori))
+    return "{" + perechi + "}"
+
+
+def _escape(valoare: str) -> str:
+    return str(valoare).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Contor:
+    """Contor monoton, cu etichete."""
+    tip = "counter"
+
+    def __init__(self, nume: str, descriere: str, etichete: Sequence[str] = ()):
+        self.nume = nume
+        self.descriere = descriere
+        self.etichete = tuple(etichete)
+        self._valori: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valoare: float = 1, **etichete: str) -> None:
+        cheie = tuple(str(etichete[nume]) for nume in self.etichete)
+        with self._lock:
+            self._valori[cheie] = self._valori.get(cheie, 0) + valoare
+
+    def expune(self) -> List[str]:
+        with self._lock:
+            valori = sorted(self._valori.items())
+        return [f"{self.nume}{_etichete(self.etichete, cheie)} {valoare:g}" for cheie, valoare in valori]
+
+
+class Histograma:
+    """Histogramă cumulativă pe limite fixe, cu sumă și număr de observații."""
+    tip = "histogram"
+
+    def __init__(self, nume: str, descriere: str, etichete: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS_SECUNDE):
+        self.nume = nume
+        self.descriere = descriere
+        self.etichete = tuple(etichete)
+        self.buckets = tuple(sorted(buckets))
+        self._serii: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observa(self, valoare: float, **etichete: str) -> None:
+        cheie = tuple(str(etichete[nume]) for nume in self.etichete)
+        pozitie = bisect.bisect_left(self.buckets, valoare)
+        with self._lock:
+            # [numărători pe bucket..., +Inf, suma]
+            serie = self._serii.setdefault(cheie, [0.0] * (len(self.buckets) + 2))
+            serie[pozitie] += 1
+            serie[-1] += valoare
+
+    def expune(self) -> List[str]:
+        with self._lock:
+            serii = sorted((cheie, list(serie)) for cheie, serie in self._serii.items())
+        linii = []
+        for cheie, serie in serii:
+            cumulat = 0.0
+            for limita, numar in zip([*self.buckets, "+Inf"], serie[:-1]):
+                cumulat += numar
+                le = limita if limita == "+Inf" else f"{limita:g}"
+                linii.append(f"{self.nume}_bucket{_etichete((*self.etichete, 'le'), (*cheie, le))} {cumulat:g}")
+            linii.append(f"{self.nume}_sum{_etichete(self.etichete, cheie)} {serie[-1]:g}")
+            linii.append(f"{self.nume}_count{_etichete(self.etichete, cheie)} {cumulat:g}")
+        return linii
+
+
+class Registru:
+    def __init__(self):
+        self._metrici: Dict[str, object] = {}
+
+    def contor(self, nume: str, descriere: str, etichete: Sequence[str] = ()) -> Contor:
+        return self._metrici.setdefault(nume, Contor(nume, descriere, etichete))
+
+    def histograma(self, nume: str, descriere: str, etichete: Sequence[str] = (),
+                   buckets: Sequence[float] = BUCKETS_SECUNDE) -> Histograma:
+        return self._metrici.setdefault(nume, Histograma(nume, descriere, etichete, buckets))
+
+    def expune(self) -> str:
+        linii = []
+        for metrica in self._metrici.values():
+            linii.append(f"# HELP {metrica.nume} {metrica.descriere}")
+            linii.append(f"# TYPE {metrica.nume} {metrica.tip}")
+            linii.extend(metrica.expune())
+        return "\n".join(linii) + "\n"
+
+
+registru = Registru()
+
+# --- Metricile aplicației ---
+ETAPA_SECUNDE = registru.histograma(
+    "desluseste_etapa_secunde", "Durata etapelor pipeline-ului.", ["etapa"])
+CERERI_HTTP = registru.contor(
+    "desluseste_cereri_http_total", "Cereri HTTP servite, pe rută și status.", ["ruta", "status"])
+CERERE_SECUNDE = registru.histograma(
+    "desluseste_cerere_secunde", "Durata cererilor HTTP, pe rută.", ["ruta"])
+LLM_LATENTA = registru.histograma(
+    "desluseste_llm_latenta_secunde", "Latența unui apel OpenAI (o încercare), pe model și rezultat.",
+    ["model", "rezultat"])
+LLM_TOKENI = registru.contor(
+    "desluseste_llm_tokeni_total", "Tokeni raportați de OpenAI, pe model și direcție.", ["model", "directie"])
+LLM_REINCERCARI = registru.contor(
+    "desluseste_llm_reincercari_total", "Reîncercări ale apelurilor OpenAI, pe motiv.", ["motiv"])
+LLM_CIRCUIT_DESCHIS = registru.contor(
+    "desluseste_llm_circuit_deschis_total", "Apeluri refuzate cu circuitul deschis.")
+TOKENI_PER_CERERE = registru.histograma(
+    "desluseste_tokeni_per_cerere", "Tokeni OpenAI (intrare + ieșire) consumați de o cerere HTTP.", ["ruta"],
+    buckets=BUCKETS_TOKENI)
+CACHE = registru.contor(
+    "desluseste_cache_total", "Căutări în cache, pe nivel (doc, chunk) și rezultat (hit, miss).", ["nivel", "rezultat"])
+PAGINI = registru.contor(
+    "desluseste_pagini_total", "Pagini extrase, pe sursa textului (digital, ocr, goala).", ["sursa"])
+OCR_PAGINI = registru.contor(
+    "desluseste_ocr_pagini_total", "Pagini trecute prin OCR, pe motorul care a dat textul.", ["motor"])
+CITATE = registru.contor(
+    "desluseste_citate_total", "Citate `clauza_originala` aliniate cu textul (exacta, aproximativa, negasita).",
+    ["potrivire"])
+ADMITERE = registru.contor(
+    "desluseste_admitere_total", "Decizii de admitere a analizelor (admis, cache, respins_limita, respins_ocupat).",
+    ["rezultat"])
+PORNIRE_SECUNDE = registru.histograma(
+    "desluseste_pornire_secunde", "Durata pașilor de încălzire la pornirea unui worker.", ["pas"])
+
+# --- Defalcarea pe cerere ---
+_defalcare: ContextVar[Optional[Dict[str, float]]] = ContextVar("defalcare", default=None)
+
+
+def porneste_defalcare() -> Dict[str, float]:
+    """Activează defalcarea pentru cererea (contextul) curentă și o întoarce."""
+    defalcare: Dict[str, float] = {}
+    _defalcare.set(defalcare)
+    return defalcare
+
+
+def adauga_la_defalcare(cheie: str, valoare: float) -> None:
+    defalcare = _defalcare.get()
+    if defalcare is not None:
+        defalcare[cheie] = defalcare.get(cheie, 0.0) + valoare
+
+
+def inregistreaza_tokeni(model: str, intrare: int, iesire: int) -> None:
+    LLM_TOKENI.inc(intrare, model=model, directie="intrare")
+    LLM_TOKENI.inc(iesire, model=model, directie="iesire")
+    adauga_la_defalcare("tokeni", intrare + iesire)
+
+
+@contextmanager
+def masoara(etapa: str, in_defalcare: bool = True) -> Iterator[None]:
+    """Cronometrează o etapă: histogramă + defalcarea cererii curente (în secunde).
+
+    Etapele care rulează de mai multe ori în paralel (un chunk, o pagină OCR) trec
+    `in_defalcare=False`: suma lor nu e timp de așteptare al cererii.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        durata = time.perf_counter() - start
+        ETAPA_SECUNDE.observa(durata, etapa=etapa)
+        if in_defalcare:
+            adauga_la_defalcare(etapa, durata)
+
+
+def server_timing(defalcare: Dict[str, float], total: float) -> str:
+    """Antetul `Server-Timing`: etapele în milisecunde, plus totalul și tokenii."""
+    parti = [f"{etapa};dur={durata * 1000:.1f}" for etapa, durata in defalcare.items() if etapa != "tokeni"]
+    parti.append(f"total;dur={total * 1000:.1f}")
+    if defalcare.get("tokeni"):
+        parti.append(f'tokeni;desc="{int(defalcare["tokeni"])}"')
+    return ", ".join(parti)
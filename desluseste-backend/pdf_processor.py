@@ -1,23 +1,578 @@
+import asyncio
+import contextvars
+import functools
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
 import fitz
 from PIL import Image
-from openai_client import ocr_pagina_cu_gpt4o
+from config import (
+    EXTRACTIE_MIN_PAGINI, EXTRACTIE_PAGINI_PE_INTERVAL, EXTRACTIE_PROCESE, OCR_ACOPERIRE_IMAGINI, OCR_IMAGINE_GRI, OCR_LIMBA_TESSERACT, OCR_MAX_WORKERS, OCR_MIN_CARACTERE_PAGINA, OCR_MOTOR,
+    OCR_PRAG_INCREDERE,
+)
+from document import DocumentExtras
+from executie import ruleaza_blocant
+from imagine_ocr import dpi_adaptiv, estimeaza_inaltime_rand
+from metrici import ETAPA_SECUNDE, OCR_PAGINI, PAGINI, masoara
+from openai_client import ocr_pagina_cu_gpt4o, ocr_pagina_cu_gpt4o_async
 
-def extract_text_from_pdf(path: str) -> str:
-    """Încearcă extragerea digitală; dacă e insuficient, folosește OCR ca fallback."""
-    text_document = ""
-    # Extracție text digitală
+try:
+    import pytesseract
+except ImportError:  # OCR-ul local e opțional; fără el rămâne doar GPT-4o
+    pytesseract = None
+
+T = TypeVar("T")
+
+# Detecția paginilor goale: randare la rezoluție mică, în tonuri de gri
+PAGINA_GOALA_DPI = 20
+PAGINA_GOALA_NIVEL_ALB = 200
+PAGINA_GOALA_PROPORTIE = 0.002
+_OCTETI_ALBI = bytes(range(PAGINA_GOALA_NIVEL_ALB, 256))
+
+
+@dataclass
+class PaginaExtrasa:
+    """Textul unei pagini și proveniența lui ("digital", "ocr" sau "goala")."""
+    numar: int
+    text: str
+    sursa: str
+    acoperire_imagini: float = 0.0
+    caractere_digitale: int = 0
+    motor_ocr: str = ""
+
+
+class PreaMultePaginiOCR(Exception):
+    """Documentul are mai multe pagini de trecut prin OCR decât limita cererii."""
+
+    def __init__(self, pagini_ocr: int, limita: int):
+        super().__init__(f"{pagini_ocr} pagini de OCR, limita este {limita}")
+        self.pagini_ocr = pagini_ocr
+        self.limita = limita
+
+
+@dataclass
+class RezultatOCR:
+    """Textul recunoscut, încrederea motorului (0–1) și motorul care l-a produs."""
+    text: str
+    incredere: float
+    motor: str
+
+
+class MotorOCR:
+    """Interfața motoarelor OCR: o imagine de pagină intră, un `RezultatOCR` iese.
+
+    Implementările trebuie să poată fi apelate din mai multe fire simultan.
+    `recunoaste_async` rulează implicit `recunoaste` pe executorul blocant; motoarele
+    care așteaptă după rețea o suprascriu cu un apel asincron.
+    """
+    nume = ""
+
+    def recunoaste(self, imagine: Image.Image) -> RezultatOCR:
+        raise NotImplementedError
+
+    async def recunoaste_async(self, imagine: Image.Image) -> RezultatOCR:
+        return await ruleaza_blocant(self.recunoaste, imagine)
+
+
+class MotorGPT4o(MotorOCR):
+    """OCR prin GPT-4o vision: precis, dar lent și plătit per pagină."""
+    nume = "gpt-4o"
+
+    def recunoaste(self, imagine: Image.Image) -> RezultatOCR:
+        text = ocr_pagina_cu_gpt4o(imagine)
+        # Modelul nu raportează încredere: un răspuns nevid e considerat sigur
+        return RezultatOCR(text, 1.0 if text.strip() else 0.0, self.nume)
+
+    async def recunoaste_async(self, imagine: Image.Image) -> RezultatOCR:
+        text = await ocr_pagina_cu_gpt4o_async(imagine)
+        return RezultatOCR(text, 1.0 if text.strip() else 0.0, self.nume)
+
+
+class MotorTesseract(MotorOCR):
+    """OCR local pe CPU cu Tesseract; încrederea e media ponderată a cuvintelor."""
+    nume = "tesseract"
+
+    def __init__(self, limba: str = OCR_LIMBA_TESSERACT):
+        self.limba = limba
+
+    @staticmethod
+    def disponibil(limba: str = OCR_LIMBA_TESSERACT) -> bool:
+        """Biblioteca, binarul și pachetele de limbă cerute sunt instalate."""
+        if pytesseract is None:
+            return False
+        try:
+            instalate = set(pytesseract.get_languages(config=""))
+        except Exception:
+            return False
+        return set(limba.split("+")) <= instalate
+
+    def recunoaste(self, imagine: Image.Image) -> RezultatOCR:
+        try:
+            date = pytesseract.image_to_data(imagine.convert("L"), lang=self.limba,
+                                             output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            print(f"--- [EROARE] OCR cu Tesseract a eșuat: {e} ---")
+            return RezultatOCR("", 0.0, self.nume)
+
+        randuri: Dict[Tuple[int, int, int], List[str]] = {}
+        suma_incredere = caractere = 0.0
+        for cuvant, incredere, bloc, paragraf, rand in zip(date["text"], date["conf"], date["block_num"],
+                                                           date["par_num"], date["line_num"]):
+            cuvant = cuvant.strip()
+            if not cuvant or float(incredere) < 0:
+                continue
+            randuri.setdefault((bloc, paragraf, rand), []).append(cuvant)
+            suma_incredere += float(incredere) * len(cuvant)
+            caractere += len(cuvant)
+
+        text = "\n".join(" ".join(cuvinte) for cuvinte in randuri.values())
+        return RezultatOCR(text, suma_incredere / caractere / 100 if caractere else 0.0, self.nume)
+
+
+class MotorCuEscaladare(MotorOCR):
+    """Rulează motorul local și trimite pagina la motorul de rezervă doar când
+    încrederea locală e sub prag (sau nu s-a recunoscut nimic)."""
+
+    def __init__(self, local: MotorOCR, rezerva: MotorOCR, prag: float = OCR_PRAG_INCREDERE):
+        self.local = local
+        self.rezerva = rezerva
+        self.prag = prag
+        self.nume = f"{local.nume}+{rezerva.nume}"
+
+    def _suficient(self, rezultat: RezultatOCR) -> bool:
+        if rezultat.text.strip() and rezultat.incredere >= self.prag:
+            return True
+        print(f"--- [INFO] Încredere {self.local.nume} {rezultat.incredere:.2f} sub pragul {self.prag:.2f}; "
+              f"pagina trece la {self.rezerva.nume}. ---")
+        return False
+
+    def recunoaste(self, imagine: Image.Image) -> RezultatOCR:
+        rezultat = self.local.recunoaste(imagine)
+        if self._suficient(rezultat):
+            return rezultat
+        escaladat = self.rezerva.recunoaste(imagine)
+        # Dacă și rezerva eșuează, textul local e mai bun decât nimic
+        return escaladat if escaladat.text.strip() else rezultat
+
+    async def recunoaste_async(self, imagine: Image.Image) -> RezultatOCR:
+        rezultat = await self.local.recunoaste_async(imagine)
+        if self._suficient(rezultat):
+            return rezultat
+        escaladat = await self.rezerva.recunoaste_async(imagine)
+        return escaladat if escaladat.text.strip() else rezultat
+
+
+def creeaza_motor_ocr(motor: str = OCR_MOTOR) -> MotorOCR:
+    """Motorul configurat prin `OCR_MOTOR`: "auto" (Tesseract cu escaladare la
+    GPT-4o), "tesseract" sau "gpt4o". Fără Tesseract instalat se folosește GPT-4o."""
+    if motor != "gpt4o" and not MotorTesseract.disponibil():
+        print("--- [AVERTISMENT] Tesseract nu este disponibil; OCR-ul folosește GPT-4o. ---")
+        return MotorGPT4o()
+    if motor == "tesseract":
+        return MotorTesseract()
+    if motor == "gpt4o":
+        return MotorGPT4o()
+    return MotorCuEscaladare(MotorTesseract(), MotorGPT4o())
+
+
+_motor_ocr: Optional[MotorOCR] = None
+
+
+def motor_ocr_implicit() -> MotorOCR:
+    """Motorul partajat al procesului, creat la primul OCR (verificarea Tesseract pornește un proces)."""
+    global _motor_ocr
+    if _motor_ocr is None:
+        _motor_ocr = creeaza_motor_ocr()
+    return _motor_ocr
+
+
+def _ocr_pagina(motor: MotorOCR, imagine: Image.Image) -> tuple[RezultatOCR, float]:
+    """Rulează OCR pe o pagină randată și întoarce rezultatul împreună cu durata apelului."""
+    start = time.perf_counter()
+    rezultat = motor.recunoaste(imagine)
+    return rezultat, time.perf_counter() - start
+
+
+def _randeaza_pentru_ocr(page: fitz.Page) -> Tuple[str, int, int, bytes]:
+    """Randează pagina la un DPI ales după înălțimea rândurilor (estimată pe o randare
+    la 72 DPI, unde un pixel e un punct), în tonuri de gri dacă e configurat așa.
+
+    Întoarce bufferul brut de pixeli (mod, lățime, înălțime, octeți): trece ieftin
+    între procese, fără să serializăm obiecte PIL.
+    """
+    previzualizare = page.get_pixmap(dpi=72, colorspace=fitz.csGRAY)
+    inaltime_rand = estimeaza_inaltime_rand(
+        Image.frombytes("L", [previzualizare.width, previzualizare.height], previzualizare.samples))
+    dpi = dpi_adaptiv(inaltime_rand)
+    if OCR_IMAGINE_GRI:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        return "L", pix.width, pix.height, pix.samples
+    pix = page.get_pixmap(dpi=dpi)
+    return "RGB", pix.width, pix.height, pix.samples
+
+
+def _imagine_din_brut(brut: Tuple[str, int, int, bytes]) -> Image.Image:
+    mod, latime, inaltime, pixeli = brut
+    return Image.frombuffer(mod, (latime, inaltime), pixeli, "raw", mod, 0, 1)
+
+
+# --- Pool de procese pentru extracție și randare ---
+# PyMuPDF ține GIL-ul cât extrage și randează, așa că un document mare ocupă un
+# singur nucleu. Intervalele de pagini sunt împărțite între procese; fiecare sarcină
+# își deschide singură documentul (handle-urile fitz nu se pot transmite) și îl închide
+# la final. Un handle păstrat între sarcini ar ține ocupat spațiul fișierului temporar
+# după ștergere; redeschiderea costă ~1ms, față de ~170ms randarea unei pagini.
+
+_pool_extractie: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def pool_extractie() -> Optional[ProcessPoolExecutor]:
+    """Pool-ul partajat al procesului, creat la prima folosire; None dacă e dezactivat."""
+    global _pool_extractie
+    if EXTRACTIE_PROCESE <= 1:
+        return None
+    with _pool_lock:
+        if _pool_extractie is None:
+            # "spawn": procesele copil nu moștenesc firele și conexiunile serverului
+            _pool_extractie = ProcessPoolExecutor(max_workers=EXTRACTIE_PROCESE,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+        return _pool_extractie
+
+
+def _pid_worker() -> int:
+    return os.getpid()
+
+
+def incalzeste_pool_extractie() -> int:
+    """Pornește procesele pool-ului (și importurile lor) înaintea primului document mare.
+
+    Cu "spawn" procesele se creează la cerere, câte unul pe sarcină trimisă cât niciunul
+    nu e liber; sarcinile trimise deodată le pornesc pe toate. Întoarce câte au răspuns.
+    """
+    pool = pool_extractie()
+    if pool is None:
+        return 0
+    futures = [pool.submit(_pid_worker) for _ in range(EXTRACTIE_PROCESE)]
+    return len({future.result() for future in futures})
+
+
+def inchide_pool_extractie() -> None:
+    global _pool_extractie
+    with _pool_lock:
+        if _pool_extractie is not None:
+            _pool_extractie.shutdown(cancel_futures=True)
+            _pool_extractie = None
+
+
+def _clasifica_interval(path: str, start: int, stop: int) -> List[PaginaExtrasa]:
+    """Rulează în procesele pool-ului: clasifică paginile [start, stop)."""
     with fitz.open(path) as doc:
-        for page in doc:
-            text_document += page.get_text()
-
-    # Dacă textul digital e prea scurt, folosim OCR pe imagini generate cu DPI ridicat
-    if len(text_document.strip()) < 100:
-        text_document = ""
-        with fitz.open(path) as doc:
-            for i, page in enumerate(doc):
-                pix = page.get_pixmap(dpi=200)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                page_text = ocr_pagina_cu_gpt4o(img)
-                text_document += page_text + "\n"
-                print(f"--- [INFO] OCR cu GPT-4o Pagina {i+1} procesată. ---")
-    return text_document
+        return _clasifica_pagini(doc, start, stop)
+
+
+def _randeaza_in_worker(path: str, index: int) -> Tuple[Tuple[str, int, int, bytes], float]:
+    """Rulează în procesele pool-ului: randează o pagină pentru OCR, cu durata."""
+    start = time.perf_counter()
+    with fitz.open(path) as doc:
+        brut = _randeaza_pentru_ocr(doc[index])
+    return brut, time.perf_counter() - start
+
+
+def _randeaza_pagina(doc: fitz.Document, index: int) -> Tuple[Tuple[str, int, int, bytes], float]:
+    """Randează o pagină pentru OCR, cu durata (pe firul documentului, vezi `DocumentPeFir`)."""
+    start = time.perf_counter()
+    brut = _randeaza_pentru_ocr(doc[index])
+    return brut, time.perf_counter() - start
+
+
+class DocumentPeFir:
+    """Un PDF deschis o singură dată, pe calea asincronă, și folosit doar de firul lui.
+
+    Un `fitz.Document` nu e sigur între fire, așa că handle-ul stă pe un fir dedicat:
+    clasificarea și randările pentru OCR (fără pool) sunt puse la coadă pe el, în loc
+    ca fiecare pagină să redeschidă fișierul. Nu se pierde paralelism: PyMuPDF ține
+    GIL-ul cât lucrează, iar paralelismul real vine din pool-ul de procese.
+
+        async with DocumentPeFir(path) as document:
+            pagini = await document.ruleaza(_clasifica_document, path)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fir = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fitz")
+        self._doc: Optional[fitz.Document] = None
+
+    def _apel(self, functie: Callable[..., T], *args) -> T:
+        if self._doc is None:
+            self._doc = fitz.open(self.path)
+        return functie(self._doc, *args)
+
+    async def ruleaza(self, functie: Callable[..., T], *args) -> T:
+        """`functie(doc, *args)` pe firul documentului, în contextul curent (metricile)."""
+        apel = functools.partial(contextvars.copy_context().run, self._apel, functie, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._fir, apel)
+
+    def _inchide(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    async def __aenter__(self) -> "DocumentPeFir":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        # Pe același fir, după randările rămase; o cerere anulată nu așteaptă închiderea
+        self._fir.submit(self._inchide)
+        self._fir.shutdown(wait=False)
+
+
+def _intervale(numar_pagini: int, procese: int) -> List[Tuple[int, int]]:
+    """Intervale contigue, câte două pe proces ca încărcarea să se echilibreze."""
+    numar = max(1, min(procese * 2, numar_pagini // EXTRACTIE_PAGINI_PE_INTERVAL))
+    pas = math.ceil(numar_pagini / numar)
+    return [(start, min(start + pas, numar_pagini)) for start in range(0, numar_pagini, pas)]
+
+
+def _randari(doc: fitz.Document, path: str, indici: List[int], inainte: int
+             ) -> Iterator[Tuple[int, Image.Image, float]]:
+    """Paginile de OCR randate, în ordine. Cu pool, până la `inainte` pagini sunt
+    randate în avans în alte procese cât timp paginile anterioare sunt la OCR."""
+    pool = pool_extractie() if len(indici) > 1 else None
+    if pool is None:
+        for i in indici:
+            start = time.perf_counter()
+            brut = _randeaza_pentru_ocr(doc[i])
+            yield i, _imagine_din_brut(brut), time.perf_counter() - start
+        return
+
+    asteptate: Deque[Tuple[int, Future]] = deque()
+    ramase = iter(indici)
+    try:
+        for i in itertools.islice(ramase, inainte):
+            asteptate.append((i, pool.submit(_randeaza_in_worker, path, i)))
+        while asteptate:
+            i, future = asteptate.popleft()
+            urmatorul = next(ramase, None)
+            if urmatorul is not None:
+                asteptate.append((urmatorul, pool.submit(_randeaza_in_worker, path, urmatorul)))
+            brut, durata = future.result()
+            yield i, _imagine_din_brut(brut), durata
+    finally:
+        for _, future in asteptate:
+            future.cancel()
+
+
+def _ocr_pagini(doc: fitz.Document, path: str, indici: List[int], motor: Optional[MotorOCR] = None,
+                max_workers: int = OCR_MAX_WORKERS) -> Dict[int, RezultatOCR]:
+    """OCR paralel pe paginile date: paginile sunt randate (pe firul curent, căci PyMuPDF
+    nu e thread-safe, sau în pool-ul de procese) și trimise motorului OCR pe un pool
+    limitat de fire. Întoarce rezultatul pe index de pagină.
+    """
+    motor = motor or motor_ocr_implicit()
+    texte: Dict[int, RezultatOCR] = {}
+    durate_randare: Dict[int, float] = {}
+    durate_ocr: Dict[int, float] = {}
+    start_total = time.perf_counter()
+
+    def _colecteaza(futures: dict[Future, int], finalizate) -> None:
+        for future in finalizate:
+            i = futures.pop(future)
+            texte[i], durate_ocr[i] = future.result()
+            _inregistreaza_pagina_ocr(i, texte[i], durate_randare[i], durate_ocr[i])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_lucru: dict[Future, int] = {}
+        for i, img, durata in _randari(doc, path, indici, inainte=max_workers):
+            durate_randare[i] = durata
+            # Nu ținem mai multe pagini randate decât pot fi trimise, ca să limităm memoria
+            if len(in_lucru) >= max_workers:
+                finalizate, _ = wait(in_lucru, return_when=FIRST_COMPLETED)
+                _colecteaza(in_lucru, finalizate)
+            in_lucru[executor.submit(_ocr_pagina, motor, img)] = i
+
+        _colecteaza(in_lucru, wait(in_lucru).done)
+
+    _raporteaza_ocr(durate_ocr, time.perf_counter() - start_total)
+    return texte
+
+
+async def _ocr_pagini_async(document: DocumentPeFir, indici: List[int], motor: Optional[MotorOCR] = None,
+                            max_workers: int = OCR_MAX_WORKERS) -> Dict[int, RezultatOCR]:
+    """Ca `_ocr_pagini`, dar fără fire ținute cât așteaptă OCR-ul: paginile sunt randate
+    în pool-ul de procese sau pe firul documentului, iar motorul e apelat asincron.
+    Cel mult `max_workers` pagini sunt randate sau la OCR în același timp.
+    """
+    motor = motor or motor_ocr_implicit()
+    pool = pool_extractie() if len(indici) > 1 else None
+    semafor = asyncio.Semaphore(max_workers)
+    durate_ocr: Dict[int, float] = {}
+    start_total = time.perf_counter()
+
+    async def _pagina(i: int) -> Tuple[int, RezultatOCR]:
+        async with semafor:
+            if pool is not None:
+                brut, durata_randare = await asyncio.wrap_future(pool.submit(_randeaza_in_worker, document.path, i))
+            else:
+                brut, durata_randare = await document.ruleaza(_randeaza_pagina, i)
+            start = time.perf_counter()
+            rezultat = await motor.recunoaste_async(_imagine_din_brut(brut))
+            durate_ocr[i] = time.perf_counter() - start
+        _inregistreaza_pagina_ocr(i, rezultat, durata_randare, durate_ocr[i])
+        return i, rezultat
+
+    texte = dict(await asyncio.gather(*(_pagina(i) for i in indici)))
+    _raporteaza_ocr(durate_ocr, time.perf_counter() - start_total)
+    return texte
+
+
+def _inregistreaza_pagina_ocr(i: int, rezultat: RezultatOCR, durata_randare: float, durata_ocr: float) -> None:
+    OCR_PAGINI.inc(motor=rezultat.motor)
+    ETAPA_SECUNDE.observa(durata_randare, etapa="randare_pagina")
+    ETAPA_SECUNDE.observa(durata_ocr, etapa="ocr_pagina")
+    print(f"--- [INFO] OCR cu {rezultat.motor} Pagina {i+1} procesată în {durata_ocr:.2f}s "
+          f"(randare {durata_randare:.2f}s, încredere {rezultat.incredere:.2f}). ---")
+
+
+def _raporteaza_ocr(durate_ocr: Dict[int, float], durata_totala: float) -> None:
+    if durate_ocr:
+        cea_mai_lenta = max(durate_ocr, key=durate_ocr.__getitem__)
+        print(f"--- [INFO] OCR terminat: {len(durate_ocr)} pagini în {durata_totala:.2f}s; "
+              f"cea mai lentă: pagina {cea_mai_lenta+1} ({durate_ocr[cea_mai_lenta]:.2f}s). ---")
+
+
+def _acoperire_imagini(page: fitz.Page) -> float:
+    """Fracțiunea din suprafața paginii acoperită de imagini (plafonată la 1)."""
+    suprafata = abs(page.rect)
+    if not suprafata:
+        return 0.0
+    acoperit = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    return min(acoperit / suprafata, 1.0)
+
+
+def _pagina_goala(page: fitz.Page) -> bool:
+    """Randare la rezoluție mică: pagina e goală dacă aproape toți pixelii sunt albi.
+
+    Prinde și scanările de pagini albe sau separatoare, care au o imagine pe toată pagina.
+    """
+    pix = page.get_pixmap(dpi=PAGINA_GOALA_DPI, colorspace=fitz.csGRAY)
+    if not pix.samples:
+        return True
+    # translate() șterge octeții albi; rămân doar pixelii închiși
+    pixeli_inchisi = len(pix.samples.translate(None, _OCTETI_ALBI))
+    return pixeli_inchisi / len(pix.samples) < PAGINA_GOALA_PROPORTIE
+
+
+def clasifica_pagina(page: fitz.Page, text: str) -> Tuple[str, float]:
+    """Decide sursa textului unei pagini: "digital", "ocr" sau "goala".
+
+    Stratul de text e folosit când are destule caractere, cu excepția paginilor scanate
+    pe care stă doar un antet sau o ștampilă digitală (acoperire mare cu imagini).
+    """
+    caractere = len(text.strip())
+    acoperire = _acoperire_imagini(page)
+    if caractere >= OCR_MIN_CARACTERE_PAGINA:
+        if acoperire >= OCR_ACOPERIRE_IMAGINI and caractere < OCR_MIN_CARACTERE_PAGINA * 4:
+            return "ocr", acoperire
+        return "digital", acoperire
+    # Text scurt fără nicio imagine (ex. pagina de semnături): stratul de text e complet
+    if caractere and not acoperire:
+        return "digital", acoperire
+    if _pagina_goala(page):
+        return "goala", acoperire
+    return "ocr", acoperire
+
+
+def _clasifica_pagini(doc: fitz.Document, start: int, stop: int) -> List[PaginaExtrasa]:
+    pagini: List[PaginaExtrasa] = []
+    for i in range(start, stop):
+        page = doc[i]
+        text = page.get_text()
+        sursa, acoperire = clasifica_pagina(page, text)
+        # Pe paginile OCR textul digital (dacă există) rămâne ca rezervă până vine rezultatul
+        pagini.append(PaginaExtrasa(numar=i + 1, text="" if sursa == "goala" else text, sursa=sursa,
+                                    acoperire_imagini=round(acoperire, 3), caractere_digitale=len(text.strip())))
+    return pagini
+
+
+def _clasifica_document(doc: fitz.Document, path: str) -> List[PaginaExtrasa]:
+    """Clasifică toate paginile; documentele mari sunt împărțite între procesele pool-ului."""
+    start = time.perf_counter()
+    pool = pool_extractie() if len(doc) >= EXTRACTIE_MIN_PAGINI else None
+    with masoara("clasificare"):
+        if pool is None:
+            return _clasifica_pagini(doc, 0, len(doc))
+        intervale = _intervale(len(doc), EXTRACTIE_PROCESE)
+        futures = [pool.submit(_clasifica_interval, path, a, b) for a, b in intervale]
+        pagini = [pagina for future in futures for pagina in future.result()]
+    print(f"--- [INFO] {len(doc)} pagini clasificate în {len(intervale)} intervale pe "
+          f"{EXTRACTIE_PROCESE} procese în {time.perf_counter() - start:.2f}s. ---")
+    return pagini
+
+
+def _aplica_ocr(pagini: List[PaginaExtrasa], rezultate_ocr: Dict[int, RezultatOCR]) -> None:
+    for i, rezultat in rezultate_ocr.items():
+        pagini[i].motor_ocr = rezultat.motor
+        if rezultat.text.strip():
+            pagini[i].text = rezultat.text
+        elif pagini[i].text:
+            print(f"--- [AVERTISMENT] OCR eșuat pe pagina {i+1}; se păstrează stratul de text digital. ---")
+
+
+def _raporteaza_extractia(pagini: List[PaginaExtrasa]) -> None:
+    surse = Counter(p.sursa for p in pagini)
+    for sursa, numar in surse.items():
+        PAGINI.inc(numar, sursa=sursa)
+    print(f"--- [INFO] Extracție pe pagini: {surse['digital']} digitale, {surse['ocr']} OCR, "
+          f"{surse['goala']} goale (din {len(pagini)}). ---")
+
+
+def extrage_pagini(path: str, motor: Optional[MotorOCR] = None) -> List[PaginaExtrasa]:
+    """Extracție hibridă: fiecare pagină e clasificată separat și doar cele fără strat
+    de text util merg la OCR. Rezultatul păstrează ordinea paginilor și proveniența.
+
+    Documentele de peste `EXTRACTIE_MIN_PAGINI` pagini sunt împărțite pe intervale
+    între procesele pool-ului; rezultatele sunt reasamblate în ordine.
+    """
+    with fitz.open(path) as doc:
+        pagini = _clasifica_document(doc, path)
+        de_ocr = [p.numar - 1 for p in pagini if p.sursa == "ocr"]
+        if de_ocr:
+            with masoara("ocr"):
+                _aplica_ocr(pagini, _ocr_pagini(doc, path, de_ocr, motor))
+    _raporteaza_extractia(pagini)
+    return pagini
+
+
+async def extrage_pagini_async(path: str, motor: Optional[MotorOCR] = None,
+                               max_pagini_ocr: Optional[int] = None) -> List[PaginaExtrasa]:
+    """Varianta asincronă a `extrage_pagini`, pentru calea unei cereri HTTP: clasificarea
+    și randarea rulează pe firul documentului, deschis o singură dată (vezi `DocumentPeFir`),
+    sau în pool-ul de procese, iar OCR-ul așteaptă pe event loop, fără să țină fire ocupate.
+
+    Cu `max_pagini_ocr`, un document cu mai multe pagini de OCR e refuzat
+    (`PreaMultePaginiOCR`) după clasificare, înainte de orice randare.
+    """
+    async with DocumentPeFir(path) as document:
+        pagini = await document.ruleaza(_clasifica_document, path)
+        de_ocr = [p.numar - 1 for p in pagini if p.sursa == "ocr"]
+        if max_pagini_ocr is not None and len(de_ocr) > max_pagini_ocr:
+            raise PreaMultePaginiOCR(len(de_ocr), max_pagini_ocr)
+        if de_ocr:
+            with masoara("ocr"):
+                _aplica_ocr(pagini, await _ocr_pagini_async(document, de_ocr, motor))
+    _raporteaza_extractia(pagini)
+    return pagini
+
+
+def extract_text_from_pdf(path: str) -> str:
+    """Textul documentului, cu paginile unite în ordine (digital sau OCR, pe pagină)."""
+    return DocumentExtras(extrage_pagini(path)).text
@@ -0,0 +1,212 @@
+"""Etapele de analiză comune endpoint-urilor: extracție, chunk-uri (cu cache) și sinteză."""
+
+import asyncio
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from cache import CacheRezultate, get_cache
+from config import ADMITERE_ACTIVATA, ADMITERE_MAX_PAGINI_OCR
+from document import DocumentExtras
+from executie import ruleaza_blocant
+from metrici import CACHE, masoara
+from openai_client import (
+    PROMPT_VERSION_ANALIZA, PROMPT_VERSION_DOCUMENT, REZUMAT_ESUAT, analizeaza_chunkuri_pe_masura,
+    genereaza_sinteza_async, probleme_valide,
+)
+from pdf_processor import PreaMultePaginiOCR, extrage_pagini_async
+from prefiltru import prefiltreaza
+from schemas import AnalysisResponse
+from utils import Chunk, chunking_pe_buget
+
+# Etapele unei analize, în ordine; raportate prin callback-ul de progres
+ETAPE = ("extractie", "chunking", "analiza", "sinteza")
+
+
+async def extrage_document(temp_path: str) -> DocumentExtras:
+    """Extrage textul (digital sau OCR) pe pagini și transformă erorile în răspunsuri HTTP.
+
+    Doar pașii blocanți ocupă fire (vezi `extrage_pagini_async`). Textul complet e
+    `document.text`; paginile rămân adresabile prin pozițiile lor. Limita de pagini
+    OCR (vezi `admitere`) e verificată exact după clasificarea paginilor.
+    """
+    try:
+        with masoara("extractie"):
+            pagini = await extrage_pagini_async(
+                temp_path, max_pagini_ocr=ADMITERE_MAX_PAGINI_OCR if ADMITERE_ACTIVATA else None)
+            document = DocumentExtras(pagini)
+
+        if not document.text.strip():
+            raise HTTPException(status_code=400, detail="Fișierul PDF este gol sau complet ilizibil, chiar și după încercarea OCR.")
+
+    except HTTPException:
+        raise
+    except PreaMultePaginiOCR as e:
+        raise HTTPException(status_code=413, detail=(
+            f"Documentul are {e.pagini_ocr} pagini scanate; se pot analiza cel mult {e.limita} pagini scanate pe document."))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"A apărut o eroare la procesarea PDF: {str(e)}")
+
+    return document
+
+
+def rezultat_din_cache(hash_pdf: str) -> Optional[dict]:
+    """Același PDF a mai fost analizat: răspunsul complet vine direct din cache.
+
+    Ca toate accesele la cache, blochează (SQLite poate aștepta lock-ul de scriere al
+    altui proces): pe calea asincronă se apelează prin `ruleaza_blocant`.
+    """
+    cache = get_cache()
+    rezultat = cache.get(CacheRezultate.cheie_document(hash_pdf, PROMPT_VERSION_DOCUMENT)) if cache else None
+    if rezultat is not None:
+        # O intrare care nu (mai) respectă schema ar da 500 la fiecare reîncărcare, până la TTL
+        try:
+            AnalysisResponse.model_validate(rezultat)
+        except ValidationError:
+            print(f"--- [AVERTISMENT] Rezultat invalid în cache pentru {hash_pdf[:12]}; documentul e reanalizat. ---")
+            rezultat = None
+    if cache:
+        CACHE.inc(nivel="document", rezultat="hit" if rezultat is not None else "miss")
+    if rezultat is not None:
+        print(f"--- [INFO] Cache hit pentru documentul {hash_pdf[:12]}. ---")
+    return rezultat
+
+
+def salveaza_rezultat(hash_pdf: str, rezultat: dict, chunkuri_esuate: int) -> None:
+    # Un rezultat parțial (chunk-uri sau sinteză eșuate) nu trebuie servit din cache
+    cache = get_cache()
+    if cache and not chunkuri_esuate and rezultat["rezumat_executiv"] != REZUMAT_ESUAT:
+        cache.set(CacheRezultate.cheie_document(hash_pdf, PROMPT_VERSION_DOCUMENT), rezultat)
+
+
+async def aliniaza_citatele(
+    document: DocumentExtras, probleme_pe_chunk: List[Optional[List[dict]]], starturi: List[int],
+) -> List[List[dict]]:
+    """Problemele fiecărui chunk cu pozițiile și paginile citatelor (vezi `aliniere`).
+
+    `starturi[i]` e poziția chunk-ului `i` în text; citatele lui sunt căutate întâi
+    de acolo. Rulează pe executorul blocant.
+    """
+    def _aliniaza() -> List[List[dict]]:
+        with masoara("aliniere"):
+            return [document.aliniaza_probleme(probleme or [], start)
+                    for probleme, start in zip(probleme_pe_chunk, starturi)]
+
+    aliniate = await ruleaza_blocant(_aliniaza)
+    toate = [problema for probleme in aliniate for problema in probleme]
+    negasite = sum(1 for problema in toate if problema["potrivire_citat"] == "negasita")
+    if negasite:
+        print(f"--- [AVERTISMENT] {negasite} din {len(toate)} citate nu au fost găsite în text. ---")
+    return aliniate
+
+
+def verifica_chunkuri_esuate(chunkuri_esuate: int, total: int) -> None:
+    """Dacă niciun chunk n-a putut fi analizat, un rezultat „fără probleme” ar fi fals."""
+    if total and chunkuri_esuate == total:
+        raise HTTPException(status_code=503, detail="Serviciul de analiză este temporar indisponibil. Reîncearcă în câteva minute.")
+
+
+def pregateste_chunkuri(document: DocumentExtras) -> Tuple[List[Chunk], List[int], List[dict]]:
+    """Împarte textul în chunk-uri și aplică pre-filtrul local.
+
+    Întoarce toate chunk-urile, indicii celor de trimis la LLM și descrierea celor omise
+    (cu paginile pe care se întind). CPU pe tot textul: pe calea asincronă, prin `ruleaza_blocant`.
+    """
+    with masoara("chunking"):
+        chunkuri = chunking_pe_buget(document.text)
+        de_analizat, omise = prefiltreaza(chunkuri)
+    for omis in omise:
+        omis["pagini"] = document.pagini_intre(omis["start"], omis["end"])
+    return chunkuri, de_analizat, omise
+
+
+async def analizeaza_chunkuri_cu_cache_pe_masura(
+    chunkuri: List[str], semafor: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Tuple[int, Optional[List[dict]]]]:
+    """Ca `analizeaza_chunkuri_pe_masura`, dar refolosește rezultatele din cache pentru
+    chunk-urile deja văzute; doar cele noi ajung la OpenAI.
+
+    Chunk-urile din cache sunt produse primele; eșecurile (`None`) nu sunt puse în cache,
+    iar problemele care nu respectă `IssueItem` sunt eliminate înainte (vezi `probleme_valide`).
+    """
+    chei = [CacheRezultate.cheie_chunk(chunk, PROMPT_VERSION_ANALIZA) for chunk in chunkuri]
+    cache = get_cache()
+    gasite = await ruleaza_blocant(cache.get_many, chei) if cache else {}
+    lipsa = [i for i, cheie in enumerate(chei) if cheie not in gasite]
+    if cache:
+        CACHE.inc(len(gasite), nivel="chunk", rezultat="hit")
+        CACHE.inc(len(lipsa), nivel="chunk", rezultat="miss")
+    print(f"--- [INFO] Cache chunk-uri: {len(chunkuri) - len(lipsa)} găsite, {len(lipsa)} de analizat. ---")
+
+    for i, cheie in enumerate(chei):
+        if cheie in gasite:
+            yield i, probleme_valide(gasite[cheie])
+
+    async for j, probleme in analizeaza_chunkuri_pe_masura([chunkuri[i] for i in lipsa], semafor=semafor):
+        i = lipsa[j]
+        if probleme is not None and cache:
+            await ruleaza_blocant(cache.set, chei[i], probleme)
+        yield i, probleme
+
+
+async def analizeaza_document(
+    temp_path: str, hash_pdf: str, progres: Optional[Callable[[str, int, int], None]] = None
+) -> dict:
+    """Rulează pipeline-ul complet pentru un PDF salvat pe disc și întoarce `AnalysisResponse`.
+
+    `progres(etapa, facut, total)` este apelat la fiecare pas, pentru etapele din `ETAPE`.
+    """
+    def _progres(etapa: str, facut: int, total: int) -> None:
+        if progres:
+            progres(etapa, facut, total)
+
+    rezultat = await ruleaza_blocant(rezultat_din_cache, hash_pdf)
+    if rezultat is not None:
+        for etapa in ETAPE:
+            _progres(etapa, 1, 1)
+        return rezultat
+
+    # Extracția rulează pe executorul blocant, OCR-ul și apelurile OpenAI pe event loop
+    _progres("extractie", 0, 1)
+    document = await extrage_document(temp_path)
+    _progres("extractie", 1, 1)
+
+    chunkuri, de_analizat, omise = await ruleaza_blocant(pregateste_chunkuri, document)
+    _progres("chunking", 1, 1)
+
+    # Analiză: chunk-urile pleacă concurent, rezultatele revin în ordinea documentului
+    probleme_pe_chunk: List[List[dict]] = [[] for _ in de_analizat]
+    chunkuri_esuate = 0
+    facut = 0
+    _progres("analiza", 0, len(de_analizat))
+    async for i, probleme in analizeaza_chunkuri_cu_cache_pe_masura([chunkuri[i].text for i in de_analizat]):
+        facut += 1
+        if probleme is None:
+            chunkuri_esuate += 1
+        else:
+            probleme_pe_chunk[i] = probleme
+        _progres("analiza", facut, len(de_analizat))
+    verifica_chunkuri_esuate(chunkuri_esuate, len(de_analizat))
+    toate_problemele = [problem for probleme in probleme_pe_chunk for problem in probleme]
+
+    _progres("sinteza", 0, 1)
+    rezumat_final = await genereaza_sinteza_async(toate_problemele)
+    _progres("sinteza", 1, 1)
+    # După sinteză: pozițiile nu au ce căuta în promptul ei
+    aliniate = await aliniaza_citatele(document, probleme_pe_chunk, [chunkuri[i].start for i in de_analizat])
+    toate_problemele = [problema for probleme in aliniate for problema in probleme]
+
+    rezultat = {
+        "probleme_identificate": toate_problemele,
+        "rezumat_executiv": rezumat_final,
+        "text_original": document.text,
+        "inceput_pagini": document.inceput_pagini,
+        "chunkuri_esuate": chunkuri_esuate,
+        "chunkuri_omise": omise,
+    }
+    if chunkuri_esuate:
+        print(f"--- [EROARE] {chunkuri_esuate} din {len(de_analizat)} chunk-uri nu au putut fi analizate. ---")
+    await ruleaza_blocant(salveaza_rezultat, hash_pdf, rezultat, chunkuri_esuate)
+    return rezultat
+
@@ -0,0 +1,165 @@
+"""Pre-filtru local care decide ce chunk-uri merită trimise la LLM.
+
+Definițiile, identificarea părților sau blocurile de semnături nu produc probleme,
+dar costă fiecare un apel complet. Aici scorăm fiecare chunk cu un lexicon juridic
+românesc compilat (penalități, modificări unilaterale, date personale, reînnoire,
+jurisdicție...) plus câteva euristici, și trimitem mai departe doar chunk-urile
+cu scor peste `PREFILTRU_PRAG`. Textul e comparat fără diacritice și lowercase,
+ca să prindem și textele OCR sau scrise fără diacritice.
+
+Lexiconul e doar românesc: un chunk care nu e clar în română (engleză, bilingv, prea
+puțin text ca să decidem) e trimis mereu, oricât de mic i-ar fi scorul. O omisiune
+greșită înseamnă o problemă juridică ratată, deci pragul se alege după recall-ul
+măsurat pe un set etichetat (`benchmarks/bench_prefiltru.py`), nu după apelurile economisite.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+from config import PREFILTRU_ACTIVAT, PREFILTRU_PRAG
+from utils import Chunk
+
+# categorie -> (pondere, expresii); expresiile sunt scrise deja fără diacritice
+LEXICON_RISC: dict[str, tuple[float, list[str]]] = {
+    "penalitati": (1.5, [
+        r"penalit\w*", r"dobanzi? penalizatoare", r"daune[- ]interese", r"clauza penala",
+        r"despagubir\w*", r"majorari de intarziere",
+    ]),
+    "modificare_unilaterala": (1.5, [
+        r"modific\w* unilateral\w*", r"unilateral\w*", r"isi rezerva dreptul", r"poate modifica",
+        r"fara (acordul|consimtamantul) (clientului|utilizatorului|beneficiarului)",
+    ]),
+    "date_personale": (1.5, [
+        r"date(le)? (cu caracter )?personale", r"prelucr\w* (a |al )?datelor", r"terte? parti",
+        r"partener\w* comercial\w*", r"marketing", r"profilare", r"gdpr", r"cookie\w*",
+    ]),
+    "reinnoire": (1.2, [
+        r"reinno\w* automat\w*", r"prelung\w* automat\w*", r"tacita reconductiune", r"perioada minima",
+    ]),
+    "jurisdictie": (1.2, [
+        r"arbitraj\w*", r"instant\w* competent\w*", r"legea aplicabila", r"jurisdicti\w*",
+        r"renunt\w* la dreptul",
+    ]),
+    "limitare_raspundere": (1.5, [
+        r"limitat\w* la", r"nu (isi asuma|raspunde)", r"exonera\w*", r"raspunderea (totala|maxima)",
+        r"in nicio situatie",
+    ]),
+    "costuri": (1.0, [
+        r"tax\w* (de|suplimentar\w*)", r"comision\w*", r"cost\w* suplimentar\w*", r"tarif\w*",
+        r"indexa\w*",
+    ]),
+    "reziliere_suspendare": (1.2, [
+        r"rezili\w*", r"denunt\w*", r"suspend\w*", r"inceta\w*", r"preaviz",
+    ]),
+}
+
+# Expresii care arată discreție largă sau termene strânse, indiferent de categorie
+EURISTICI_RISC: list[tuple[float, str]] = [
+    (0.5, r"\boricand\b"),
+    (0.5, r"fara (preaviz|notificare|a preciza motivele)"),
+    (0.5, r"\d+(,\d+)?\s*%"),
+    (0.3, r"\b\d+\s*(de )?zile\b"),
+    (0.3, r"\bexclusiv\b"),
+]
+
+# Semnale de text „administrativ”: contează doar când nu există niciun semnal de risc
+LEXICON_STANDARD: list[str] = [
+    r"in sensul prezentului contract", r"denumit\w* in continuare", r"registrul comertului",
+    r"\bcui\b", r"cod fiscal", r"semnatur\w*", r"reprezentant legal", r"exemplare originale",
+    r"termenii de mai jos au urmatoarele intelesuri",
+]
+
+# Cuvinte de legătură frecvente (fără diacritice), după care recunoaștem limba unui chunk;
+# doar cuvinte care nu există în cealaltă limbă (ex. fără „are”, „in”)
+CUVINTE_ROMANA = frozenset(
+    "si sau este sunt care pentru prin din catre acesta aceasta acestuia prezentul prezentului "
+    "partile partilor orice fi va vor nu la cu pe de ale sale lui".split()
+)
+CUVINTE_ENGLEZA = frozenset(
+    "the and of to shall any this that with for by be is or not from which such will may "
+    "its their party parties agreement".split()
+)
+# Un chunk e „în română” dacă are cel puțin atâtea cuvinte românești de legătură și de
+# cel puțin RAPORT_ROMANA ori mai multe decât englezești
+MIN_CUVINTE_ROMANA = 3
+RAPORT_ROMANA = 4
+
+_PATTERN_CUVANT = re.compile(r"[a-z]+")
+_PATTERN_CATEGORII = {
+    categorie: (pondere, re.compile("|".join(f"(?:{e})" for e in expresii)))
+    for categorie, (pondere, expresii) in LEXICON_RISC.items()
+}
+_PATTERN_EURISTICI = [(pondere, re.compile(expresie)) for pondere, expresie in EURISTICI_RISC]
+_PATTERN_STANDARD = re.compile("|".join(f"(?:{e})" for e in LEXICON_STANDARD))
+
+
+@dataclass
+class ScorChunk:
+    scor: float
+    categorii: dict[str, int] = field(default_factory=dict)
+
+
+def normalizeaza(text: str) -> str:
+    """Lowercase și fără diacritice (inclusiv ș/ț cu sedilă)."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def este_in_romana(normalizat: str) -> bool:
+    """Limba lexiconului, pe textul deja normalizat; la dubiu (text scurt, bilingv) - nu."""
+    romana = engleza = 0
+    for cuvant in _PATTERN_CUVANT.findall(normalizat):
+        romana += cuvant in CUVINTE_ROMANA
+        engleza += cuvant in CUVINTE_ENGLEZA
+    return romana >= MIN_CUVINTE_ROMANA and romana >= RAPORT_ROMANA * engleza
+
+
+def scoreaza(text: str) -> ScorChunk:
+    return _scoreaza_normalizat(normalizeaza(text))
+
+
+def _scoreaza_normalizat(normalizat: str) -> ScorChunk:
+    categorii: dict[str, int] = {}
+    scor = 0.0
+    for categorie, (pondere, pattern) in _PATTERN_CATEGORII.items():
+        potriviri = len(pattern.findall(normalizat))
+        if potriviri:
+            categorii[categorie] = potriviri
+            # Repetițiile contează puțin: o categorie aduce cel mult dublul ponderii
+            scor += pondere * min(potriviri, 2)
+    if categorii:
+        scor += sum(pondere for pondere, pattern in _PATTERN_EURISTICI if pattern.search(normalizat))
+    else:
+        # Penalizarea textului administrativ nu se aplică niciodată lângă un termen de risc
+        scor -= 0.5 * len(_PATTERN_STANDARD.findall(normalizat))
+    return ScorChunk(round(scor, 2), categorii)
+
+
+def de_trimis(text: str, prag: float = PREFILTRU_PRAG) -> tuple[bool, ScorChunk]:
+    """Decizia pentru un chunk: trimis la LLM dacă nu e clar în română sau are scorul
+    cel puțin `prag`; orice termen din lexicon aduce cel puțin 1.0."""
+    normalizat = normalizeaza(text)
+    rezultat = _scoreaza_normalizat(normalizat)
+    return rezultat.scor >= prag or not este_in_romana(normalizat), rezultat
+
+
+def prefiltreaza(chunkuri: list[Chunk], prag: float = PREFILTRU_PRAG) -> tuple[list[int], list[dict]]:
+    """Întoarce indicii chunk-urilor de trimis la LLM și descrierea celor omise
+    (`start`, `end`, `scor`, `categorii`), în ordinea din document."""
+    if not PREFILTRU_ACTIVAT:
+        return list(range(len(chunkuri))), []
+    de_analizat, omise = [], []
+    for i, chunk in enumerate(chunkuri):
+        trimis, rezultat = de_trimis(chunk.text, prag)
+        if trimis:
+            de_analizat.append(i)
+        else:
+            omise.append({"start": chunk.start, "end": chunk.end, "scor": rezultat.scor, "categorii": rezultat.categorii})
+    if not de_analizat:
+        # Niciun semnal în tot documentul: cel mai probabil nu e limbajul lexiconului
+        # (ex. termeni în engleză), deci nu ne bazăm pe el
+        return list(range(len(chunkuri))), []
+    if omise:
+        print(f"--- [INFO] Pre-filtru: {len(omise)} din {len(chunkuri)} chunk-uri omise (fără semnale de risc). ---")
+    return de_analizat, omise
@@ -0,0 +1,61 @@
+"""Formatul compact al răspunsului de analiză (`?format=compact`).
+
+Formatul complet repetă textul: `text_original` conține tot documentul, iar fiecare
+problemă își copiază clauza în `clauza_originala`. Cel compact trimite textul o
+singură dată (sau deloc, dacă clientul îl ia separat prin `GET /texte/{text_id}`),
+iar problemele indică clauza prin pozițiile `start`/`end` în text, calculate de
+`aliniere`. Citatele care nu pot fi găsite în text își păstrează `clauza_originala`,
+ca să nu se piardă nimic.
+"""
+
+from typing import Optional
+
+from aliniere import IndexCitate, aliniaza_probleme
+from cache import CacheRezultate, get_cache, hash_continut
+
+FORMATE_RASPUNS = ("complet", "compact")
+
+
+def salveaza_text(text: str) -> str:
+    """Pune textul în cache sub hash-ul lui și întoarce `text_id`-ul."""
+    text_id = hash_continut(text)
+    cache = get_cache()
+    if cache and not cache.contine(CacheRezultate.cheie_text(text_id)):
+        cache.set(CacheRezultate.cheie_text(text_id), text)
+    return text_id
+
+
+def text_dupa_id(text_id: str) -> Optional[str]:
+    cache = get_cache()
+    return cache.get(CacheRezultate.cheie_text(text_id)) if cache else None
+
+
+def raspuns_compact(rezultat: dict, text_separat: bool = False) -> dict:
+    """Transformă un `AnalysisResponse` în `CompactAnalysisResponse`.
+
+    Cu `text_separat`, textul nu e inclus și trebuie cerut la `/texte/{text_id}`;
+    fără cache textul nu poate fi servit separat, așa că rămâne în răspuns.
+    """
+    text = rezultat["text_original"]
+    probleme = rezultat["probleme_identificate"]
+    # Rezultatele din cache de dinaintea alinierii nu au pozițiile; se calculează acum
+    if any("potrivire_citat" not in problema for problema in probleme):
+        probleme = aliniaza_probleme(IndexCitate(text), probleme)
+    compacte = []
+    for problema in probleme:
+        compacta = {cheie: valoare for cheie, valoare in problema.items() if cheie != "clauza_originala"}
+        if problema.get("start") is None:
+            compacta["clauza_originala"] = problema.get("clauza_originala", "")
+        compacte.append(compacta)
+
+    text_id = salveaza_text(text) if text_separat else hash_continut(text)
+    return {
+        "probleme_identificate": compacte,
+        "rezumat_executiv": rezultat["rezumat_executiv"],
+        "text_id": text_id,
+        "lungime_text": len(text),
+        "text_original": None if text_separat and get_cache() else text,
+        "inceput_pagini": rezultat.get("inceput_pagini", []),
+        "chunkuri_esuate": rezultat.get("chunkuri_esuate", 0),
+        "chunkuri_omise": rezultat.get("chunkuri_omise", []),
+    }
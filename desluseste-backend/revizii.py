@@ -0,0 +1,250 @@
+"""Re-analiză incrementală a reviziilor aceluiași contract.
+
+În negocieri, utilizatorii încarcă v2, v3... ale aceluiași document. Fiecare
+revizie e împărțită în clauze cu `chunking_inteligent_regex` și aliniată cu
+revizia precedentă a lui `document_id` (difflib pe hash-urile clauzelor):
+- clauzele neschimbate își refolosesc problemele salvate;
+- doar clauzele adăugate sau modificate ajung la LLM;
+- problemele clauzelor modificate sau șterse care nu mai apar sunt „rezolvate”,
+  iar cele noi din clauzele re-analizate sunt „adăugate”. O problemă e identificată
+  prin amprenta citatului ei (textul din contract, nu titlul scris de LLM, care
+  diferă de la o rulare la alta) și categorie.
+
+Astfel numărul de apeluri crește cu mărimea modificării, nu a documentului.
+Starea reviziilor stă în cache-ul SQLite (`rev:<versiune prompt>:<document_id>`);
+fără cache fiecare revizie e analizată ca prima. `document_id` e emis de server la
+prima revizie (uuid4, 32 de caractere hex), ca un client să nu poată ghici sau
+refolosi id-ul altui utilizator; un id necunoscut dă 404.
+
+Reviziile aceluiași `document_id` sunt serializate în worker (a doua se compară cu
+rezultatul primei); între workeri, starea e scrisă doar dacă nu s-a schimbat de la
+citire, altfel revizia primește 409 și poate fi retrimisă.
+"""
+
+import asyncio
+import difflib
+import re
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from cache import CacheRezultate, get_cache, hash_continut
+from executie import ruleaza_blocant
+from openai_client import PROMPT_VERSION_ANALIZA, REZUMAT_ESUAT, genereaza_sinteza_async
+from pipeline import (
+    aliniaza_citatele, analizeaza_chunkuri_cu_cache_pe_masura, extrage_document, verifica_chunkuri_esuate,
+)
+from prefiltru import prefiltreaza
+from utils import Chunk, chunking_inteligent_regex
+
+# Forma id-urilor emise de `analizeaza_revizie` (`uuid.uuid4().hex`)
+PATTERN_DOCUMENT_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def _normalizeaza(text: str) -> str:
+    # Diferențele de spații (extracție, OCR, reformatare) nu sunt modificări de conținut
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# Numărul articolului nu face parte din conținut: o clauză inserată sau ștearsă
+# renumerotează tot ce urmează, fără ca restul clauzelor să se schimbe
+_PREFIX_NUMEROTARE = re.compile(r"^(?:Art\.|Articolul)\s*\d+\s*[.:\-–]?\s*", re.IGNORECASE)
+
+
+def amprenta_clauza(text: str) -> str:
+    """Hash-ul folosit la aliniere: fără numerotare și fără diferențe de spații."""
+    return hash_continut(_PREFIX_NUMEROTARE.sub("", _normalizeaza(text)))
+
+
+def _cheie_problema(problema: dict, amprenta_clauzei: str) -> Tuple[str, str]:
+    """Identitatea unei probleme între revizii: amprenta citatului și categoria.
+
+    Fără citat, problema ține de clauza în care a fost găsită (`amprenta_clauzei`).
+    """
+    citat = problema.get("clauza_originala") or ""
+    return (amprenta_clauza(citat) if citat.strip() else amprenta_clauzei,
+            _normalizeaza(problema.get("categorie_problema", "")).lower())
+
+
+# Câte revizii ale fiecărui document rulează sau așteaptă în worker, cu lock-ul lor
+_blocari: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+
+@asynccontextmanager
+async def _blocare_document(document_id: str) -> AsyncIterator[None]:
+    blocare, utilizari = _blocari.get(document_id, (asyncio.Lock(), 0))
+    _blocari[document_id] = (blocare, utilizari + 1)
+    try:
+        async with blocare:
+            yield
+    finally:
+        blocare, utilizari = _blocari[document_id]
+        if utilizari == 1:
+            del _blocari[document_id]
+        else:
+            _blocari[document_id] = (blocare, utilizari - 1)
+
+
+def clauze_cu_pozitii(text_document: str) -> List[Chunk]:
+    """Clauzele din `chunking_inteligent_regex`, cu pozițiile lor în text."""
+    clauze, cursor = [], 0
+    for clauza in chunking_inteligent_regex(text_document):
+        start = text_document.find(clauza, cursor)
+        if start < 0:
+            start = cursor
+        clauze.append(Chunk(clauza, start, start + len(clauza)))
+        cursor = start + len(clauza)
+    return clauze
+
+
+def _clauze_si_amprente(text_document: str) -> Tuple[List[Chunk], List[str]]:
+    clauze = clauze_cu_pozitii(text_document)
+    return clauze, [amprenta_clauza(clauza.text) for clauza in clauze]
+
+
+def aliniaza_clauze(hash_vechi: List[str], hash_noi: List[str]) -> Tuple[Dict[int, int], List[int], List[int]]:
+    """Aliniază clauzele noi cu cele vechi.
+
+    Întoarce maparea clauză nouă -> clauză veche neschimbată, indicii clauzelor noi
+    (adăugate sau modificate) și indicii clauzelor vechi dispărute (șterse sau modificate).
+    """
+    potrivire = difflib.SequenceMatcher(a=hash_vechi, b=hash_noi, autojunk=False)
+    neschimbate: Dict[int, int] = {}
+    noi: List[int] = []
+    disparute: List[int] = []
+    for operatie, a1, a2, b1, b2 in potrivire.get_opcodes():
+        if operatie == "equal":
+            neschimbate.update(zip(range(b1, b2), range(a1, a2)))
+        else:
+            noi.extend(range(b1, b2))
+            disparute.extend(range(a1, a2))
+    return neschimbate, noi, disparute
+
+
+def _stare_revizie(document_id: str) -> Optional[dict]:
+    cache = get_cache()
+    return cache.get(CacheRezultate.cheie_revizie(document_id, PROMPT_VERSION_ANALIZA)) if cache else None
+
+
+async def analizeaza_revizie(
+    temp_path: str, document_id: Optional[str] = None,
+    progres: Optional[Callable[[str, int, int], None]] = None,
+) -> dict:
+    """Analizează o revizie a documentului `document_id` (sau un document nou, dacă lipsește).
+
+    `document_id` trebuie să fie unul întors de o analiză anterioară; altfel 404.
+
+    Întoarce un `RevisionResponse`: rezultatul complet al reviziei, plus diferențele
+    de probleme față de revizia precedentă și statistica clauzelor.
+    """
+    if document_id is None:
+        return await _analizeaza_revizie(temp_path, None, progres)
+    async with _blocare_document(document_id):
+        return await _analizeaza_revizie(temp_path, document_id, progres)
+
+
+async def _analizeaza_revizie(
+    temp_path: str, document_id: Optional[str], progres: Optional[Callable[[str, int, int], None]],
+) -> dict:
+    def _progres(etapa: str, facut: int, total: int) -> None:
+        if progres:
+            progres(etapa, facut, total)
+
+    cache = get_cache()
+    anterioara = await ruleaza_blocant(_stare_revizie, document_id) if document_id else None
+    if cache is None:
+        print("--- [AVERTISMENT] Cache dezactivat: reviziile nu pot fi comparate, documentul e analizat complet. ---")
+    elif document_id and anterioara is None:
+        raise HTTPException(status_code=404, detail=(
+            "Documentul nu a fost găsit (id necunoscut sau expirat). Încarcă-l fără document_id pentru o analiză nouă."))
+    document_id = document_id or uuid.uuid4().hex
+
+    _progres("extractie", 0, 1)
+    document = await extrage_document(temp_path)
+    text_document = document.text
+    _progres("extractie", 1, 1)
+
+    clauze, hash_noi = await ruleaza_blocant(_clauze_si_amprente, text_document)
+    clauze_vechi = anterioara["clauze"] if anterioara else []
+    neschimbate, noi, disparute = aliniaza_clauze([c["hash"] for c in clauze_vechi], hash_noi)
+    # Clauzele neschimbate a căror analiză eșuase data trecută sunt reîncercate
+    for i, j in list(neschimbate.items()):
+        if clauze_vechi[j]["probleme"] is None:
+            del neschimbate[i]
+            noi.append(i)
+    noi.sort()
+    _progres("chunking", 1, 1)
+
+    # Pre-filtrul se aplică doar clauzelor de trimis; indicii lui sunt relativi la `noi`
+    de_analizat_relativ, omise = await ruleaza_blocant(prefiltreaza, [clauze[i] for i in noi])
+    for omis in omise:
+        omis["pagini"] = document.pagini_intre(omis["start"], omis["end"])
+    de_analizat = [noi[k] for k in de_analizat_relativ]
+    probleme_pe_clauza: List[Optional[List[dict]]] = [None] * len(clauze)
+    for i, j in neschimbate.items():
+        probleme_pe_clauza[i] = clauze_vechi[j]["probleme"]
+    for i in set(noi) - set(de_analizat):
+        probleme_pe_clauza[i] = []
+    print(f"--- [INFO] Revizie {document_id[:12]}: {len(neschimbate)} clauze neschimbate, "
+          f"{len(noi)} noi sau modificate ({len(de_analizat)} trimise la LLM), {len(disparute)} eliminate. ---")
+
+    chunkuri_esuate = 0
+    facut = 0
+    _progres("analiza", 0, len(de_analizat))
+    async for k, probleme in analizeaza_chunkuri_cu_cache_pe_masura([clauze[i].text for i in de_analizat]):
+        facut += 1
+        if probleme is None:
+            chunkuri_esuate += 1
+        probleme_pe_clauza[de_analizat[k]] = probleme
+        _progres("analiza", facut, len(de_analizat))
+    verifica_chunkuri_esuate(chunkuri_esuate, len(de_analizat))
+
+    toate_problemele = [problema for probleme in probleme_pe_clauza for problema in probleme or []]
+    chei_reanalizate = {_cheie_problema(p, hash_noi[i]) for i in noi for p in probleme_pe_clauza[i] or []}
+    chei_disparute = {_cheie_problema(p, clauze_vechi[j]["hash"])
+                      for j in disparute for p in clauze_vechi[j]["probleme"] or []}
+    probleme_rezolvate = [p for j in disparute for p in clauze_vechi[j]["probleme"] or []
+                          if _cheie_problema(p, clauze_vechi[j]["hash"]) not in chei_reanalizate]
+
+    _progres("sinteza", 0, 1)
+    if anterioara and not noi and not disparute and anterioara["rezumat_executiv"] != REZUMAT_ESUAT:
+        rezumat_final = anterioara["rezumat_executiv"]
+    else:
+        rezumat_final = await genereaza_sinteza_async(toate_problemele)
+    _progres("sinteza", 1, 1)
+
+    # Pozițiile sunt față de textul acestei revizii; starea clauzelor păstrează
+    # problemele fără ele, pentru că o revizie viitoare le va alinia din nou
+    aliniate = await aliniaza_citatele(document, probleme_pe_clauza, [clauza.start for clauza in clauze])
+    toate_problemele = [problema for probleme in aliniate for problema in probleme]
+    probleme_adaugate = [p for i in noi for p in aliniate[i] if _cheie_problema(p, hash_noi[i]) not in chei_disparute]
+
+    revizie = anterioara["revizie"] + 1 if anterioara else 1
+    if cache and not await ruleaza_blocant(
+            cache.set_daca_neschimbat, CacheRezultate.cheie_revizie(document_id, PROMPT_VERSION_ANALIZA), {
+                "revizie": revizie,
+                "rezumat_executiv": rezumat_final,
+                "clauze": [{"hash": h, "probleme": p} for h, p in zip(hash_noi, probleme_pe_clauza)],
+            }, anterioara):
+        # Alt worker a salvat între timp o revizie a aceluiași document
+        raise HTTPException(status_code=409, detail=(
+            "Documentul a primit între timp o altă revizie. Retrimite revizia pentru a o compara cu cea nouă."))
+
+    return {
+        "probleme_identificate": toate_problemele,
+        "rezumat_executiv": rezumat_final,
+        "text_original": text_document,
+        "inceput_pagini": document.inceput_pagini,
+        "chunkuri_esuate": chunkuri_esuate,
+        "chunkuri_omise": omise,
+        "document_id": document_id,
+        "revizie": revizie,
+        "probleme_adaugate": probleme_adaugate,
+        "probleme_rezolvate": probleme_rezolvate,
+        "clauze_neschimbate": len(neschimbate),
+        "clauze_modificate": len(noi),
+        "clauze_reanalizate": len(de_analizat),
+        "clauze_eliminate": len(disparute),
+    }
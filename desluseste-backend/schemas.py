@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 
 
 class IssueItem(BaseModel):
@@ -9,9 +9,116 @@ class IssueItem(BaseModel):
     explicatie_simpla: str
     nivel_atentie: str
     sugestie: str
+    # Locul citatului în `text_original` (`text_original[start:end]`), găsit de
+    # `aliniere`: "exacta", "aproximativa" sau "negasita" (fără start/end)
+    start: Optional[int] = None
+    end: Optional[int] = None
+    potrivire_citat: Optional[str] = None
+    # Pagina (de la 1) pe care începe citatul
+    pagina: Optional[int] = None
+
+
+class ChunkOmis(BaseModel):
+    """Chunk pe care pre-filtrul local nu l-a trimis la LLM."""
+    start: int
+    end: int
+    scor: float
+    categorii: Dict[str, int] = {}
+    pagini: List[int] = []
 
 
 class AnalysisResponse(BaseModel):
     probleme_identificate: List[IssueItem]
     rezumat_executiv: str
     text_original: str
+    # Poziția în `text_original` la care începe fiecare pagină a PDF-ului
+    inceput_pagini: List[int] = []
+    # Chunk-uri a căror analiză a eșuat definitiv (după reîncercări); problemele
+    # lor lipsesc din listă, deci rezultatul e incomplet dacă e > 0
+    chunkuri_esuate: int = 0
+    chunkuri_omise: List[ChunkOmis] = []
+
+
+class IssueItemCompact(BaseModel):
+    """Problemă în formatul compact: clauza e indicată prin pozițiile ei în text."""
+    titlu_problema: str
+    categorie_problema: str
+    explicatie_simpla: str
+    nivel_atentie: str
+    sugestie: str
+    start: Optional[int] = None
+    end: Optional[int] = None
+    potrivire_citat: Optional[str] = None
+    pagina: Optional[int] = None
+    # Doar pentru citatele care nu au putut fi găsite în text
+    clauza_originala: Optional[str] = None
+
+
+class CompactAnalysisResponse(BaseModel):
+    """`AnalysisResponse` fără text duplicat: textul apare o singură dată (sau deloc,
+    dacă e cerut separat la `/texte/{text_id}`)."""
+    probleme_identificate: List[IssueItemCompact]
+    rezumat_executiv: str
+    text_id: str
+    lungime_text: int
+    text_original: Optional[str] = None
+    inceput_pagini: List[int] = []
+    chunkuri_esuate: int = 0
+    chunkuri_omise: List[ChunkOmis] = []
+
+
+class RevisionResponse(AnalysisResponse):
+    """Analiza unei revizii: rezultatul complet plus diferențele față de revizia precedentă."""
+    document_id: str
+    revizie: int
+    probleme_adaugate: List[IssueItem] = []
+    probleme_rezolvate: List[IssueItem] = []
+    clauze_neschimbate: int = 0
+    clauze_modificate: int = 0
+    clauze_eliminate: int = 0
+    # Câte dintre clauzele modificate au trecut de pre-filtru și au mers la LLM
+    clauze_reanalizate: int = 0
+
+
+class DocumentLotResponse(BaseModel):
+    nume_fisier: str
+    hash_pdf: str
+    stare: str  # 'finalizat', 'esuat'
+    # Numele primului fișier identic din lot, al cărui rezultat a fost refolosit
+    duplicat_al: Optional[str] = None
+    din_cache: bool = False
+    cod_eroare: Optional[int] = None
+    eroare: Optional[str] = None
+    rezultat: Optional[AnalysisResponse] = None
+
+
+class SumarLot(BaseModel):
+    documente: int
+    documente_unice: int
+    documente_duplicate: int
+    documente_din_cache: int
+    documente_esuate: int
+    chunkuri_total: int
+    chunkuri_unice: int
+    probleme_total: int
+    probleme_pe_nivel: Dict[str, int] = {}
+    durata_secunde: float
+
+
+class BatchResponse(BaseModel):
+    documente: List[DocumentLotResponse]
+    sumar: SumarLot
+
+
+class EtapaJob(BaseModel):
+    nume: str
+    stare: str  # 'in_asteptare', 'in_lucru', 'finalizat'
+    progres: int
+    total: int
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    stare: str  # 'in_asteptare', 'in_lucru', 'finalizat', 'esuat'
+    etape: List[EtapaJob]
+    eroare: Optional[str] = None
@@ -0,0 +1,55 @@
+"""Mediul comun al testelor: fără cache pe disc, fără încălzire, extracția în proces.
+
+Variabilele sunt setate înainte ca modulele aplicației să citească `config`;
+`load_dotenv` nu suprascrie ce există deja în mediu.
+"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["CACHE_PATH"] = ""
+os.environ["INCALZIRE_ACTIVATA"] = "0"
+os.environ["EXTRACTIE_PROCESE"] = "1"
+
+import pytest  # noqa: E402
+
+from benchmarks.mock_openai import SetariMock, porneste_in_fundal  # noqa: E402
+
+
+@pytest.fixture
+def mock_openai():
+    """Pornește câte un `benchmarks/mock_openai.py` nou; întoarce `(mock, base_url)`."""
+    def _porneste(**setari):
+        setari.setdefault("latenta", 0.01)
+        setari.setdefault("jitter", 0.0)
+        return porneste_in_fundal(SetariMock(**setari))
+    return _porneste
+
+
+@pytest.fixture
+def openai_local(mock_openai, monkeypatch):
+    """Îndreaptă clientul partajat al aplicației spre un mock nou; întoarce mock-ul."""
+    from http_client import client_openai
+
+    mock, base_url = mock_openai()
+    monkeypatch.setattr(client_openai, "base_url", base_url)
+    monkeypatch.setattr(client_openai, "url_chat", base_url + "/chat/completions")
+    return mock
+
+
+@pytest.fixture
+def pdf_contract_digital():
+    """Un contract generat (12 articole), ca PDF digital."""
+    from benchmarks.corpus import genereaza_contract, pdf_contract
+
+    return pdf_contract(genereaza_contract(0, 12), "digital")
+
+
+@pytest.fixture
+def cache_temporar(tmp_path, monkeypatch):
+    """Un cache SQLite nou, într-un director temporar, folosit ca cache al procesului."""
+    import cache
+
+    instanta = cache.CacheRezultate(str(tmp_path / "cache.sqlite3"), 10 * 1024 * 1024, 3600, interval_evictie=0)
+    monkeypatch.setattr(cache, "_cache", instanta)
+    return instanta
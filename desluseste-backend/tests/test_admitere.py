@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import admitere
+from admitere import BugetConcurenta, BugetOcupat, EstimareCost
+from benchmarks.corpus import genereaza_contract, pdf_contract
+from config import ADMITERE_MAX_PAGINI, ADMITERE_MAX_PAGINI_OCR
+
+
+@pytest.mark.parametrize("pagini_ocr", [0, ADMITERE_MAX_PAGINI_OCR // 2, ADMITERE_MAX_PAGINI_OCR])
+def test_documentul_cu_numarul_maxim_de_pagini_dense_e_admis(pagini_ocr):
+    caractere = (ADMITERE_MAX_PAGINI - pagini_ocr) * admitere.CARACTERE_PAGINA_DENSA
+    tokeni = admitere.tokeni_estimati(caractere, pagini_ocr)
+    admitere.verifica_limite(EstimareCost(ADMITERE_MAX_PAGINI, pagini_ocr, tokeni, 32))
+
+
+def test_peste_limita_de_pagini_413():
+    with pytest.raises(HTTPException) as e:
+        admitere.verifica_limite(EstimareCost(ADMITERE_MAX_PAGINI + 1, 0, 1000, 32))
+    assert e.value.status_code == 413 and str(ADMITERE_MAX_PAGINI) in e.value.detail
+
+
+def test_densitate_anormala_413():
+    with pytest.raises(HTTPException) as e:
+        admitere.verifica_limite(EstimareCost(10, 0, admitere.MAX_TOKENI + 1, 10))
+    assert e.value.status_code == 413
+
+
+@pytest.mark.parametrize("tip, scanate", [("digital", False), ("scanat", True)])
+def test_estimeaza_cost(tmp_path, tip, scanate):
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(pdf_contract(genereaza_contract(0, 12), tip, articole_pe_pagina=4))
+    estimare = admitere.estimeaza_cost(str(path))
+    assert estimare.pagini == 3 and estimare.pagini_ocr == (3 if scanate else 0)
+    assert estimare.tokeni >= admitere.TOKENI_APEL_ANALIZA + admitere.TOKENI_SINTEZA
+
+
+def test_documentele_mici_nu_asteapta_dupa_cele_mari():
+    async def scenariu():
+        buget = BugetConcurenta(capacitate=100, prag_mare=40, proportie_mari=0.5, max_asteptare=4)
+        mare = await buget.rezerva(50, timeout=None)
+        # Al doilea mare nu mai încape în partea lui de buget și așteaptă
+        asteapta = asyncio.ensure_future(buget.rezerva(50, timeout=None))
+        await asyncio.sleep(0)
+        mic = await buget.rezerva(30, timeout=0.1)
+        assert not asteapta.done()
+        mare.elibereaza()
+        al_doilea = await asyncio.wait_for(asteapta, 1)
+        with pytest.raises(BugetOcupat):
+            await buget.rezerva(30, timeout=0.05)
+        mic.elibereaza()
+        al_doilea.elibereaza()
+        assert buget.folosit == 0 and buget.folosit_mari == 0
+
+    asyncio.run(scenariu())
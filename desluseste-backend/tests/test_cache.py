@@ -0,0 +1,84 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import cache
+import pipeline
+from cache import CacheRezultate
+
+DIRECTOR_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REZULTAT = {
+    "probleme_identificate": [{
+        "titlu_problema": "T", "clauza_originala": "C", "categorie_problema": "Costuri",
+        "explicatie_simpla": "E", "nivel_atentie": "Mediu", "sugestie": "S",
+    }],
+    "rezumat_executiv": "Rezumat.",
+    "text_original": "Articolul 1. Text.",
+}
+
+
+def test_importul_nu_creeaza_cache_pe_disc(tmp_path):
+    mediu = {k: v for k, v in os.environ.items() if k != "CACHE_PATH"}
+    mediu["PYTHONPATH"] = DIRECTOR_BACKEND
+    subprocess.run([sys.executable, "-c", "import main, batch_offline"], cwd=tmp_path, env=mediu, check=True,
+                   capture_output=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_fara_cache_path_nu_exista_cache():
+    assert cache.get_cache() is None
+
+
+def test_get_set_si_contine(tmp_path):
+    c = CacheRezultate(str(tmp_path / "c.sqlite3"), 1024 * 1024, 3600)
+    assert c.get("a") is None and not c.contine("a")
+    c.set_many({"a": [1, 2], "b": {"x": "ș"}})
+    assert c.get_many(["a", "b", "lipsa"]) == {"a": [1, 2], "b": {"x": "ș"}}
+    assert c.contine("b")
+
+
+def test_intrarile_expirate_sunt_ignorate(tmp_path):
+    c = CacheRezultate(str(tmp_path / "c.sqlite3"), 1024 * 1024, ttl_secunde=0.05)
+    c.set("a", 1)
+    c._conn.execute("UPDATE intrari SET creat = creat - 1")
+    assert c.get("a") is None and not c.contine("a")
+
+
+def test_evictia_pastreaza_intrarile_accesate_recent(tmp_path):
+    c = CacheRezultate(str(tmp_path / "c.sqlite3"), max_bytes=250, ttl_secunde=3600, interval_evictie=0)
+    c.set("vechi", "x" * 100)
+    c.set("folosit", "y" * 100)
+    c._conn.execute("UPDATE intrari SET accesat = accesat - 10")
+    c.get("folosit")
+    c.set("nou", "z" * 100)
+    assert set(c.get_many(["vechi", "folosit", "nou"])) == {"folosit", "nou"}
+
+
+def test_rezultatul_documentului_hit_si_miss(cache_temporar):
+    assert pipeline.rezultat_din_cache("h1") is None
+    pipeline.salveaza_rezultat("h1", REZULTAT, chunkuri_esuate=0)
+    assert pipeline.rezultat_din_cache("h1") == REZULTAT
+    # Un rezultat parțial nu e păstrat
+    pipeline.salveaza_rezultat("h2", REZULTAT, chunkuri_esuate=1)
+    assert pipeline.rezultat_din_cache("h2") is None
+
+
+def test_rezultatul_invalid_din_cache_e_miss(cache_temporar):
+    cheie = CacheRezultate.cheie_document("h3", pipeline.PROMPT_VERSION_DOCUMENT)
+    cache_temporar.set(cheie, {"rezumat_executiv": "fără probleme și text"})
+    assert pipeline.rezultat_din_cache("h3") is None
+
+
+def test_chunkurile_din_cache_nu_mai_ajung_la_openai(cache_temporar, openai_local):
+    chunkuri = [f"Articolul {i}. Prestatorul poate modifica unilateral tarifele." for i in range(4)]
+
+    async def analizeaza(texte):
+        return dict([rezultat async for rezultat in pipeline.analizeaza_chunkuri_cu_cache_pe_masura(texte)])
+
+    prima = asyncio.run(analizeaza(chunkuri))
+    assert openai_local.stats.apeluri == 4 and all(prima[i] for i in range(4))
+    a_doua = asyncio.run(analizeaza(chunkuri + ["Articolul 9. Alt text."]))
+    assert openai_local.stats.apeluri == 5
+    assert [a_doua[i] for i in range(4)] == [prima[i] for i in range(4)]
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+import http_client
+from http_client import CircuitBreaker, CircuitDeschis, ClientOpenAI, EroareOpenAI, LimitatorRata
+
+PAYLOAD = {
+    "model": "gpt-4o-mini",
+    "messages": [{"role": "user", "content": "Articolul 1. Text."}],
+    "response_format": {"type": "json_object"},
+}
+
+
+def _client(base_url: str, prag: int = 5, max_reincercari: int = 3) -> ClientOpenAI:
+    return ClientOpenAI(base_url, "test", max_reincercari, 16, LimitatorRata(100000, 10 ** 9),
+                        CircuitBreaker(prag, 30))
+
+
+async def _trimite(client: ClientOpenAI, numar: int) -> list:
+    try:
+        return await asyncio.gather(*(client.post_async(PAYLOAD) for _ in range(numar)), return_exceptions=True)
+    finally:
+        await client.inchide()
+
+
+def test_rafala_429_nu_deschide_circuitul(mock_openai):
+    mock, base_url = mock_openai(primele_limitate=8, retry_after=0.1)
+    client = _client(base_url)
+    rezultate = asyncio.run(_trimite(client, 8))
+    assert all(isinstance(r, dict) for r in rezultate), rezultate
+    assert client.circuit._deschis_la is None
+    assert mock.stats.limitate == 8 and mock.stats.reusite == 8
+
+
+def test_rafala_429_sincron(mock_openai):
+    mock, base_url = mock_openai(primele_limitate=3, retry_after=0.05)
+    client = _client(base_url)
+    for _ in range(3):
+        assert client.post(PAYLOAD)["choices"]
+    assert client.circuit._deschis_la is None and mock.stats.apeluri == 6
+
+
+def test_erorile_5xx_deschid_circuitul(mock_openai, monkeypatch):
+    monkeypatch.setattr(http_client, "calculeaza_asteptare", lambda retry_after, incercare: 0.0)
+    mock, base_url = mock_openai(rata_erori=1.0, latenta=0.0)
+    client = _client(base_url, prag=3, max_reincercari=10)
+    rezultat, = asyncio.run(_trimite(client, 1))
+    assert isinstance(rezultat, CircuitDeschis)
+    assert mock.stats.apeluri == 3
+
+
+def test_retry_after_peste_limita_esueaza_fara_circuit(mock_openai):
+    mock, base_url = mock_openai(primele_limitate=1, retry_after=3600)
+    client = _client(base_url)
+    rezultat, = asyncio.run(_trimite(client, 1))
+    assert isinstance(rezultat, EroareOpenAI) and rezultat.status == 429
+    assert client.circuit._deschis_la is None
+
+
+@pytest.mark.parametrize("retry_after, asteptare", [("2", 2.0), ("0", 0.0)])
+def test_calculeaza_asteptare_respecta_retry_after(retry_after, asteptare):
+    assert http_client.calculeaza_asteptare(retry_after, 3) == asteptare
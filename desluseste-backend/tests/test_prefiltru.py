@@ -0,0 +1,72 @@
+import pytest
+
+import prefiltru
+from benchmarks.bench_prefiltru import chunkuri_articole, etichete_corpus
+from benchmarks.corpus import genereaza_contract
+from utils import Chunk
+
+ADMINISTRATIV = ("Prezentul contract se încheie între SC Exemplu SRL, înregistrată la Registrul Comerțului, "
+                 "CUI RO123, denumită în continuare Prestatorul, și Clientul, prin reprezentant legal.")
+RISC = "Prestatorul își rezervă dreptul de a modifica unilateral tarifele, cu notificarea Clientului."
+ENGLEZA_FARA_LEXICON = ("The Provider may amend the fees and these terms at any time, at its sole discretion, "
+                        "by posting the new version on its website.")
+ENGLEZA_CU_LEXICON = "The Customer's data may be used for marketing purposes and shared with GDPR processors."
+
+
+def _chunkuri(*texte: str) -> list:
+    chunkuri, start = [], 0
+    for text in texte:
+        chunkuri.append(Chunk(text, start, start + len(text)))
+        start += len(text) + 1
+    return chunkuri
+
+
+@pytest.fixture
+def activat(monkeypatch):
+    monkeypatch.setattr(prefiltru, "PREFILTRU_ACTIVAT", True)
+
+
+def test_dezactivat_implicit_trimite_tot(monkeypatch):
+    monkeypatch.setattr(prefiltru, "PREFILTRU_ACTIVAT", False)
+    assert prefiltru.prefiltreaza(_chunkuri(ADMINISTRATIV, RISC)) == ([0, 1], [])
+
+
+def test_omite_doar_textul_administrativ(activat):
+    de_analizat, omise = prefiltru.prefiltreaza(_chunkuri(ADMINISTRATIV, RISC))
+    assert de_analizat == [1]
+    assert omise[0]["start"] == 0 and omise[0]["categorii"] == {}
+
+
+def test_fara_semnale_in_tot_documentul_trimite_tot(activat):
+    assert prefiltru.prefiltreaza(_chunkuri(ADMINISTRATIV, ADMINISTRATIV)) == ([0, 1], [])
+
+
+def test_chunkurile_in_engleza_nu_sunt_omise(activat):
+    # Un singur chunk englezesc cu termeni din lexicon nu trebuie să le scoată pe celelalte
+    de_analizat, omise = prefiltru.prefiltreaza(_chunkuri(ENGLEZA_CU_LEXICON, ENGLEZA_FARA_LEXICON, ADMINISTRATIV))
+    assert de_analizat == [0, 1] and len(omise) == 1
+
+
+def test_termenul_de_risc_nu_e_anulat_de_textul_administrativ():
+    trimis, rezultat = prefiltru.de_trimis(ADMINISTRATIV + " Se aplică un comision de 2%.")
+    assert trimis and rezultat.categorii == {"costuri": 1}
+
+
+@pytest.mark.parametrize("text, romana", [
+    (ADMINISTRATIV, True), (ENGLEZA_FARA_LEXICON, False), ("Semnătura", False),
+    (RISC + " " + ENGLEZA_FARA_LEXICON, False),
+])
+def test_este_in_romana(text, romana):
+    assert prefiltru.este_in_romana(prefiltru.normalizeaza(text)) == romana
+
+
+@pytest.mark.parametrize("proportie_engleza", [0.0, 0.3])
+def test_recall_complet_pe_corpusul_etichetat(proportie_engleza):
+    pozitive = pastrate = 0
+    for seed in range(20):
+        contract = genereaza_contract(seed, proportie_engleza=proportie_engleza)
+        chunkuri = chunkuri_articole(contract.text)
+        for chunk, pozitiv in zip(chunkuri, etichete_corpus(contract, chunkuri)):
+            pozitive += pozitiv
+            pastrate += pozitiv and prefiltru.de_trimis(chunk.text)[0]
+    assert pozitive and pastrate == pozitive
@@ -0,0 +1,91 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+
+import revizii
+from benchmarks.corpus import Articol, Contract, genereaza_contract, pdf_contract
+from benchmarks.mock_openai import MockOpenAI
+
+
+@pytest.fixture
+def titluri_variabile(monkeypatch):
+    """Mock-ul dă alt titlu la fiecare analiză, ca un LLM real; citatul rămâne același."""
+    original = MockOpenAI._raspuns
+    contor = itertools.count()
+
+    def _raspuns(tip, body):
+        text = original(tip, body)
+        if tip != "analiza":
+            return text
+        date = json.loads(text)
+        date["probleme"][0]["titlu_problema"] = f"Titlul {next(contor)}"
+        return json.dumps(date, ensure_ascii=False)
+
+    monkeypatch.setattr(MockOpenAI, "_raspuns", staticmethod(_raspuns))
+
+
+def _pdf(tmp_path, contract: Contract, nume: str) -> str:
+    path = tmp_path / nume
+    path.write_bytes(pdf_contract(contract, "digital", articole_pe_pagina=4))
+    return str(path)
+
+
+def _cu_articol(contract: Contract, index: int, text: str) -> Contract:
+    articole = list(contract.articole)
+    articole[index] = Articol(text, articole[index].risc)
+    return Contract(contract.nume, "\n".join(a.text for a in articole), articole)
+
+
+def test_cheia_problemei_ignora_titlul_si_numerotarea():
+    problema = {"titlu_problema": "Penalități mari", "categorie_problema": "Costuri",
+                "clauza_originala": "Articolul 3. Clientul  plătește penalități de 1% pe zi."}
+    alta_rulare = dict(problema, titlu_problema="Penalitate excesivă",
+                       clauza_originala="Art. 7 Clientul plătește penalități de 1% pe zi.")
+    assert revizii._cheie_problema(problema, "a") == revizii._cheie_problema(alta_rulare, "b")
+    assert revizii._cheie_problema(dict(problema, categorie_problema="Reziliere"), "a") != \
+        revizii._cheie_problema(problema, "a")
+
+
+def test_clauza_reanalizata_fara_schimbarea_riscului(tmp_path, cache_temporar, openai_local, titluri_variabile):
+    v1 = genereaza_contract(1, 8)
+    prima = asyncio.run(revizii.analizeaza_revizie(_pdf(tmp_path, v1, "v1.pdf")))
+    # Se schimbă începutul articolului; finalul (citat de analiză) rămâne identic
+    articol = v1.articole[2].text
+    v2 = _cu_articol(v1, 2, articol.replace("\n(1) ", "\n(1) În mod expres, ", 1))
+    apeluri = openai_local.stats.pe_tip.get("analiza", 0)
+    a_doua = asyncio.run(revizii.analizeaza_revizie(_pdf(tmp_path, v2, "v2.pdf"), prima["document_id"]))
+    assert a_doua["revizie"] == 2 and a_doua["clauze_modificate"] == 1
+    assert openai_local.stats.pe_tip["analiza"] == apeluri + 1
+    assert a_doua["probleme_adaugate"] == [] and a_doua["probleme_rezolvate"] == []
+
+    # Finalul articolului se schimbă: problema veche e rezolvată, cea nouă adăugată
+    v3 = _cu_articol(v2, 2, v2.articole[2].text + " Clientul renunță la orice despăgubire.")
+    a_treia = asyncio.run(revizii.analizeaza_revizie(_pdf(tmp_path, v3, "v3.pdf"), prima["document_id"]))
+    assert len(a_treia["probleme_adaugate"]) == 1 and len(a_treia["probleme_rezolvate"]) == 1
+
+
+def test_reviziile_concurente_nu_se_suprascriu(tmp_path, cache_temporar, openai_local):
+    v1 = genereaza_contract(2, 8)
+    document_id = asyncio.run(revizii.analizeaza_revizie(_pdf(tmp_path, v1, "v1.pdf")))["document_id"]
+    v2 = _cu_articol(v1, 1, v1.articole[1].text + " Modificare A.")
+    v3 = _cu_articol(v1, 4, v1.articole[4].text + " Modificare B.")
+
+    async def concurent():
+        return await asyncio.gather(
+            revizii.analizeaza_revizie(_pdf(tmp_path, v2, "v2.pdf"), document_id),
+            revizii.analizeaza_revizie(_pdf(tmp_path, v3, "v3.pdf"), document_id),
+        )
+
+    rezultate = asyncio.run(concurent())
+    assert sorted(r["revizie"] for r in rezultate) == [2, 3]
+    assert revizii._stare_revizie(document_id)["revizie"] == 3
+    assert revizii._blocari == {}
+
+
+def test_set_daca_neschimbat(cache_temporar):
+    assert cache_temporar.set_daca_neschimbat("rev", {"revizie": 1}, None)
+    assert not cache_temporar.set_daca_neschimbat("rev", {"revizie": 2}, None)
+    assert cache_temporar.set_daca_neschimbat("rev", {"revizie": 2}, {"revizie": 1})
+    assert cache_temporar.get("rev") == {"revizie": 2}
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+def _citeste_fluxul(client: TestClient, pdf: bytes) -> list:
+    """Evenimentele fluxului, în ordine: `(nume, date)`, iar comentariile ca `(":", text)`."""
+    evenimente = []
+    with client.stream("POST", "/analizeaza-pdf/stream/",
+                       files={"file": ("contract.pdf", pdf, "application/pdf")}) as raspuns:
+        assert raspuns.status_code == 200
+        assert raspuns.headers["content-type"].startswith("text/event-stream")
+        corp = "".join(raspuns.iter_text())
+    for bloc in filter(None, corp.split("\n\n")):
+        if bloc.startswith(":"):
+            evenimente.append((":", bloc[1:].strip()))
+            continue
+        linii = dict(linie.split(": ", 1) for linie in bloc.split("\n"))
+        evenimente.append((linii["event"], json.loads(linii["data"])))
+    return evenimente
+
+
+def test_secventa_evenimentelor(openai_local, pdf_contract_digital):
+    with TestClient(api.app) as client:
+        evenimente = _citeste_fluxul(client, pdf_contract_digital)
+    nume = [n for n, _ in evenimente if n != ":"]
+    assert nume[0] == "text" and nume[-2:] == ["rezumat", "final"]
+    probleme = [date for n, date in evenimente if n == "probleme"]
+    assert probleme and set(nume[1:-2]) == {"probleme"}
+    assert sorted(p["index"] for p in probleme) == list(range(probleme[0]["total"]))
+    text = evenimente[0][1]["text_original"]
+    for p in probleme:
+        assert 0 <= p["start"] < p["end"] <= len(text)
+    assert evenimente[-1][1]["chunkuri_esuate"] == 0
+
+
+def test_ping_in_timpul_unei_extractii_lente(openai_local, pdf_contract_digital, monkeypatch):
+    extrage = api.extrage_document
+
+    async def extrage_lent(path):
+        await asyncio.sleep(0.35)
+        return await extrage(path)
+
+    monkeypatch.setattr(api, "extrage_document", extrage_lent)
+    monkeypatch.setattr(api, "SSE_PING_SECUNDE", 0.05)
+    with TestClient(api.app) as client:
+        evenimente = _citeste_fluxul(client, pdf_contract_digital)
+    inainte_de_text = [n for n, _ in evenimente[:[n for n, _ in evenimente].index("text")]]
+    assert len(inainte_de_text) >= 3 and set(inainte_de_text) == {":"}
+    assert evenimente[-1][0] == "final"
+
+
+def test_eroare_in_extractie_ajunge_ca_eveniment(openai_local, pdf_contract_digital, monkeypatch):
+    async def extrage_esuat(path):
+        raise ValueError("PDF corupt")
+
+    monkeypatch.setattr(api, "extrage_document", extrage_esuat)
+    with TestClient(api.app) as client:
+        evenimente = _citeste_fluxul(client, pdf_contract_digital)
+    nume, date = evenimente[-1]
+    assert nume == "eroare" and date["status"] == 500
+
+
+@pytest.mark.parametrize("intarzieri, cu_ping", [((0.0, 0.0), False), ((0.25, 0.0), True)])
+def test_cu_ping(intarzieri, cu_ping):
+    async def evenimente():
+        for nume, intarziere in zip("ab", intarzieri):
+            await asyncio.sleep(intarziere)
+            yield nume
+
+    async def colecteaza():
+        return [e if e != api.PING_SSE else ":" async for e in api._cu_ping(evenimente(), 0.1)]
+
+    primite = asyncio.run(colecteaza())
+    assert primite[-2:] == ["a", "b"] and set(primite[:-2]) <= {":"}
+    assert (":" in primite) == cu_ping
+
+
+def test_cu_ping_inchide_generatorul_la_deconectare():
+    curatat = asyncio.Event()
+
+    async def evenimente():
+        try:
+            await asyncio.sleep(10)
+            yield "nu ajunge"
+        finally:
+            curatat.set()
+
+    async def deconecteaza():
+        flux = api._cu_ping(evenimente(), 0.01)
+        assert await flux.__anext__() == api.PING_SSE
+        await flux.aclose()
+        return curatat.is_set()
+
+    assert asyncio.run(deconecteaza())
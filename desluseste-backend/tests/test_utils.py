@@ -0,0 +1,57 @@
+import pytest
+
+from benchmarks.corpus import genereaza_contract
+from utils import CARACTERE_PE_TOKEN, chunking_pe_buget
+
+BUGET, SUPRAPUNERE = 100, 20
+MAX_CARACTERE = BUGET * CARACTERE_PE_TOKEN
+
+
+def _verifica_offseturi(text: str, chunkuri: list) -> None:
+    for chunk in chunkuri:
+        assert chunk.text == text[chunk.start:chunk.end] and chunk.text.strip() == chunk.text
+    for anterior, chunk in zip(chunkuri, chunkuri[1:]):
+        # Fiecare chunk începe după începutul și se termină după sfârșitul celui dinainte
+        assert anterior.start < chunk.start and anterior.end < chunk.end
+    acoperit = set()
+    for chunk in chunkuri:
+        acoperit.update(range(chunk.start, chunk.end))
+    assert all(i in acoperit for i, ch in enumerate(text) if not ch.isspace())
+
+
+def test_propozitie_scurta_urmata_de_un_sir_peste_buget():
+    text = "Articolul 1. Scurt. " + "Cuvant lung fara punct " * 270 + ". Alt text final aici."
+    chunkuri = chunking_pe_buget(text)
+    assert [(c.start, c.end) for c in chunkuri] == [(0, 19), (20, len(text))]
+    _verifica_offseturi(text, chunkuri)
+
+
+def test_articol_lung_se_imparte_cu_suprapunere():
+    propozitii = [f"Propozitia {i} are cateva cuvinte de umplutura pentru test." for i in range(40)]
+    text = "Articolul 1\n" + " ".join(propozitii)
+    chunkuri = chunking_pe_buget(text, BUGET, SUPRAPUNERE)
+    assert len(chunkuri) > 1
+    _verifica_offseturi(text, chunkuri)
+    assert any(chunk.start < anterior.end for anterior, chunk in zip(chunkuri, chunkuri[1:]))
+    assert all(len(c.text) <= MAX_CARACTERE + SUPRAPUNERE * CARACTERE_PE_TOKEN for c in chunkuri)
+
+
+def test_coada_mica_e_lipita_de_bucata_anterioara():
+    # Articolul depășește bugetul cu doar câteva cuvinte: nu merită un apel separat
+    text = "Articolul 1\n" + "Cuvant " * 56 + ". Final."
+    chunkuri = chunking_pe_buget(text, BUGET, SUPRAPUNERE)
+    assert [(c.start, c.end) for c in chunkuri] == [(0, len(text))]
+    _verifica_offseturi(text, chunkuri)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_offseturi_pe_corpus(seed):
+    text = genereaza_contract(seed).text
+    for buget in (60, 150, 1500):
+        chunkuri = chunking_pe_buget(text, buget, 15)
+        _verifica_offseturi(text, chunkuri)
+
+
+def test_text_fara_articole_ramane_intreg():
+    text = "Un singur paragraf fără articole."
+    assert [(c.start, c.end) for c in chunking_pe_buget(text)] == [(0, len(text))]
@@ -1,4 +1,13 @@
 import re
+from dataclasses import dataclass
+
+from config import CHUNK_OVERLAP_TOKENS, CHUNK_TOKEN_BUDGET
+
+PATTERN_ARTICOLE = re.compile(r'(?=Art\.|Articolul\s*\d+|CAPITOLUL\s+[IVXLCDM]+|Art\.\s*\d+)')
+_SFARSIT_PROPOZITIE = re.compile(r'(?<=[.!?;])\s+')
+
+# Aproximare suficientă pentru bugetare: ~4 caractere pe token
+CARACTERE_PE_TOKEN = 4
 
 
 def chunking_inteligent_regex(text: str) -> list[str]:
@@ -7,7 +16,112 @@ def chunking_inteligent_regex(text: str) -> list[str]:
     Returnează o listă de chunk-uri; dacă niciun chunk nu e suficient de mare,
     întoarce textul întreg într-o listă.
     """
-    pattern = r'(?=Art\.|Articolul\s*\d+|CAPITOLUL\s+[IVXLCDM]+|Art\.\s*\d+)'
-    chunks = re.split(pattern, text)
+    chunks = PATTERN_ARTICOLE.split(text)
     result = [chunk.strip() for chunk in chunks if len(chunk.strip()) > 100]
     return result if result else [text]
+
+
+@dataclass
+class Chunk:
+    """Un fragment de analizat, cu pozițiile lui în textul sursă (`text[start:end]`)."""
+    text: str
+    start: int
+    end: int
+
+
+def estimeaza_tokeni(text: str) -> int:
+    return -(-len(text) // CARACTERE_PE_TOKEN)
+
+
+def _limite_articole(text: str) -> list[tuple[int, int]]:
+    starturi = sorted({0, *(m.start() for m in PATTERN_ARTICOLE.finditer(text))})
+    return [(s, e) for s, e in zip(starturi, starturi[1:] + [len(text)]) if s < e]
+
+
+def _taie_fortat(text: str, start: int, end: int, max_caractere: int) -> list[tuple[int, int]]:
+    """Taie o „propoziție” fără punctuație la ultimul spațiu dinaintea limitei."""
+    bucati = []
+    while end - start > max_caractere:
+        taietura = text.rfind(" ", start + max_caractere // 2, start + max_caractere)
+        if taietura <= start:
+            taietura = start + max_caractere
+        bucati.append((start, taietura))
+        start = taietura
+    bucati.append((start, end))
+    return bucati
+
+
+def _imparte_articol(text: str, start: int, end: int, max_caractere: int, suprapunere: int) -> list[tuple[int, int]]:
+    """Împarte un articol prea lung la granițe de propoziție; fiecare bucată reia
+    ultimele propoziții ale celei anterioare, până la `suprapunere` caractere.
+
+    Suprapunerea se păstrează doar dacă bucata următoare încape cu ea și aduce text
+    nou, deci nicio bucată nu e cuprinsă în cea dinainte; o coadă care aduce cel mult
+    `suprapunere` caractere noi e lipită de bucata anterioară, nu trimisă separat.
+    """
+    propozitii = []
+    s = start
+    for m in _SFARSIT_PROPOZITIE.finditer(text, start, end):
+        propozitii.extend(_taie_fortat(text, s, m.end(), max_caractere))
+        s = m.end()
+    if s < end:
+        propozitii.extend(_taie_fortat(text, s, end, max_caractere))
+
+    bucati = []
+    i = 0
+    while i < len(propozitii):
+        j = i + 1
+        while j < len(propozitii) and propozitii[j][1] - propozitii[i][0] <= max_caractere:
+            j += 1
+        bucati.append((propozitii[i][0], propozitii[j - 1][1]))
+        if j >= len(propozitii):
+            break
+        k = j
+        while (k - 1 > i and propozitii[j - 1][1] - propozitii[k - 1][0] <= suprapunere
+               and propozitii[j][1] - propozitii[k - 1][0] <= max_caractere):
+            k -= 1
+        i = k
+    if len(bucati) > 1 and bucati[-1][1] - bucati[-2][1] <= suprapunere:
+        bucati[-2:] = [(bucati[-2][0], bucati[-1][1])]
+    return bucati
+
+
+def _chunk_fara_spatii(text: str, start: int, end: int) -> Chunk | None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return Chunk(text[start:end], start, end) if start < end else None
+
+
+def chunking_pe_buget(
+    text: str, buget_tokeni: int = CHUNK_TOKEN_BUDGET, suprapunere_tokeni: int = CHUNK_OVERLAP_TOKENS
+) -> list[Chunk]:
+    """Grupează articole consecutive în chunk-uri de cel mult `buget_tokeni` tokeni.
+
+    Articolele mai mari decât bugetul sunt împărțite la granițe de propoziție, cu o
+    mică suprapunere, și nu se grupează cu altele. Fiecare chunk își păstrează
+    pozițiile în `text`, ca problemele găsite să poată fi legate înapoi de sursă.
+    """
+    max_caractere = buget_tokeni * CARACTERE_PE_TOKEN
+    suprapunere = suprapunere_tokeni * CARACTERE_PE_TOKEN
+
+    limite: list[tuple[int, int]] = []
+    curent: tuple[int, int] | None = None
+    for start, end in _limite_articole(text):
+        if end - start > max_caractere:
+            if curent:
+                limite.append(curent)
+                curent = None
+            limite.extend(_imparte_articol(text, start, end, max_caractere, suprapunere))
+        elif curent and end - curent[0] <= max_caractere:
+            curent = (curent[0], end)
+        else:
+            if curent:
+                limite.append(curent)
+            curent = (start, end)
+    if curent:
+        limite.append(curent)
+
+    chunkuri = [chunk for start, end in limite if (chunk := _chunk_fara_spatii(text, start, end))]
+    return chunkuri if chunkuri else [Chunk(text, 0, len(text))]
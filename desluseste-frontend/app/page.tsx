@@ -5,8 +5,8 @@ import dynamic from "next/dynamic";
 import { useCallback, useRef, useState } from "react";
 
 import FileUpload from "@/components/ui/FileUpload";
-import { analizeazaPdf } from "@/lib/api";
-import { normalizeAnalysis, type NormalizedAnalysisResponse } from "@/lib/schemas";
+import { analizeazaPdfStream } from "@/lib/api";
+import { normalizeAnalysis, type IssueItem, type NormalizedAnalysisResponse } from "@/lib/schemas";
 
 // Dashboard-ul se încarcă doar după analiză
 const AnalysisDashboard = dynamic(
@@ -27,15 +27,43 @@ export default function HomePage() {
     setError(null);
     setResult(null);
 
-    try {
-      const raw = await analizeazaPdf(selectedFile);
-      const normalized = normalizeAnalysis(raw);
-      setResult(normalized);
+    // Rezultat parțial, completat pe măsură ce sosesc evenimentele din stream
+    let text = "";
+    let inceputPagini: number[] = [];
+    let rezumat = "";
+    const probleme: IssueItem[][] = [];
+    const publish = () => {
+      if (!text) return;
+      setResult(normalizeAnalysis({
+        probleme_identificate: probleme.flat(),
+        rezumat_executiv: rezumat || "Se generează rezumatul…",
+        text_original: text,
+        inceput_pagini: inceputPagini,
+      }));
+    };
 
-      // focus a11y când apare rezultatul
-      requestAnimationFrame(() => liveRef.current?.focus());
+    try {
+      const final = await analizeazaPdfStream(selectedFile, {
+        onText: (t, pagini) => {
+          text = t;
+          inceputPagini = pagini;
+          publish();
+          // focus a11y când apare primul rezultat
+          requestAnimationFrame(() => liveRef.current?.focus());
+        },
+        onProbleme: (index, _total, items) => {
+          probleme[index] = items;
+          publish();
+        },
+        onRezumat: (r) => {
+          rezumat = r;
+          publish();
+        },
+      });
+      setResult(final);
     } catch (e: unknown) {
       const msg = e instanceof Error ? e.message : "A apărut o eroare la analiză.";
+      setResult(null);
       setError(msg);
     } finally {
       setIsLoading(false);
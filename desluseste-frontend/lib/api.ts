@@ -1,6 +1,7 @@
 // src/lib/api.ts
+import { z } from "zod";
 import { normalizeAnalysis, type NormalizedAnalysisResponse } from "./schemas";
-import { AnalysisResponseSchema } from "./schemas";
+import { AnalysisResponseSchema, IssueItemSchema, type IssueItem } from "./schemas";
 
 const DEFAULT_ENDPOINT =
   process.env.NEXT_PUBLIC_API_URL?.trim() ||
@@ -8,6 +9,22 @@ const DEFAULT_ENDPOINT =
 
 const TIMEOUT_MS = 60_000; // 60s hard cap
 
+/**
+ * Mesajul unei erori HTTP. Limitele serverului (413: document prea mare, 429: server
+ * ocupat) vin cu un `detail` scris pentru utilizator, afișat ca atare.
+ */
+function mesajEroareServer(status: number, body: string): string {
+  if (status === 413 || status === 429) {
+    try {
+      const detail = JSON.parse(body)?.detail;
+      if (typeof detail === "string") return detail;
+    } catch {
+      // corp non-JSON (ex. de la proxy): mesajul generic de mai jos
+    }
+  }
+  return `Eroare server (${status}): ${body.slice(0, 200)}`;
+}
+
 /**
  * Trimite un PDF către backend pentru analiză și validează răspunsul.
  * Aruncă erori clare, scurte și localizate.
@@ -49,7 +66,7 @@ export async function analizeazaPdf(
       await new Promise((r) => setTimeout(r, 1500));
       return analizeazaPdf(file, endpoint);
     }
-    throw new Error(`Eroare server (${resp.status}): ${text.slice(0, 200)}`);
+    throw new Error(mesajEroareServer(resp.status, text));
   }
 
   let json: unknown;
@@ -70,3 +87,132 @@ export async function analizeazaPdf(
   // Normalizează imediat pt. UI — scapă de orice text inconsistent
   return normalizeAnalysis(parsed.data);
 }
+
+const DEFAULT_STREAM_ENDPOINT = DEFAULT_ENDPOINT.replace(/\/?$/, "/") + "stream/";
+
+export type StreamHandlers = {
+  /** Textul documentului și poziția în el la care începe fiecare pagină. */
+  onText?: (text: string, inceputPagini: number[]) => void;
+  /** Problemele unui chunk; `index` e poziția chunk-ului în document. */
+  onProbleme?: (index: number, total: number, probleme: IssueItem[]) => void;
+  onRezumat?: (rezumat: string) => void;
+};
+
+/**
+ * Varianta cu streaming: backend-ul trimite Server-Sent Events (text, probleme
+ * per chunk, rezumat), iar handler-ele sunt apelate pe măsură ce sosesc.
+ * Întoarce la final rezultatul complet, normalizat.
+ */
+export async function analizeazaPdfStream(
+  file: File,
+  handlers: StreamHandlers = {},
+  endpoint: string = DEFAULT_STREAM_ENDPOINT
+): Promise<NormalizedAnalysisResponse> {
+  if (!(file instanceof File)) {
+    throw new Error("Fișier invalid. Încarcă un PDF real.");
+  }
+
+  const formData = new FormData();
+  formData.append("file", file);
+
+  // Timeout de inactivitate: se resetează la fiecare bucată primită
+  const controller = new AbortController();
+  let timeout = setTimeout(() => controller.abort(), TIMEOUT_MS);
+  const resetTimeout = () => {
+    clearTimeout(timeout);
+    timeout = setTimeout(() => controller.abort(), TIMEOUT_MS);
+  };
+
+  let text = "";
+  let inceputPagini: number[] = [];
+  let rezumat = "";
+  const probleme: IssueItem[][] = [];
+  let terminat = false;
+
+  const handleEvent = (name: string, data: any) => {
+    if (name === "text") {
+      text = String(data?.text_original ?? "");
+      inceputPagini = Array.isArray(data?.inceput_pagini) ? data.inceput_pagini : [];
+      handlers.onText?.(text, inceputPagini);
+    } else if (name === "probleme") {
+      const parsed = z.array(IssueItemSchema).safeParse(data?.probleme);
+      if (!parsed.success) throw new Error("Răspuns nevalid de la server (schema nu corespunde).");
+      probleme[data.index] = parsed.data;
+      handlers.onProbleme?.(data.index, data.total, parsed.data);
+    } else if (name === "rezumat") {
+      rezumat = String(data?.rezumat_executiv ?? "");
+      handlers.onRezumat?.(rezumat);
+    } else if (name === "final") {
+      terminat = true;
+    } else if (name === "eroare") {
+      throw new Error(`Eroare server (${data?.status ?? 500}): ${String(data?.detail ?? "").slice(0, 200)}`);
+    }
+  };
+
+  try {
+    let resp: Response;
+    try {
+      resp = await fetch(endpoint, {
+        method: "POST",
+        body: formData,
+        credentials: "omit",
+        signal: controller.signal,
+      });
+    } catch (err: any) {
+      if (err?.name === "AbortError") throw new Error("Timpul de analiză a expirat (server lent).");
+      throw new Error("Eroare de rețea. Verifică conexiunea sau reîncearcă peste câteva secunde.");
+    }
+
+    if (!resp.ok || !resp.body) {
+      const body = await resp.text().catch(() => "");
+      throw new Error(mesajEroareServer(resp.status, body));
+    }
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+      let chunk: ReadableStreamReadResult<Uint8Array>;
+      try {
+        chunk = await reader.read();
+      } catch (err: any) {
+        if (err?.name === "AbortError") throw new Error("Timpul de analiză a expirat (server lent).");
+        throw new Error("Conexiunea cu serverul s-a întrerupt.");
+      }
+      if (chunk.done) break;
+      resetTimeout();
+      buffer += decoder.decode(chunk.value, { stream: true });
+
+      // Evenimentele SSE sunt separate de o linie goală
+      let sep: number;
+      while ((sep = buffer.indexOf("\n\n")) !== -1) {
+        const raw = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+        let name = "message";
+        let data = "";
+        for (const line of raw.split("\n")) {
+          if (line.startsWith("event:")) name = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        }
+        let json: unknown;
+        try {
+          json = data ? JSON.parse(data) : null;
+        } catch {
+          throw new Error("Răspuns corupt (nu e JSON valid).");
+        }
+        handleEvent(name, json);
+      }
+    }
+  } finally {
+    clearTimeout(timeout);
+  }
+
+  if (!terminat) throw new Error("Analiza s-a întrerupt înainte de final.");
+
+  return normalizeAnalysis({
+    probleme_identificate: probleme.flat(),
+    rezumat_executiv: rezumat,
+    text_original: text,
+    inceput_pagini: inceputPagini,
+  });
+}
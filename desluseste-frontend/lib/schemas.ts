@@ -19,12 +19,19 @@ export const IssueItemSchema = z.object({
   anchor_id: z.string().optional(),
   offset_start: z.number().int().nonnegative().optional(),
   offset_end: z.number().int().nonnegative().optional(),
+  // poziția citatului în text_original și pagina lui, calculate de backend
+  start: z.number().int().nonnegative().nullish(),
+  end: z.number().int().nonnegative().nullish(),
+  potrivire_citat: z.enum(["exacta", "aproximativa", "negasita"]).nullish(),
+  pagina: z.number().int().positive().nullish(),
 });
 
 export const AnalysisResponseSchema = z.object({
   probleme_identificate: z.array(IssueItemSchema),
   rezumat_executiv: z.string().min(1),
   text_original: z.string().min(1),
+  // unde începe fiecare pagină a PDF-ului în text_original
+  inceput_pagini: z.array(z.number().int().nonnegative()).optional(),
 });
 
 export type IssueItem = z.infer<typeof IssueItemSchema>;
@@ -45,12 +52,14 @@ export type NormalizedIssueItem = {
   anchor_id: string;           // mereu prezent după normalizare
   offset_start?: number;
   offset_end?: number;
+  pagina?: number;
 };
 
 export type NormalizedAnalysisResponse = {
   probleme_identificate: NormalizedIssueItem[];
   rezumat_executiv: string;
   text_original: string;
+  inceput_pagini: number[];
 };
 
 /** ——— Normalizări & utils ——— */
@@ -153,8 +162,9 @@ export function normalizeAnalysis(json: unknown): NormalizedAnalysisResponse {
       percent,
       sugestie: p.sugestie,
       anchor_id,
-      offset_start: p.offset_start,
-      offset_end: p.offset_end,
+      offset_start: p.offset_start ?? p.start ?? undefined,
+      offset_end: p.offset_end ?? p.end ?? undefined,
+      pagina: p.pagina ?? undefined,
     };
   });
 
@@ -162,5 +172,6 @@ export function normalizeAnalysis(json: unknown): NormalizedAnalysisResponse {
     probleme_identificate: items,
     rezumat_executiv: parsed.rezumat_executiv,
     text_original: parsed.text_original,
+    inceput_pagini: parsed.inceput_pagini ?? [],
   };
 }